@@ -1,6 +1,6 @@
 import React, { createContext, useContext, useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { loginAPI } from '../services/api';
+import { clearTokens, loginAPI, storeTokens } from '../services/api';
 import { toast } from 'react-toastify';
 
 export type UserRole = 'customer' | 'admin';
@@ -36,6 +36,7 @@ export const AuthProvider: React.FC<{ children: React.ReactNode }> = ({ children
     const login = async (email: string, password: string) => {
         try {
             const userData = await loginAPI(email, password);
+            storeTokens(userData.access, userData.refresh);
             const user: User = {
                 id: userData.id,
                 name: userData.full_name,
@@ -57,6 +58,7 @@ export const AuthProvider: React.FC<{ children: React.ReactNode }> = ({ children
     const logout = () => {
         setUser(null);
         localStorage.removeItem('user');
+        clearTokens();
         navigate('/login');
     };
 
@@ -1,33 +1,91 @@
-import React, { useEffect, useState } from 'react';
+import React, { useEffect, useRef, useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { useAuth } from '../../context/AuthContext';
-import { fetchComplaints } from '../../services/api';
-import type { Complaint } from '../../services/api';
+import { applyComplaintEvents, fetchComplaints, fetchComplaintStats, getComplaint, subscribeToComplaintEventBatches } from '../../services/api';
+import type { Complaint, ComplaintEvent, ComplaintStats } from '../../services/api';
 
 const AdminDashboard: React.FC = () => {
     const { user, logout } = useAuth();
     const navigate = useNavigate();
     const [complaints, setComplaints] = useState<Complaint[]>([]);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [filter, setFilter] = useState('All');
+    const [stats, setStats] = useState<ComplaintStats | null>(null);
 
     useEffect(() => {
-        loadComplaints();
+        loadComplaints(filter);
+    }, [filter]);
+
+    const loadStats = () => {
+        fetchComplaintStats().then(setStats).catch(error => console.error("Failed to load stats", error));
+    };
+
+    useEffect(() => {
+        loadStats();
     }, []);
 
-    const loadComplaints = async () => {
+    // Rows currently shown, for the event handler (which outlives renders)
+    const loaded = useRef<Complaint[]>([]);
+    useEffect(() => {
+        loaded.current = complaints;
+    }, [complaints]);
+
+    // Live updates are applied to the loaded rows instead of reloading the
+    // list: only complaints new to this tab are fetched, and a burst of
+    // events costs one stats request
+    useEffect(() => {
+        if (!user?.id) return;
+        const matches = (event: ComplaintEvent) => filter === 'All' || event.status === filter;
+        return subscribeToComplaintEventBatches(user.id, async events => {
+            const shown = new Set(loaded.current.map(complaint => complaint.id));
+            const added = await Promise.all(events
+                .filter(([type, event]) => type !== 'deleted' && !shown.has(event.complaint_id) && matches(event))
+                .map(([, event]) => getComplaint(event.complaint_id).catch(() => null)));
+            const fresh = added.filter((complaint): complaint is Complaint => complaint !== null);
+            setComplaints(current => applyComplaintEvents(current, events, fresh, matches));
+            loadStats();
+        });
+    }, [user, filter]);
+
+    const countFor = (status: string) => (status === 'All' ? stats?.total : stats?.by_status[status]) ?? 0;
+
+    const filtersFor = (status: string) => (status === 'All' ? {} : { status });
+
+    // The filter the listed rows belong to; a "load more" answered after a
+    // filter change is dropped
+    const listed = useRef(filter);
+
+    const loadComplaints = async (status: string) => {
+        listed.current = status;
+        setNextCursor(null);
         try {
-            const data = await fetchComplaints();
-            setComplaints(data);
+            // Filtering happens server-side (indexed), not in the browser
+            const page = await fetchComplaints(undefined, filtersFor(status));
+            setComplaints(page.results);
+            setNextCursor(page.next_cursor);
         } catch (error) {
             console.error("Failed to load complaints", error);
         }
     };
 
+    const loadMore = async () => {
+        if (!nextCursor || loadingMore) return;
+        setLoadingMore(true);
+        try {
+            const page = await fetchComplaints(undefined, filtersFor(filter), nextCursor);
+            if (listed.current !== filter) return;
+            // Merged like live updates: rows already shown are not duplicated
+            setComplaints(current => applyComplaintEvents(current, [], page.results));
+            setNextCursor(page.next_cursor);
+        } catch (error) {
+            console.error("Failed to load complaints", error);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
 
-
-    const filteredComplaints = filter === 'All'
-        ? complaints
-        : complaints.filter(c => c.status === filter);
+    const filteredComplaints = complaints;
 
     return (
         <div className="min-h-screen bg-slate-50 font-sans">
@@ -79,6 +137,7 @@ const AdminDashboard: React.FC = () => {
                                     }`}
                             >
                                 {status}
+                                {stats && <span className="ml-1.5 opacity-75">{countFor(status)}</span>}
                             </button>
                         ))}
                     </div>
@@ -187,6 +246,17 @@ const AdminDashboard: React.FC = () => {
                             </tbody>
                         </table>
                     </div>
+                    {nextCursor && (
+                        <div className="px-6 py-4 border-t border-gray-200 text-center">
+                            <button
+                                onClick={loadMore}
+                                disabled={loadingMore}
+                                className="px-4 py-2 text-sm font-medium text-indigo-600 bg-indigo-50 rounded-md hover:bg-indigo-100 disabled:opacity-50"
+                            >
+                                {loadingMore ? 'Loading…' : 'Load more'}
+                            </button>
+                        </div>
+                    )}
                 </div>
 
 
@@ -1,13 +1,16 @@
-import React, { useEffect, useState } from 'react';
+import React, { useEffect, useRef, useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { useAuth } from '../../context/AuthContext';
-import { fetchComplaints } from '../../services/api';
-import type { Complaint } from '../../services/api';
+import { applyComplaintEvents, fetchComplaints, fetchComplaintStats, getComplaint, subscribeToComplaintEventBatches } from '../../services/api';
+import type { Complaint, ComplaintStats } from '../../services/api';
 
 const CustomerDashboard: React.FC = () => {
     const { user, logout } = useAuth();
     const navigate = useNavigate();
     const [complaints, setComplaints] = useState<Complaint[]>([]);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [loadingMore, setLoadingMore] = useState(false);
+    const [stats, setStats] = useState<ComplaintStats | null>(null);
 
     useEffect(() => {
         if (user) {
@@ -15,23 +18,58 @@ const CustomerDashboard: React.FC = () => {
         }
     }, [user]);
 
+    const loaded = useRef<Complaint[]>([]);
+    useEffect(() => {
+        loaded.current = complaints;
+    }, [complaints]);
+
+    // Apply changes to this customer's complaints as they arrive (batched)
+    useEffect(() => {
+        if (!user?.id) return;
+        const userId = user.id;
+        return subscribeToComplaintEventBatches(userId, async events => {
+            const shown = new Set(loaded.current.map(complaint => complaint.id));
+            const added = await Promise.all(events
+                .filter(([type, event]) => type !== 'deleted' && !shown.has(event.complaint_id))
+                .map(([, event]) => getComplaint(event.complaint_id).catch(() => null)));
+            const fresh = added.filter((complaint): complaint is Complaint => complaint !== null);
+            setComplaints(current => applyComplaintEvents(current, events, fresh));
+            fetchComplaintStats(userId).then(setStats).catch(error => console.error("Failed to load stats", error));
+        });
+    }, [user]);
 
 
     const loadComplaints = async () => {
         try {
             if (user?.id) {
-                const data = await fetchComplaints(user.id);
-                setComplaints(data);
+                const [page, counts] = await Promise.all([fetchComplaints(user.id), fetchComplaintStats(user.id)]);
+                setComplaints(page.results);
+                setNextCursor(page.next_cursor);
+                setStats(counts);
             }
         } catch (error) {
             console.error("Failed to load complaints", error);
         }
     };
 
+    const loadMore = async () => {
+        if (!user?.id || !nextCursor || loadingMore) return;
+        setLoadingMore(true);
+        try {
+            const page = await fetchComplaints(user.id, {}, nextCursor);
+            setComplaints(current => applyComplaintEvents(current, [], page.results));
+            setNextCursor(page.next_cursor);
+        } catch (error) {
+            console.error("Failed to load complaints", error);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
 
-    // Calculate Stats
-    const totalComplaints = complaints.length;
-    const resolvedComplaints = complaints.filter(c => c.status === 'Resolved').length;
+    // Stats come from the server-side rollups
+    const totalComplaints = stats?.total ?? 0;
+    const resolvedComplaints = stats?.by_status['Resolved'] ?? 0;
     const pendingComplaints = totalComplaints - resolvedComplaints;
 
     return (
@@ -193,6 +231,17 @@ const CustomerDashboard: React.FC = () => {
                         ))}
                     </div>
                 )}
+                {nextCursor && (
+                    <div className="mt-6 text-center">
+                        <button
+                            onClick={loadMore}
+                            disabled={loadingMore}
+                            className="px-4 py-2 text-sm font-medium text-indigo-600 bg-indigo-50 rounded-md hover:bg-indigo-100 disabled:opacity-50"
+                        >
+                            {loadingMore ? 'Loading…' : 'Load more'}
+                        </button>
+                    </div>
+                )}
             </main>
         </div>
     );
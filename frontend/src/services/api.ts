@@ -4,11 +4,60 @@ const API_URL = 'http://127.0.0.1:8000/api';
 
 export const api = axios.create({
     baseURL: API_URL,
+    // Carries the read-after-write cookie that keeps our reads on the primary database
+    withCredentials: true,
     headers: {
         'Content-Type': 'application/json',
     },
 });
 
+// Signed access/refresh tokens from /auth/login; the access token is short-lived
+const ACCESS_KEY = 'accessToken';
+const REFRESH_KEY = 'refreshToken';
+
+export const storeTokens = (access: string, refresh?: string) => {
+    localStorage.setItem(ACCESS_KEY, access);
+    if (refresh) localStorage.setItem(REFRESH_KEY, refresh);
+};
+
+export const clearTokens = () => {
+    localStorage.removeItem(ACCESS_KEY);
+    localStorage.removeItem(REFRESH_KEY);
+};
+
+api.interceptors.request.use((config) => {
+    const token = localStorage.getItem(ACCESS_KEY);
+    if (token) config.headers.Authorization = `Bearer ${token}`;
+    return config;
+});
+
+// On 401, trade the refresh token for a new access token once and retry
+let refreshing: Promise<string | null> | null = null;
+
+const refreshAccessToken = async (): Promise<string | null> => {
+    const refresh = localStorage.getItem(REFRESH_KEY);
+    if (!refresh) return null;
+    try {
+        const response = await axios.post(`${API_URL}/auth/refresh`, { refresh });
+        storeTokens(response.data.access);
+        return response.data.access;
+    } catch {
+        clearTokens();
+        return null;
+    }
+};
+
+api.interceptors.response.use(undefined, async (error) => {
+    const config = error.config;
+    if (error.response?.status !== 401 || !config || config._retried) throw error;
+    refreshing = refreshing ?? refreshAccessToken().finally(() => { refreshing = null; });
+    const token = await refreshing;
+    if (!token) throw error;
+    config._retried = true;
+    config.headers.Authorization = `Bearer ${token}`;
+    return api(config);
+});
+
 export interface Complaint {
     id: number;
     title: string;
@@ -24,12 +73,125 @@ export interface Complaint {
     user_name?: string;
 }
 
-export const fetchComplaints = async (userId?: string): Promise<Complaint[]> => {
-    const params = userId ? { user_id: userId } : {};
-    const response = await api.get('/complaints/', { params });
+export interface ComplaintPage {
+    results: Complaint[];
+    next_cursor: string | null;
+}
+
+// Server-side filters supported by GET /complaints/
+export interface ComplaintFilters {
+    status?: string;
+    priority?: string;
+    category?: string;
+    min_score?: number;
+    max_score?: number;
+    created_after?: string;
+    created_before?: string;
+}
+
+// One page of the keyset-paginated listing; pass the previous page's
+// next_cursor to get the one after it (null when there are no more)
+export const fetchComplaints = async (
+    userId?: string, filters: ComplaintFilters = {}, cursor?: string | null, pageSize = 50,
+): Promise<ComplaintPage> => {
+    const params: Record<string, string> = { page_size: String(pageSize) };
+    for (const [key, value] of Object.entries(filters)) {
+        if (value !== undefined && value !== '') params[key] = String(value);
+    }
+    if (userId) params.user_id = userId;
+    if (cursor) params.cursor = cursor;
+    const response = await api.get<ComplaintPage>('/complaints/', { params });
     return response.data;
 };
 
+export interface ComplaintStats {
+    total: number;
+    by_status: Record<string, number>;
+    by_priority: Record<string, number>;
+    by_category: Record<string, number>;
+    daily: { date: string; created: number; resolved: number }[];
+}
+
+// Dashboard counts, served from server-side rollups
+export const fetchComplaintStats = async (userId?: string, days = 30): Promise<ComplaintStats> => {
+    const params: Record<string, string> = { days: String(days) };
+    if (userId) params.user_id = userId;
+    const response = await api.get<ComplaintStats>('/complaints/stats/', { params });
+    return response.data;
+};
+
+export interface ComplaintEvent {
+    complaint_id: number;
+    user_id: number | null;
+    title?: string;
+    status?: string;
+    priority?: string;
+    updated_at?: string;
+}
+
+const COMPLAINT_EVENT_TYPES = ['created', 'updated', 'deleted', 'status_changed', 'priority_changed', 'resolution_added'];
+
+// Live complaint updates over server-sent events; EventSource reconnects and resumes on its own
+export const subscribeToComplaintEvents = (userId: string, onEvent: (type: string, event: ComplaintEvent) => void): (() => void) => {
+    // EventSource cannot send headers, so the access token goes in the query string
+    const params = new URLSearchParams({ user_id: userId });
+    const token = localStorage.getItem(ACCESS_KEY);
+    if (token) params.set('access_token', token);
+    const source = new EventSource(`${API_URL}/complaints/events/?${params}`);
+    COMPLAINT_EVENT_TYPES.forEach(type =>
+        source.addEventListener(type, message => onEvent(type, JSON.parse((message as MessageEvent).data)))
+    );
+    return () => source.close();
+};
+
+export type ComplaintEventBatch = [type: string, event: ComplaintEvent][];
+
+// Coalesces events arriving within `delayMs` into one callback, keeping the
+// latest event per complaint (it carries the complaint's current state)
+export const subscribeToComplaintEventBatches = (userId: string, onBatch: (events: ComplaintEventBatch) => void, delayMs = 500): (() => void) => {
+    const pending = new Map<number, [string, ComplaintEvent]>();
+    let timer: ReturnType<typeof setTimeout> | undefined;
+    const unsubscribe = subscribeToComplaintEvents(userId, (type, event) => {
+        pending.set(event.complaint_id, [type, event]);
+        timer ??= setTimeout(() => {
+            timer = undefined;
+            const events = [...pending.values()];
+            pending.clear();
+            onBatch(events);
+        }, delayMs);
+    });
+    return () => {
+        unsubscribe();
+        if (timer !== undefined) clearTimeout(timer);
+    };
+};
+
+// Applies a batch of events to loaded rows as deltas: deleted rows and rows
+// that no longer match the view are dropped, `added` rows are merged in
+export const applyComplaintEvents = (
+    complaints: Complaint[], events: ComplaintEventBatch, added: Complaint[] = [],
+    matches: (event: ComplaintEvent) => boolean = () => true,
+): Complaint[] => {
+    const changes = new Map(events.map(([type, event]) => [event.complaint_id, { type, event }]));
+    const kept = complaints.flatMap(complaint => {
+        const change = changes.get(complaint.id);
+        if (!change) return [complaint];
+        const { type, event } = change;
+        if (type === 'deleted' || !matches(event)) return [];
+        return [{
+            ...complaint,
+            title: event.title ?? complaint.title,
+            status: event.status ?? complaint.status,
+            priority: event.priority ?? complaint.priority,
+            updated_at: event.updated_at ?? complaint.updated_at,
+        }];
+    });
+    const ids = new Set(kept.map(complaint => complaint.id));
+    const fresh = added.filter(complaint => !ids.has(complaint.id));
+    // Newest first, like the listing
+    return [...fresh, ...kept].sort((a, b) => b.created_at.localeCompare(a.created_at) || b.id - a.id);
+};
+
 export const getComplaint = async (id: number): Promise<Complaint> => {
     const response = await api.get(`/complaints/${id}/`);
     return response.data;
@@ -49,9 +211,16 @@ export const updateComplaintStatus = async (id: number, status: string): Promise
     return updateComplaint(id, { status });
 };
 
-export const getComplaintSolution = async (id: number): Promise<{ suggestion: string }> => {
-    const response = await api.get(`/complaints/${id}/suggest_resolution/`);
-    return response.data;
+export const getComplaintSolution = async (id: number): Promise<{ suggestion: string | null; status?: string }> => {
+    // The suggestion is precomputed in the background; poll while the job is still pending
+    for (let attempt = 0; attempt < 20; attempt++) {
+        const response = await api.get(`/complaints/${id}/suggest_resolution/`);
+        if (response.data.status !== 'pending') {
+            return response.data;
+        }
+        await new Promise((resolve) => setTimeout(resolve, 3000));
+    }
+    return { suggestion: null, status: 'pending' };
 };
 
 // Auth
@@ -0,0 +1,38 @@
+import { describe, it, expect } from 'vitest';
+import { applyComplaintEvents } from '../services/api';
+import type { Complaint } from '../services/api';
+
+const complaint = (id: number, status: string, created_at: string): Complaint => ({
+    id, status, created_at, title: `#${id}`, category: 'General', description: 'd',
+});
+
+describe('applyComplaintEvents', () => {
+    it('applies events as deltas without reloading', () => {
+        const loaded = [complaint(2, 'Pending', '2026-01-02T00:00:00Z'), complaint(1, 'Pending', '2026-01-01T00:00:00Z')];
+        const result = applyComplaintEvents(
+            loaded,
+            [
+                ['status_changed', { complaint_id: 1, user_id: 5, status: 'In Progress' }],
+                ['deleted', { complaint_id: 2, user_id: 5 }],
+                ['created', { complaint_id: 3, user_id: 5, status: 'Pending' }],
+            ],
+            [complaint(3, 'Pending', '2026-01-03T00:00:00Z')],
+        );
+        expect(result.map(c => [c.id, c.status])).toEqual([[3, 'Pending'], [1, 'In Progress']]);
+    });
+
+    it('merges a further page without duplicating live-added rows', () => {
+        const loaded = [complaint(3, 'Pending', '2026-01-03T00:00:00Z'), complaint(1, 'Pending', '2026-01-01T00:00:00Z')];
+        const page = [complaint(2, 'Pending', '2026-01-02T00:00:00Z'), complaint(1, 'Pending', '2026-01-01T00:00:00Z')];
+        expect(applyComplaintEvents(loaded, [], page).map(c => c.id)).toEqual([3, 2, 1]);
+    });
+
+    it('drops rows that leave the current view', () => {
+        const loaded = [complaint(1, 'Pending', '2026-01-01T00:00:00Z')];
+        const result = applyComplaintEvents(
+            loaded, [['status_changed', { complaint_id: 1, user_id: 5, status: 'Resolved' }]], [],
+            event => event.status === 'Pending',
+        );
+        expect(result).toEqual([]);
+    });
+});
@@ -1,3 +1,11 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import IncidentCluster
+
+
+@admin.register(IncidentCluster)
+class IncidentClusterAdmin(admin.ModelAdmin):
+    list_display = ('id', 'title', 'status', 'member_count', 'priority', 'ai_severity_score', 'created_at', 'last_seen_at')
+    list_filter = ('status', 'priority')
+    ordering = ('-last_seen_at',)
+    exclude = ('signature',)
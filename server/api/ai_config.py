@@ -51,3 +51,24 @@ TRAINING_DATA = [
     ("Is there an Android app coming?", 0),
     ("Minor text overlap in footer", 0),
 ]
+
+# Keyword overrides for the severity classifier
+# Format: {Label: [phrases]} - a phrase hit raises the label to at least this tier.
+# Extra phrases can be merged in from a JSON file ({"2": [...], "1": [...]})
+# pointed to by the SEVERITY_KEYWORDS_FILE environment variable.
+SEVERITY_KEYWORDS = {
+    2: [
+        "outage", "outages", "breach", "hacked", "data loss", "fraud", "unauthorized",
+        "double charged", "charged twice", "payment failed", "cannot login",
+        "service down", "crash", "crashes", "crashed", "blocked", "critical"
+    ],
+    1: [
+        "slow", "lag", "delayed", "not received", "missing",
+        "issue", "issues", "inconsistent", "misaligned", "bug", "bugs", "error", "errors"
+    ],
+}
+
+# Keywords match anywhere in the text, as they always have ("crash" matches
+# "crashing", "lag" matches "lagging", but also "error" matches "terrors").
+# Set to True to only match whole words/phrases.
+KEYWORD_WORD_BOUNDARY = False
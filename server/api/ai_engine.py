@@ -1,55 +1,152 @@
 import os
-import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.naive_bayes import MultinomialNB
-from sklearn.pipeline import make_pipeline
-from . import ai_config
-from gradio_client import Client
+import json
+import threading
+import time
+from . import ai_config, model_store
+from .keyword_matcher import AhoCorasickMatcher, normalize
+
+# numpy / scikit-learn / httpx are imported where they are first
+# needed so that importing this module (and api.views) stays cheap.
 
 # ==========================================
 # AI ENGINE (Severity Classifier - Local Sklearn)
 # ==========================================
+def load_keyword_map():
+    """
+    Builds the {label: [phrases]} map from ai_config, merged with the optional
+    JSON file named by SEVERITY_KEYWORDS_FILE.
+    """
+    keyword_map = {label: list(words) for label, words in ai_config.SEVERITY_KEYWORDS.items()}
+    path = os.getenv("SEVERITY_KEYWORDS_FILE")
+    if path:
+        try:
+            with open(path, encoding="utf-8") as fh:
+                extra = json.load(fh)
+            for label, words in extra.items():
+                keyword_map.setdefault(int(label), []).extend(words)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Failed to load severity keywords from {path}: {e}")
+    return keyword_map
+
 class KeywordSeverityModel:
-    def __init__(self):
-        self.keyword_map = {
-            2: [
-                "outage", "breach", "hacked", "data loss", "fraud", "unauthorized",
-                "double charged", "charged twice", "payment failed", "cannot login",
-                "service down", "crash", "crashes", "blocked", "critical"
-            ],
-            1: [
-                "slow", "lag", "delayed", "not received", "missing",
-                "issue", "inconsistent", "misaligned", "bug", "error"
-            ],
-        }
+    def __init__(self, keyword_map=None, word_boundary=None):
+        self.word_boundary = ai_config.KEYWORD_WORD_BOUNDARY if word_boundary is None else word_boundary
+        self._matcher = None
+        self.keyword_map = keyword_map if keyword_map is not None else load_keyword_map()
+
+    @property
+    def keyword_map(self):
+        return self._keyword_map
+
+    @keyword_map.setter
+    def keyword_map(self, keyword_map):
+        # The automaton is only recompiled when the keyword set actually changes
+        signature = frozenset(
+            (label, normalize(keyword)) for label, words in keyword_map.items() for keyword in words
+        )
+        self._keyword_map = keyword_map
+        if self._matcher is None or signature != self._signature:
+            self._signature = signature
+            self._matcher = AhoCorasickMatcher(
+                (keyword, label) for label, words in keyword_map.items() for keyword in words
+            )
+
+    def matches(self, text: str):
+        return self._matcher.find_all(text, word_boundary=self.word_boundary)
+
+    def matched_terms(self, text: str):
+        """Returns {label: [matched phrases]} for the text."""
+        terms = {}
+        for match in self.matches(text):
+            found = terms.setdefault(match.value, [])
+            if match.term not in found:
+                found.append(match.term)
+        return terms
 
     def predict(self, text: str) -> int:
-        lowered = text.lower()
-        for label in sorted(self.keyword_map.keys(), reverse=True):
-            if any(keyword in lowered for keyword in self.keyword_map[label]):
-                return label
-        return 0
+        return max((match.value for match in self.matches(text)), default=0)
+
+# Per-label (0=Low, 1=Medium, 2=High) score mapping and ETA
+SCORE_BASE = (1, 5, 8)
+SCORE_SPREAD = (3, 2, 2)
+PRIORITY_LABELS = ("Low", "Medium", "High")
+RESOLUTION_ETA = ("48 hours", "24 hours", "2-4 hours")
+
+FALLBACK_TRAINING_DATA = [
+    ("The app crashes every time I open settings", 2),
+    ("I cannot login to my account, password reset not working", 2),
+    ("Double charged for my subscription", 2),
+    ("Service is down completely", 2),
+    ("Data loss, my files are gone", 2),
+    ("How do I change my profile picture?", 0),
+    ("Loading is a bit slow today", 1),
+]
+
+def get_training_data():
+    try:
+        return ai_config.TRAINING_DATA
+    except AttributeError:
+        print("⚠️ ai_config.TRAINING_DATA not found, using minimal fallback data.")
+        return FALLBACK_TRAINING_DATA
+
+# How often workers look for a newly activated online model version
+ONLINE_MODEL_CHECK_SECONDS = float(os.getenv("SEVERITY_ONLINE_CHECK_SECONDS", "10"))
 
 class SeverityAI:
-    def __init__(self):
+    def __init__(self, training_data=None, use_artifact=True):
         self.model = None
+        self.online_version = None
+        self._checked_at = 0.0
         self.keyword_model = KeywordSeverityModel()
-        try:
-             self.training_data = ai_config.TRAINING_DATA
-        except AttributeError:
-            print("⚠️ ai_config.TRAINING_DATA not found, using minimal fallback data.")
-            self.training_data = [
-                ("The app crashes every time I open settings", 2),
-                ("I cannot login to my account, password reset not working", 2),
-                ("Double charged for my subscription", 2),
-                ("Service is down completely", 2),
-                ("Data loss, my files are gone", 2),
-                ("How do I change my profile picture?", 0),
-                ("Loading is a bit slow today", 1),
-            ]
+        self.training_data = training_data if training_data is not None else get_training_data()
+        if not use_artifact:
+            self._train()
+        elif not self._maybe_reload(force=True):
+            self._load_or_train()
+
+    def _maybe_reload(self, force=False):
+        """
+        Swaps in the active online model version (manage.py retrain_severity)
+        if it changed. Reassigning self.model is atomic, so in-flight
+        predictions keep using the model object they started with.
+        """
+        now = time.monotonic()
+        if not force and now - self._checked_at < ONLINE_MODEL_CHECK_SECONDS:
+            return False
+        self._checked_at = now
+
+        from . import online_model
+
+        version = online_model.active_version()
+        if version is None or version == self.online_version:
+            return False
+        model = online_model.load_version(version)
+        if model is None:
+            return False
+        self.model = model
+        self.online_version = version
+        print(f"🔄 Using online AI Severity Model v{version}")
+        return True
+
+    def _load_or_train(self):
+        key = model_store.artifact_key(self.training_data)
+        self.model = model_store.load_model(key)
+        if self.model is not None:
+            print(f"📦 Loaded AI Severity Model artifact {key}")
+            return
+
         self._train()
+        try:
+            path = model_store.save_model(self.model, key)
+            print(f"💾 Saved AI Severity Model artifact to {path}")
+        except OSError as e:
+            print(f"⚠️ Could not save model artifact: {e}")
 
     def _train(self):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.naive_bayes import MultinomialNB
+        from sklearn.pipeline import make_pipeline
+
         print("🧠 Training AI Severity Model...")
         texts, labels = zip(*self.training_data)
         self.model = make_pipeline(TfidfVectorizer(), MultinomialNB())
@@ -57,69 +154,150 @@ class SeverityAI:
         print("✅ AI Model Trained Successfully")
 
     def predict(self, text: str):
+        return self.predict_batch([text])[0]
+
+    def predict_batch(self, texts):
+        """
+        Classifies a batch of complaint texts in one vectorizer pass.
+        Returns a list of (score, priority, est_time) tuples in input order.
+        """
+        import numpy as np
+
+        self._maybe_reload()
         if not self.model:
             self._train()
-        
-        prediction = self.model.predict([text])[0]
-        probs = self.model.predict_proba([text])[0]
-        confidence = np.max(probs)
-        keyword_label = self.keyword_model.predict(text)
-        final_label = max(prediction, keyword_label)
-        if keyword_label > prediction:
-            confidence = max(confidence, 0.85)
-        
-        if final_label == 2: # High
-            score = 8 + int(confidence * 2)
-            priority = "High"
-            est_time = "2-4 hours"
-        elif final_label == 1: # Medium
-            score = 5 + int(confidence * 2)
-            priority = "Medium"
-            est_time = "24 hours"
-        else: # Low
-            score = 1 + int(confidence * 3)
-            priority = "Low"
-            est_time = "48 hours"
-            
-        return score, priority, est_time
-
-ai_engine = SeverityAI()
+
+        texts = list(texts)
+        if not texts:
+            return []
+
+        # One transform + one probability matrix for the whole batch
+        probs = self.model.predict_proba(texts)
+        classes = self.model.classes_
+        predictions = classes[np.argmax(probs, axis=1)]
+        confidence = np.max(probs, axis=1)
+
+        keyword_labels = np.fromiter(
+            (self.keyword_model.predict(text) for text in texts),
+            dtype=predictions.dtype,
+            count=len(texts),
+        )
+        final_labels = np.maximum(predictions, keyword_labels)
+        confidence = np.where(keyword_labels > predictions, np.maximum(confidence, 0.85), confidence)
+
+        # Score = base + floor(confidence * spread), per severity tier
+        base = np.choose(final_labels, SCORE_BASE)
+        spread = np.choose(final_labels, SCORE_SPREAD)
+        scores = base + np.floor(confidence * spread).astype(int)
+
+        return [
+            (int(score), PRIORITY_LABELS[label], RESOLUTION_ETA[label])
+            for score, label in zip(scores, final_labels)
+        ]
 
 # ==========================================
 # GENERATIVE AI (Replaces complex MCP/OpenRouter logic)
 # Based on: https://huggingface.co/spaces/devi1675/Customer-Support-ai/
 # ==========================================
 
+CHATBOT_UNAVAILABLE_MESSAGE = "System Error: Unable to connect to AI service."
+CHATBOT_ERROR_MESSAGE = "Error generating suggestion. Please try again later."
+
 class SupportChatbot:
-    def __init__(self):
-        try:
-             # Connect to the Hugging Face Space
-             print("🔌 Connecting to Hugging Face Space: devi1675/Customer-Support-ai...")
-             self.client = Client("devi1675/Customer-Support-ai")
-             print("✅ Connected to Gradio Client")
-        except Exception as e:
-            print(f"⚠️ Failed to initialize Gradio Client: {e}")
-            self.client = None
+    def __init__(self, url=None, **options):
+        from django.conf import settings
+        from .chatbot_client import AsyncGradioClient, ChatbotService, CircuitBreaker
+
+        # No handshake here: the Space is only contacted when a suggestion is requested
+        self.url = url or settings.CHATBOT_URL
+        print(f"🔌 AI chatbot client targeting {self.url}")
+        client = AsyncGradioClient(
+            self.url,
+            api_name=options.get("api_name", settings.CHATBOT_API_NAME),
+            api_prefix=options.get("api_prefix", settings.CHATBOT_API_PREFIX),
+            timeout=options.get("timeout", settings.CHATBOT_TIMEOUT),
+            max_concurrency=options.get("max_concurrency", settings.CHATBOT_MAX_CONCURRENCY),
+            breaker=CircuitBreaker(
+                threshold=options.get("breaker_threshold", settings.CHATBOT_BREAKER_THRESHOLD),
+                reset_timeout=options.get("breaker_reset", settings.CHATBOT_BREAKER_RESET),
+            ),
+        )
+        self.service = ChatbotService(client)
+
+    def suggest(self, message):
+        """Returns the chatbot reply; raises ChatbotError on timeout/failure/open circuit."""
+        return self.service.predict(message)
+
+    async def asuggest(self, message):
+        return await self.service.apredict(message)
 
     def get_response(self, message):
-        if not self.client:
-            return "System Error: Unable to connect to AI service."
-        
+        from .chatbot_client import ChatbotError, CircuitOpenError
+
         try:
-            # The API endpoint is /chat as per user instruction
-            result = self.client.predict(
-                message=message,
-                api_name="/chat"
-            )
-            return result
-        except Exception as e:
+            return self.suggest(message)
+        except CircuitOpenError:
+            return CHATBOT_UNAVAILABLE_MESSAGE
+        except ChatbotError as e:
             print(f"Error calling Gradio API: {e}")
-            return "Error generating suggestion. Please try again later."
+            return CHATBOT_ERROR_MESSAGE
 
-chatbot = SupportChatbot()
+    async def aget_response(self, message):
+        from .chatbot_client import ChatbotError, CircuitOpenError
+
+        try:
+            return await self.asuggest(message)
+        except CircuitOpenError:
+            return CHATBOT_UNAVAILABLE_MESSAGE
+        except ChatbotError as e:
+            print(f"Error calling Gradio API: {e}")
+            return CHATBOT_ERROR_MESSAGE
+
+# ==========================================
+# LAZY ACCESSORS
+# Nothing is trained or connected at import time; the first caller pays
+# the cost (or ApiConfig.ready() warms them up in the background).
+# ==========================================
+
+_init_lock = threading.Lock()
+_severity_ai = None
+_chatbot = None
+
+def get_severity_ai() -> SeverityAI:
+    global _severity_ai
+    if _severity_ai is None:
+        with _init_lock:
+            if _severity_ai is None:
+                _severity_ai = SeverityAI()
+    return _severity_ai
+
+def get_chatbot() -> SupportChatbot:
+    global _chatbot
+    if _chatbot is None:
+        with _init_lock:
+            if _chatbot is None:
+                _chatbot = SupportChatbot()
+    return _chatbot
+
+def warm_up(chatbot=True):
+    """Builds the classifier (and optionally the chatbot client) ahead of the first request."""
+    get_severity_ai()
+    if chatbot:
+        get_chatbot()
 
 def generate_ai_suggestion(complaint_text: str) -> str:
     """
     Directly uses the Chatbot logic to suggest a resolution for the complaint.
     """
-    return chatbot.get_response(complaint_text)
+    return get_chatbot().get_response(complaint_text)
+
+async def agenerate_ai_suggestion(complaint_text: str) -> str:
+    """
+    Async generate_ai_suggestion: awaits the chatbot instead of blocking a
+    thread on it, for async views.
+    """
+    return await get_chatbot().aget_response(complaint_text)
+
+def is_cacheable_suggestion(suggestion) -> bool:
+    """Error fallbacks must not be cached, or a transient outage would stick."""
+    return bool(suggestion) and suggestion not in (CHATBOT_UNAVAILABLE_MESSAGE, CHATBOT_ERROR_MESSAGE)
@@ -1,6 +1,39 @@
+import threading
+
 from django.apps import AppConfig
+from django.conf import settings
+from django.db.models.signals import post_migrate
 
 
 class ApiConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "api"
+
+    def ready(self):
+        from . import changes  # noqa: F401  (registers the change feed signal handlers)
+        from . import db_metrics  # noqa: F401  (counts connections and queries per alias)
+
+        post_migrate.connect(_ensure_search_index, sender=self)
+
+        # Optional: build the AI stack in the background so the first request
+        # does not pay for it. Off by default so migrate/admin/scripts stay fast.
+        if getattr(settings, "AI_WARMUP", False):
+            from .ai_engine import warm_up
+
+            threading.Thread(
+                target=warm_up,
+                kwargs={"chatbot": getattr(settings, "AI_WARMUP_CHATBOT", True)},
+                name="ai-warmup",
+                daemon=True,
+            ).start()
+
+
+def _ensure_search_index(using="default", **kwargs):
+    # SQLite table rebuilds (AlterField/RemoveField) drop the FTS triggers
+    from django.db import connections
+
+    from .search import install
+
+    connection = connections[using]
+    if "api_complaint" in connection.introspection.table_names():
+        install(connection)
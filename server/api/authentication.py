@@ -0,0 +1,77 @@
+from django.utils.functional import cached_property
+from rest_framework import authentication, exceptions
+
+from .models import User
+from .tokens import InvalidToken, verify_access
+
+
+class TokenUser:
+    """
+    request.user for a bearer token. id, role and is_staff come from the
+    signed claims; any other attribute loads the User row (once).
+    """
+
+    is_authenticated = True
+    is_anonymous = False
+    is_active = True
+
+    def __init__(self, claims):
+        self.id = self.pk = claims["sub"]
+        self.role = claims.get("role")
+        self.is_staff = bool(claims.get("staff"))
+        self.claims = claims
+
+    @cached_property
+    def user(self):
+        return User.objects.get(pk=self.id)
+
+    def __getattr__(self, name):
+        # Only reached for attributes not set above
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.user, name)
+
+    def __eq__(self, other):
+        return isinstance(other, (TokenUser, User)) and other.pk == self.pk
+
+    def __hash__(self):
+        return hash(self.pk)
+
+    def __str__(self):
+        return f"user {self.pk} (token)"
+
+
+def bearer_token(request, allow_query=False):
+    """
+    The raw token from "Authorization: Bearer <token>", or None. With
+    allow_query, ?access_token= is accepted too (EventSource cannot set headers).
+    """
+    header = authentication.get_authorization_header(request).split()
+    if header and header[0].lower() == b"bearer":
+        if len(header) != 2:
+            raise InvalidToken("Invalid Authorization header.")
+        return header[1].decode("latin-1")
+    if allow_query:
+        return request.GET.get("access_token") or None
+    return None
+
+
+def user_from_token(request, allow_query=False):
+    """TokenUser for the request's bearer token, or None; for views outside DRF."""
+    token = bearer_token(request, allow_query)
+    return TokenUser(verify_access(token)) if token else None
+
+
+class BearerTokenAuthentication(authentication.BaseAuthentication):
+    """DRF authentication from signed access tokens (api/tokens.py)."""
+
+    def authenticate(self, request):
+        try:
+            user = user_from_token(request)
+        except InvalidToken as e:
+            raise exceptions.AuthenticationFailed(str(e))
+        return (user, user.claims) if user else None
+
+    def authenticate_header(self, request):
+        # Makes failures 401 with WWW-Authenticate, so clients know to refresh
+        return 'Bearer realm="api"'
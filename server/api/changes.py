@@ -0,0 +1,135 @@
+from django.db import transaction
+from django.db.models import F, Max
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from .models import ChangeCounter, ChangeLogEntry, Complaint, ComplaintHistory, ResolutionEntry
+
+# ==========================================
+# CHANGE FEED (delta sync for dashboards)
+# Every write to a complaint, its history or its resolution entries appends
+# a ChangeLogEntry with the next sequence number. Numbers come from one
+# counter row that is incremented inside the writer's transaction, so the
+# row lock is held until commit: a transaction holding a lower number has
+# always committed (or rolled back, taking its numbers with it) before a
+# higher one becomes visible. Readers can therefore never skip a change by
+# advancing past a number that commits later.
+# ==========================================
+
+COUNTER_PK = 1
+DEFAULT_LIMIT = 200
+MAX_LIMIT = 1000
+
+# Sent after a transaction that recorded changes commits (wakes api/events.py)
+change_recorded = Signal()
+
+
+class InvalidSince(ValueError):
+    pass
+
+
+def _allocate(count):
+    """Reserves `count` consecutive sequence numbers; returns the first one."""
+    with transaction.atomic():
+        updated = ChangeCounter.objects.filter(pk=COUNTER_PK).update(value=F("value") + count)
+        if not updated:
+            ChangeCounter.objects.get_or_create(pk=COUNTER_PK)
+            ChangeCounter.objects.filter(pk=COUNTER_PK).update(value=F("value") + count)
+        last = ChangeCounter.objects.values_list("value", flat=True).get(pk=COUNTER_PK)
+    return last - count + 1
+
+
+def record(complaints, action="updated", history_id=None):
+    """
+    Appends one log entry per complaint (a bulk write may pass many).
+    `complaints` are Complaint instances or (complaint_id, user_id) pairs.
+    """
+    rows = [(c.pk, c.user_id) if isinstance(c, Complaint) else tuple(c) for c in complaints]
+    if not rows:
+        return
+    with transaction.atomic():
+        first = _allocate(len(rows))
+        ChangeLogEntry.objects.bulk_create(
+            ChangeLogEntry(
+                seq=first + n, complaint_id=pk, user_id=user_id, history_id=history_id,
+                action=action, deleted=action == "deleted",
+            )
+            for n, (pk, user_id) in enumerate(rows)
+        )
+        transaction.on_commit(lambda: change_recorded.send(sender=ChangeLogEntry))
+
+
+def current_cursor():
+    """The sequence number a client that just loaded everything should resume from."""
+    return ChangeLogEntry.objects.aggregate(last=Max("seq"))["last"] or 0
+
+
+def parse_since(value):
+    if value in (None, ""):
+        return 0
+    try:
+        since = int(value)
+    except (TypeError, ValueError):
+        raise InvalidSince("since must be a cursor returned by this API")
+    if since < 0:
+        raise InvalidSince("since must be a cursor returned by this API")
+    return since
+
+
+def changes_since(since, limit=DEFAULT_LIMIT, user_id=None):
+    """
+    Log entries after `since` (only for `user_id`'s complaints if given),
+    oldest first. Returns (complaint_ids, history_ids, deleted_ids, cursor,
+    has_more); cursor is the new `since`.
+    """
+    entries = ChangeLogEntry.objects.filter(seq__gt=since)
+    if user_id is not None:
+        entries = entries.filter(user_id=user_id)
+    entries = list(
+        entries.order_by("seq")
+        .values_list("seq", "complaint_id", "history_id", "deleted")[:limit + 1]
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    changed, history, deleted = {}, [], {}
+    for seq, complaint_id, history_id, is_deleted in entries:
+        if is_deleted:
+            changed.pop(complaint_id, None)
+            deleted[complaint_id] = seq
+        else:
+            deleted.pop(complaint_id, None)
+            changed[complaint_id] = seq
+            if history_id:
+                history.append(history_id)
+    cursor = entries[-1][0] if entries else since
+    return list(changed), history, list(deleted), cursor, has_more
+
+
+# ==========================================
+# Recording hooks. bulk_create / queryset.update() bypass these; callers
+# doing bulk writes (api/ingest.py) call record() themselves.
+# ==========================================
+
+@receiver(post_save, sender=Complaint)
+def _complaint_saved(sender, instance, created=False, raw=False, **kwargs):
+    if not raw:
+        record([instance], action="created" if created else "updated")
+
+
+@receiver(post_delete, sender=Complaint)
+def _complaint_deleted(sender, instance, **kwargs):
+    record([instance], action="deleted")
+
+
+@receiver(post_save, sender=ComplaintHistory)
+def _history_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        record([(instance.complaint_id, instance.complaint.user_id)], action=instance.action, history_id=instance.pk)
+
+
+@receiver(post_save, sender=ResolutionEntry)
+def _resolution_saved(sender, instance, raw=False, **kwargs):
+    # The combined resolution is part of the complaint's representation
+    if not raw:
+        record([(instance.complaint_id, instance.complaint.user_id)])
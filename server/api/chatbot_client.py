@@ -0,0 +1,172 @@
+import asyncio
+import json
+import threading
+import time
+
+import httpx
+
+
+class ChatbotError(Exception):
+    pass
+
+
+class ChatbotTimeout(ChatbotError):
+    pass
+
+
+class CircuitOpenError(ChatbotError):
+    pass
+
+
+class CircuitBreaker:
+    """
+    Opens after `threshold` consecutive failures and rejects calls for
+    `reset_timeout` seconds. After that one trial call is let through
+    (half-open): success closes the circuit, failure re-opens it.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, threshold=5, reset_timeout=30.0):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.state = self.CLOSED
+        self.opened_at = 0.0
+
+    def allow(self) -> bool:
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = self.HALF_OPEN
+            return True
+        # Only one trial call while half-open
+        return self.state == self.CLOSED
+
+    def record_success(self):
+        self.failures = 0
+        self.state = self.CLOSED
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+
+class AsyncGradioClient:
+    """
+    asyncio client for a Gradio app's REST API:
+      POST {base}{prefix}/call/{api_name}  {"data": [message]} -> {"event_id"}
+      GET  {base}{prefix}/call/{api_name}/{event_id}           -> SSE result
+
+    Every call has a deadline covering both the wait for a concurrency slot
+    and the upstream request. Concurrent calls for the same message share a
+    single upstream request (single-flight).
+    """
+
+    def __init__(self, base_url, api_name="/chat", api_prefix="/gradio_api", timeout=30.0,
+                 max_concurrency=8, breaker=None):
+        self.base_url = base_url.rstrip("/")
+        self.call_url = f"{self.base_url}{api_prefix}/call/{api_name.lstrip('/')}"
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.breaker = breaker or CircuitBreaker()
+        self._semaphore = None
+        self._http = None
+        self._inflight = {}
+
+    async def predict(self, message: str) -> str:
+        future = self._inflight.get(message)
+        if future is None:
+            future = asyncio.ensure_future(self._call(message))
+            self._inflight[message] = future
+            future.add_done_callback(lambda _: self._inflight.pop(message, None))
+        # shield: one caller being cancelled must not cancel the shared call
+        return await asyncio.shield(future)
+
+    async def _call(self, message):
+        if not self.breaker.allow():
+            raise CircuitOpenError("AI service circuit is open")
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._http = httpx.AsyncClient(timeout=httpx.Timeout(self.timeout))
+
+        try:
+            result = await asyncio.wait_for(self._limited_request(message), self.timeout)
+        except (asyncio.TimeoutError, httpx.TimeoutException):
+            self.breaker.record_failure()
+            raise ChatbotTimeout(f"No response from AI service within {self.timeout}s") from None
+        except (httpx.HTTPError, KeyError, ValueError, ChatbotError) as e:
+            self.breaker.record_failure()
+            raise ChatbotError(str(e) or e.__class__.__name__) from e
+        except BaseException:
+            # Anything else (a bug, cancellation) still ends a half-open trial
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        return result
+
+    async def _limited_request(self, message):
+        async with self._semaphore:
+            return await self._request(message)
+
+    async def _request(self, message):
+        response = await self._http.post(self.call_url, json={"data": [message]})
+        response.raise_for_status()
+        event_id = response.json()["event_id"]
+
+        event = None
+        async with self._http.stream("GET", f"{self.call_url}/{event_id}") as stream:
+            stream.raise_for_status()
+            async for line in stream.aiter_lines():
+                if line.startswith("event:"):
+                    event = line[len("event:"):].strip()
+                elif line.startswith("data:") and event in ("complete", "error"):
+                    data = line[len("data:"):].strip()
+                    if event == "error":
+                        raise ChatbotError(f"AI service error: {data}")
+                    return self._result(data)
+        raise ChatbotError("AI service closed the stream without a result")
+
+    @staticmethod
+    def _result(data):
+        try:
+            payload = json.loads(data)
+        except ValueError:
+            payload = None
+        if not isinstance(payload, list) or not payload:
+            raise ChatbotError(f"Malformed AI service response: {data[:200]}")
+        return payload[0]
+
+    async def aclose(self):
+        if self._http is not None:
+            await self._http.aclose()
+
+
+class ChatbotService:
+    """
+    Runs an AsyncGradioClient on a dedicated event loop thread so sync views
+    (and async views on other loops) in this process share one semaphore,
+    circuit breaker and single-flight table.
+    """
+
+    def __init__(self, client: AsyncGradioClient):
+        self.client = client
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="chatbot-loop", daemon=True)
+        self._thread.start()
+
+    def _submit(self, message):
+        return asyncio.run_coroutine_threadsafe(self.client.predict(message), self._loop)
+
+    def predict(self, message: str) -> str:
+        return self._submit(message).result()
+
+    async def apredict(self, message: str) -> str:
+        return await asyncio.wrap_future(self._submit(message))
+
+    def close(self):
+        asyncio.run_coroutine_threadsafe(self.client.aclose(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
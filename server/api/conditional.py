@@ -0,0 +1,57 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+
+from .pagination import keyset_page
+
+# ==========================================
+# CONDITIONAL GET for complaint list/detail
+# A representation changes when a complaint row is saved (updated_at) or
+# history is appended to it. The validators are computed from those columns
+# alone in one aggregate query, so a 304 never loads the full rows, their
+# history or runs the serializer. ETags only: Last-Modified has whole-second
+# resolution, so an If-Modified-Since client would get a 304 for an edit
+# made within the same second.
+# ==========================================
+
+CACHE_CONTROL = "private, no-cache"  # browsers keep the body but always revalidate
+
+
+class Validators:
+    def __init__(self, parts):
+        digest = hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+        self.etag = f'"{digest}"'
+
+    def not_modified(self, request):
+        """The 304 response if the client's copy is current, else None."""
+        response = get_conditional_response(request, etag=self.etag)
+        if response is not None:
+            self.apply(response)
+        return response
+
+    def apply(self, response):
+        response["ETag"] = self.etag
+        response["Cache-Control"] = CACHE_CONTROL
+        return response
+
+
+def _changed(queryset):
+    return queryset.annotate(last_history=Max("history__timestamp"), history_count=Count("history"))
+
+
+def detail_validators(queryset, pk):
+    """Validators for one complaint, or None if it does not exist."""
+    row = _changed(queryset.filter(pk=pk)).values_list("updated_at", "last_history", "history_count").first()
+    if row is None:
+        return None
+    return Validators((pk, *row))
+
+
+def page_validators(queryset, cursor, page_size):
+    """Validators for one keyset page (same rows as pagination.keyset_page)."""
+    rows, next_cursor = keyset_page(
+        _changed(queryset.only("id", "created_at", "updated_at")), cursor=cursor, page_size=page_size
+    )
+    parts = [(row.pk, row.updated_at, row.last_history, row.history_count) for row in rows]
+    return Validators((parts, next_cursor))
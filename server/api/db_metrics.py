@@ -0,0 +1,81 @@
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from .db_router import replicas
+
+# ==========================================
+# PER-ALIAS DATABASE METRICS (this process)
+# Counts connections opened, queries, errors and query time for every
+# database alias. Each new connection gets a QueryObserver execute wrapper;
+# connection_created fires on every (re)connect, so a rising
+# connections_opened means connections are not being reused.
+# ==========================================
+
+_lock = threading.Lock()
+_counters = defaultdict(Counter)
+
+
+def _count(alias, **amounts):
+    with _lock:
+        _counters[alias].update(amounts)
+
+
+class QueryObserver:
+    def __init__(self, alias):
+        self.alias = alias
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        except Exception:
+            _count(self.alias, errors=1)
+            raise
+        finally:
+            _count(self.alias, queries=1, query_ms=(time.perf_counter() - start) * 1000)
+
+
+def _on_connection_created(sender, connection, **kwargs):
+    _count(connection.alias, connections_opened=1)
+    # The wrapper list outlives reconnects of the same DatabaseWrapper
+    if not any(isinstance(wrapper, QueryObserver) for wrapper in connection.execute_wrappers):
+        connection.execute_wrappers.insert(0, QueryObserver(connection.alias))
+
+
+connection_created.connect(_on_connection_created, dispatch_uid="api.db_metrics")
+
+
+def _pool_stats(alias):
+    pool = getattr(connections[alias], "pool", None)  # psycopg 3 only
+    return pool.get_stats() if pool is not None else None
+
+
+def snapshot():
+    with _lock:
+        counters = {alias: dict(values) for alias, values in _counters.items()}
+    health = replicas.status()
+    result = {}
+    for alias in connections:
+        values = counters.get(alias, {})
+        queries = values.get("queries", 0)
+        result[alias] = {
+            "role": "replica" if alias in settings.DATABASE_REPLICAS else "primary",
+            "vendor": connections[alias].vendor,
+            "connections_opened": values.get("connections_opened", 0),
+            "queries": queries,
+            "errors": values.get("errors", 0),
+            "avg_query_ms": round(values.get("query_ms", 0) / queries, 3) if queries else None,
+            "pool": _pool_stats(alias),
+            **({"health": health[alias]} if alias in health else {}),
+        }
+    return result
+
+
+def reset():
+    with _lock:
+        _counters.clear()
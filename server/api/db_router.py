@@ -0,0 +1,191 @@
+import functools
+import itertools
+import threading
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, InterfaceError, OperationalError, connections
+from django.utils.decorators import sync_and_async_middleware
+
+# ==========================================
+# READ REPLICAS
+# Views opt in with @replica_reads: their GET/HEAD queries go to one healthy
+# replica per request (settings.DATABASE_REPLICAS, round-robin across
+# requests). Everything else stays on
+# the primary:
+#   - every write, and every read after a write in the same request;
+#   - requests from a client that wrote recently (PRIMARY_PIN_COOKIE, set by
+#     primary_pinning_middleware for DATABASE_REPLICA_PIN_SECONDS), so users
+#     see their own changes even while replicas lag behind;
+#   - reads while no replica is healthy. Replicas are checked at most every
+#     DATABASE_REPLICA_CHECK_INTERVAL seconds: reachable, and on PostgreSQL
+#     no more than DATABASE_REPLICA_MAX_LAG seconds behind.
+# ==========================================
+
+PRIMARY_PIN_COOKIE = "db_primary_pin"
+
+_replica_reads = ContextVar("replica_reads", default=False)
+_pinned = ContextVar("primary_pinned", default=False)
+_replica_used = ContextVar("replica_used", default=None)
+
+POSTGRES_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+
+class ReplicaSet:
+    """Health and round-robin selection of the configured replicas (per process)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = {}
+        self._turn = itertools.count()
+
+    def _entry(self, alias):
+        return self._state.setdefault(alias, {"healthy": True, "checked_at": float("-inf"), "lag_s": None, "error": None})
+
+    def choose(self):
+        healthy = [alias for alias in settings.DATABASE_REPLICAS if self.is_healthy(alias)]
+        if not healthy:
+            return None
+        return healthy[next(self._turn) % len(healthy)]
+
+    def is_healthy(self, alias):
+        with self._lock:
+            entry = self._entry(alias)
+            due = time.monotonic() - entry["checked_at"] >= settings.DATABASE_REPLICA_CHECK_INTERVAL
+            if due:
+                entry["checked_at"] = time.monotonic()  # one thread checks, the rest use the last result
+        if due:
+            self.check(alias)
+        return self._entry(alias)["healthy"]
+
+    def check(self, alias):
+        connection = connections[alias]
+        lag, error = None, None
+        try:
+            connection.ensure_connection()
+            if connection.vendor == "postgresql":
+                with connection.cursor() as cursor:
+                    cursor.execute(POSTGRES_LAG_SQL)
+                    lag = cursor.fetchone()[0]
+                lag = float(lag) if lag is not None else None
+        except DatabaseError as e:
+            error = str(e) or e.__class__.__name__
+            connection.close_if_unusable_or_obsolete()
+        healthy = error is None and (lag is None or lag <= settings.DATABASE_REPLICA_MAX_LAG)
+        if error is None and not healthy:
+            error = f"replication lag {lag:.1f}s"
+        with self._lock:
+            self._entry(alias).update(healthy=healthy, checked_at=time.monotonic(), lag_s=lag, error=error)
+        return healthy
+
+    def mark_down(self, alias, error):
+        """Takes a failing replica out until its next check is due."""
+        with self._lock:
+            self._entry(alias).update(healthy=False, checked_at=time.monotonic(), error=str(error))
+
+    def status(self):
+        with self._lock:
+            return {alias: dict(self._entry(alias)) for alias in settings.DATABASE_REPLICAS}
+
+    def reset(self):
+        with self._lock:
+            self._state.clear()
+
+
+replicas = ReplicaSet()
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        # One replica per request (chosen by @replica_reads), so its reads are consistent
+        alias = _replica_used.get()
+        if not _replica_reads.get() or _pinned.get() or alias is None:
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        # Whatever the request reads next must see this write
+        _pinned.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
+
+
+def replica_reads(view):
+    """
+    Sends a view's GET/HEAD reads to one replica, chosen when the request
+    starts. If it fails mid-request it is marked down and the view runs again
+    on the primary (reads are safe to repeat).
+    """
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return view(request, *args, **kwargs)
+        # Writes made inside the view pin only this request
+        alias = replicas.choose() if settings.DATABASE_REPLICAS and not _pinned.get() else None
+        reads, used, pinned = _replica_reads.set(True), _replica_used.set(alias), _pinned.set(_pinned.get())
+        try:
+            try:
+                return view(request, *args, **kwargs)
+            except (OperationalError, InterfaceError) as e:
+                if alias is None:
+                    raise
+                print(f"⚠️ Replica {alias} failed, retrying on primary: {e}")
+                replicas.mark_down(alias, e)
+                _replica_reads.set(False)
+                return view(request, *args, **kwargs)
+        finally:
+            _replica_reads.reset(reads)
+            _replica_used.reset(used)
+            _pinned.reset(pinned)
+    return wrapper
+
+
+def _pin_from(request):
+    return _pinned.set(bool(settings.DATABASE_REPLICAS) and PRIMARY_PIN_COOKIE in request.COOKIES)
+
+
+def _remember_write(request, response):
+    if (
+        settings.DATABASE_REPLICAS
+        and request.method not in ("GET", "HEAD", "OPTIONS")
+        and response.status_code < 400
+    ):
+        response.set_cookie(
+            PRIMARY_PIN_COOKIE, "1", max_age=settings.DATABASE_REPLICA_PIN_SECONDS,
+            httponly=True, samesite="Lax",
+        )
+    return response
+
+
+@sync_and_async_middleware
+def primary_pinning_middleware(get_response):
+    """Keeps a client's reads on the primary for a few seconds after it writes."""
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            token = _pin_from(request)
+            try:
+                return _remember_write(request, await get_response(request))
+            finally:
+                _pinned.reset(token)
+    else:
+        def middleware(request):
+            token = _pin_from(request)
+            try:
+                return _remember_write(request, get_response(request))
+            finally:
+                _pinned.reset(token)
+    return middleware
@@ -0,0 +1,215 @@
+import asyncio
+import json
+import threading
+import weakref
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .changes import change_recorded, current_cursor
+from .models import ChangeLogEntry, Complaint
+
+# ==========================================
+# REAL-TIME COMPLAINT EVENTS (server-sent events over ASGI)
+# One EventBroker per event loop (i.e. per ASGI worker) tails the change
+# log (api/changes.py) and fans events out to in-memory subscriber queues:
+# one DB query per poll, whatever the number of connected dashboards.
+# Commits in this process wake the broker at once; other workers' commits
+# are picked up on the next poll. Event ids are change sequence numbers, so
+# a reconnecting client (Last-Event-ID) replays exactly what it missed.
+# ==========================================
+
+EVENT_TYPES = {
+    "created": "created",
+    "updated": "updated",
+    "deleted": "deleted",
+    "STATUS_CHANGE": "status_changed",
+    "PRIORITY_CHANGE": "priority_changed",
+    "RESOLUTION_ADDED": "resolution_added",
+}
+REPLAY_LIMIT = 1000
+
+
+def load_events(after_seq, limit=500):
+    """Events for change log entries after `after_seq`, oldest first."""
+    entries = list(
+        ChangeLogEntry.objects.filter(seq__gt=after_seq)
+        .order_by("seq")
+        .values_list("seq", "complaint_id", "user_id", "action")[:limit]
+    )
+    ids = {complaint_id for _, complaint_id, _, action in entries if action != "deleted"}
+    complaints = {
+        row["id"]: row
+        for row in Complaint.objects.filter(pk__in=ids).values("id", "title", "status", "priority", "updated_at")
+    }
+    events = []
+    for seq, complaint_id, user_id, action in entries:
+        data = {"complaint_id": complaint_id, "user_id": user_id}
+        current = complaints.get(complaint_id)
+        if current:
+            data.update(title=current["title"], status=current["status"], priority=current["priority"],
+                        updated_at=current["updated_at"])
+        events.append({"seq": seq, "type": EVENT_TYPES.get(action, "updated"), "user_id": user_id, "data": data})
+    return events
+
+
+def format_event(event):
+    data = json.dumps(event["data"], cls=DjangoJSONEncoder)
+    return f"id: {event['seq']}\nevent: {event['type']}\ndata: {data}\n\n"
+
+
+class Subscription:
+    """One connected stream; admins see every complaint, customers their own."""
+
+    def __init__(self, user_id=None, see_all=False, maxsize=None):
+        self.user_id = user_id
+        self.see_all = see_all
+        self.queue = asyncio.Queue(maxsize or settings.EVENTS_QUEUE_SIZE)
+        self.overflowed = False
+        self.held = None  # live events parked while a replay is in progress
+
+    def wants(self, event):
+        return self.see_all or (self.user_id is not None and event["user_id"] == self.user_id)
+
+    def offer(self, event):
+        """Live event from the broker."""
+        if self.held is not None:
+            self.held.append(event)
+        else:
+            self.deliver(event)
+
+    def deliver(self, event):
+        if self.overflowed or not self.wants(event):
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Too slow to keep up: the stream ends once the queue drains and
+            # the client resumes from its Last-Event-ID
+            self.overflowed = True
+
+
+class EventBroker:
+    def __init__(self, poll_interval=None):
+        self.poll_interval = poll_interval if poll_interval is not None else settings.EVENTS_POLL_INTERVAL
+        self.subscribers = set()
+        self.last_seq = None
+        self.loop = None
+        self._wake = None
+        self._starting = None
+        self._task = None
+
+    async def subscribe(self, user_id=None, see_all=False, since=None, maxsize=None):
+        """Registers a subscriber; events after `since` already logged are replayed first."""
+        self.loop = asyncio.get_running_loop()
+        if self._wake is None:
+            self._wake = asyncio.Event()
+            self._starting = asyncio.Lock()
+
+        subscription = Subscription(user_id, see_all, maxsize)
+        if since is not None:
+            subscription.held = []
+        # Concurrent first subscribers must not each start a poll loop
+        async with self._starting:
+            if self._task is None or self._task.done():
+                # Nobody was listening: start from now rather than from a stale position
+                self.last_seq = await sync_to_async(current_cursor)()
+                self._task = asyncio.ensure_future(self._run())
+            self.subscribers.add(subscription)
+        if since is not None:
+            # Everything up to the boundary comes from the log, later events live
+            boundary = self.last_seq
+            await self._replay(subscription, since, boundary)
+            held, subscription.held = subscription.held, None
+            for event in held:
+                if event["seq"] > boundary:
+                    subscription.deliver(event)
+        return subscription
+
+    async def _replay(self, subscription, since, boundary):
+        while since < boundary and not subscription.overflowed:
+            events = await sync_to_async(load_events)(since, REPLAY_LIMIT)
+            if not events:
+                return
+            for event in events:
+                if event["seq"] > boundary:
+                    return
+                subscription.deliver(event)
+                since = event["seq"]
+
+    def unsubscribe(self, subscription):
+        self.subscribers.discard(subscription)
+
+    def wake(self):
+        """Thread-safe: poll now (called when a local transaction commits changes)."""
+        if self.loop is not None and self._wake is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._wake.set)
+
+    async def poll(self):
+        events = await sync_to_async(load_events)(self.last_seq)
+        for event in events:
+            self.last_seq = event["seq"]
+            for subscription in list(self.subscribers):
+                subscription.offer(event)
+        return len(events)
+
+    async def _run(self):
+        while self.subscribers:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                # Drain: a burst larger than one batch is delivered without waiting
+                while await self.poll():
+                    pass
+            except Exception as e:
+                print(f"⚠️ Event broker poll failed: {e}")
+
+
+_brokers = weakref.WeakKeyDictionary()
+_brokers_lock = threading.Lock()
+
+
+def get_broker():
+    """The broker of the running event loop (one per ASGI worker)."""
+    loop = asyncio.get_running_loop()
+    with _brokers_lock:
+        broker = _brokers.get(loop)
+        if broker is None:
+            broker = _brokers[loop] = EventBroker()
+    return broker
+
+
+def _wake_brokers(**kwargs):
+    with _brokers_lock:
+        brokers = list(_brokers.values())
+    for broker in brokers:
+        broker.wake()
+
+
+change_recorded.connect(_wake_brokers, dispatch_uid="api.events.wake_brokers")
+
+
+async def event_stream(broker, heartbeat=None, **subscribe_kwargs):
+    """
+    SSE body: subscribes when the response starts streaming, then yields
+    events as they arrive and a comment line when idle to keep proxies open.
+    """
+    heartbeat = heartbeat if heartbeat is not None else settings.EVENTS_HEARTBEAT
+    yield f"retry: {settings.EVENTS_RETRY_MS}\n\n"
+    subscription = await broker.subscribe(**subscribe_kwargs)
+    try:
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield format_event(event)
+            if subscription.overflowed and subscription.queue.empty():
+                return
+    finally:
+        broker.unsubscribe(subscription)
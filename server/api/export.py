@@ -0,0 +1,131 @@
+import csv
+import json
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework import renderers
+
+from .filters import filter_complaints
+from .models import Complaint, ComplaintHistory, ResolutionEntry
+
+# ==========================================
+# STREAMING EXPORT (nightly analytics dumps)
+# Rows come off a server-side cursor (QuerySet.iterator) and are encoded
+# into ~64KB blocks as they arrive, so memory stays flat and the first
+# bytes go out immediately. Optional gzip is streamed as well.
+# ==========================================
+
+CHUNK_SIZE = 2000  # rows fetched per cursor round trip
+BLOCK_SIZE = 64 * 1024  # bytes buffered before yielding
+
+FORMATS = ("ndjson", "csv")
+KINDS = ("complaints", "history", "resolutions")
+
+COLUMNS = {
+    "complaints": (
+        "id", "user_id", "title", "description", "category", "status", "priority",
+        "ai_severity_score", "ai_predicted_resolution_time", "incident_id",
+        "created_at", "updated_at",
+    ),
+    "history": (
+        "id", "complaint_id", "action", "previous_value", "new_value", "changed_by_id", "timestamp",
+    ),
+    "resolutions": ("id", "complaint_id", "text", "author_id", "created_at"),
+}
+CONTENT_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+class ExportError(ValueError):
+    pass
+
+
+def export_queryset(kind, params):
+    """Rows to export for `kind`, narrowed by the listing filters (see api/filters.py)."""
+    if kind not in KINDS:
+        raise ExportError(f"Unknown export {kind!r}; expected one of {', '.join(KINDS)}")
+    complaints = filter_complaints(Complaint.objects.all(), params)
+    if kind == "complaints":
+        queryset = complaints
+    else:
+        model = ComplaintHistory if kind == "history" else ResolutionEntry
+        queryset = model.objects.all()
+        if complaints.query.where:
+            queryset = queryset.filter(complaint__in=complaints.values("id"))
+    # Primary key order: stable, and served straight from the pk index
+    return queryset.order_by("id").values_list(*COLUMNS[kind])
+
+
+class _Line:
+    """File-like sink for csv.writer: hands back what was written."""
+
+    def write(self, value):
+        return value
+
+
+def _encode(kind, fmt, rows):
+    columns = COLUMNS[kind]
+    if fmt == "ndjson":
+        encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(",", ":"))
+        for row in rows:
+            yield encoder.encode(dict(zip(columns, row))) + "\n"
+    elif fmt == "csv":
+        writer = csv.writer(_Line())
+        yield writer.writerow(columns)
+        for row in rows:
+            yield writer.writerow(
+                [value.isoformat() if hasattr(value, "isoformat") else value for value in row]
+            )
+    else:
+        raise ExportError(f"Unknown format {fmt!r}; expected one of {', '.join(FORMATS)}")
+
+
+def _blocks(lines):
+    buffer, size = [], 0
+    for line in lines:
+        data = line.encode("utf-8")
+        buffer.append(data)
+        size += len(data)
+        if size >= BLOCK_SIZE:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def _gzip(blocks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31: gzip container
+    for block in blocks:
+        data = compressor.compress(block)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream_export(queryset, kind, fmt, gzip=False):
+    """Yields the encoded export as byte blocks."""
+    if fmt not in FORMATS:
+        raise ExportError(f"Unknown format {fmt!r}; expected one of {', '.join(FORMATS)}")
+    blocks = _blocks(_encode(kind, fmt, queryset.iterator(chunk_size=CHUNK_SIZE)))
+    return _gzip(blocks) if gzip else blocks
+
+
+def filename_for(kind, fmt, gzip=False):
+    return f"{kind}.{fmt}" + (".gz" if gzip else "")
+
+
+class _ExportRenderer(renderers.BaseRenderer):
+    # Export bodies are streamed by the view; this only renders error payloads
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data).encode("utf-8")
+
+
+class NDJSONRenderer(_ExportRenderer):
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+
+class CSVRenderer(_ExportRenderer):
+    media_type = "text/csv"
+    format = "csv"
@@ -0,0 +1,116 @@
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeGradioServer:
+    """
+    Local stand-in for the Hugging Face Space, speaking the same REST API as
+    AsyncGradioClient (POST .../call/<api>, then an SSE GET for the result).
+    Used by tests and load tests so nothing leaves the machine.
+
+        with FakeGradioServer(latency=0.5) as fake:
+            client = AsyncGradioClient(fake.url)
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, api_prefix="/gradio_api", responder=None):
+        self.latency = latency
+        self.api_prefix = api_prefix
+        self.responder = responder or (lambda message: f"Suggested resolution for: {message}")
+        self.fail_next = 0  # number of upcoming results to answer with an error event
+        self.malformed_next = 0  # number of upcoming results to answer with a payload that is not a list
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-gradio", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _handler_class(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, status, payload):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                if not self.path.startswith(f"{fake.api_prefix}/call/"):
+                    return self._send_json(404, {"detail": "Not Found"})
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                event_id = uuid.uuid4().hex
+                with fake._lock:
+                    fake.calls += 1
+                    fake._pending[event_id] = payload.get("data", [""])[0]
+                self._send_json(200, {"event_id": event_id})
+
+            def do_GET(self):
+                event_id = self.path.rsplit("/", 1)[-1]
+                with fake._lock:
+                    message = fake._pending.pop(event_id, None)
+                    fail = fake.fail_next > 0
+                    if fail:
+                        fake.fail_next -= 1
+                    malformed = not fail and fake.malformed_next > 0
+                    if malformed:
+                        fake.malformed_next -= 1
+                    fake.active += 1
+                    fake.max_active = max(fake.max_active, fake.active)
+                if message is None:
+                    with fake._lock:
+                        fake.active -= 1
+                    return self._send_json(404, {"detail": "Unknown event"})
+                try:
+                    time.sleep(fake.latency)
+                    if fail:
+                        event, data = "error", json.dumps("Upstream failure")
+                    elif malformed:
+                        event, data = "complete", json.dumps({"unexpected": True})
+                    else:
+                        event, data = "complete", json.dumps([fake.responder(message)])
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/event-stream")
+                    self.end_headers()
+                    self.wfile.write(f"event: {event}\ndata: {data}\n\n".encode())
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                finally:
+                    with fake._lock:
+                        fake.active -= 1
+
+        return Handler
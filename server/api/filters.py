@@ -0,0 +1,83 @@
+from datetime import datetime, time
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import Complaint
+
+
+class FilterError(ValueError):
+    pass
+
+
+def _choices(param, value, allowed):
+    values = [v.strip() for v in value.split(',') if v.strip()]
+    invalid = [v for v in values if v not in allowed]
+    if invalid:
+        raise FilterError(f"Invalid {param}: {', '.join(invalid)}. Allowed: {', '.join(allowed)}")
+    return values
+
+
+def _one_or_in(field, values):
+    # A single value stays an equality so the planner can walk the index in listing order
+    return {field: values[0]} if len(values) == 1 else {f"{field}__in": values}
+
+
+def _int(param, value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise FilterError(f"{param} must be an integer")
+
+
+def _datetime(param, value, end_of_day=False):
+    try:
+        # A bare date covers the whole day on the "before" side
+        day = parse_date(value)
+        parsed = datetime.combine(day, time.max if end_of_day else time.min) if day else parse_datetime(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise FilterError(f"{param} must be an ISO date or datetime")
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def filter_complaints(queryset, params):
+    """
+    Applies the listing filters from query params. Each shape is backed by a
+    composite index on Complaint (see Meta.indexes) that also matches the
+    (created_at, id) listing order:
+
+      user_id                       -> (user, created_at, id)
+      status                        -> (status, created_at, id)
+      status + priority             -> (status, priority, created_at, id)
+      priority                      -> (priority, created_at, id)
+      category                      -> (category, created_at, id)
+      min_score / max_score         -> (ai_severity_score)
+      created_after/created_before  -> (created_at, id)
+
+    status/priority accept comma-separated values. Raises FilterError.
+    """
+    if params.get('user_id'):
+        queryset = queryset.filter(user_id=_int('user_id', params['user_id']))
+    if params.get('status'):
+        statuses = _choices('status', params['status'], [c for c, _ in Complaint.STATUS_CHOICES])
+        queryset = queryset.filter(**_one_or_in('status', statuses))
+    if params.get('priority'):
+        priorities = _choices('priority', params['priority'], [c for c, _ in Complaint.PRIORITY_CHOICES])
+        queryset = queryset.filter(**_one_or_in('priority', priorities))
+    if params.get('category'):
+        queryset = queryset.filter(category=params['category'])
+    if params.get('min_score'):
+        queryset = queryset.filter(ai_severity_score__gte=_int('min_score', params['min_score']))
+    if params.get('max_score'):
+        queryset = queryset.filter(ai_severity_score__lte=_int('max_score', params['max_score']))
+    if params.get('created_after'):
+        queryset = queryset.filter(created_at__gte=_datetime('created_after', params['created_after']))
+    if params.get('created_before'):
+        queryset = queryset.filter(
+            created_at__lte=_datetime('created_before', params['created_before'], end_of_day=True)
+        )
+    return queryset
@@ -0,0 +1,191 @@
+import hashlib
+import re
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Complaint, IncidentCluster
+
+# ==========================================
+# INCIDENT CLUSTERING (MinHash + LSH)
+# Near-identical complaints (e.g. an outage flood) are grouped into one
+# open IncidentCluster at create time so they share the cluster's severity
+# and resolution suggestion instead of each running the AI stack.
+# ==========================================
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS  # 4 rows/band -> candidate threshold ~ (1/16) ** (1/4) = 0.5
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Fixed (a, b) pairs so signatures are comparable across workers and restarts
+_PERMUTATIONS = [
+    (
+        int.from_bytes(hashlib.blake2b(f"a{i}".encode(), digest_size=8).digest(), "big") % (_PRIME - 1) + 1,
+        int.from_bytes(hashlib.blake2b(f"b{i}".encode(), digest_size=8).digest(), "big") % _PRIME,
+    )
+    for i in range(NUM_PERM)
+]
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+
+def shingles(text: str):
+    """Word unigrams + bigrams; short complaints have too few word n-grams for larger k."""
+    words = _TOKEN_RE.findall(text.lower())
+    return set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+def minhash(text: str):
+    tokens = shingles(text)
+    if not tokens:
+        return None
+    hashes = [int.from_bytes(hashlib.blake2b(t.encode(), digest_size=4).digest(), "big") for t in tokens]
+    return [min(((a * h + b) % _PRIME) & _MAX_HASH for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def similarity(sig_a, sig_b) -> float:
+    """Estimated Jaccard similarity of the underlying shingle sets."""
+    return sum(x == y for x, y in zip(sig_a, sig_b)) / NUM_PERM
+
+
+def _band_keys(signature):
+    return [(band, tuple(signature[band * ROWS:(band + 1) * ROWS])) for band in range(BANDS)]
+
+
+class IncidentIndex:
+    """
+    In-process LSH index over the signatures of open clusters. Each worker
+    keeps its own copy and pulls clusters opened/updated by other workers
+    from the database at most every INCIDENT_REFRESH_SECONDS.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._buckets = {}
+        self._signatures = {}
+        self._last_seen = {}
+        self._watermark = None
+        self._refreshed_at = 0.0
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def _add(self, cluster_id, signature, last_seen):
+        if cluster_id not in self._signatures:
+            for key in _band_keys(signature):
+                self._buckets.setdefault(key, set()).add(cluster_id)
+        self._signatures[cluster_id] = signature
+        self._last_seen[cluster_id] = last_seen
+
+    def _remove(self, cluster_id):
+        signature = self._signatures.pop(cluster_id, None)
+        self._last_seen.pop(cluster_id, None)
+        if signature is not None:
+            for key in _band_keys(signature):
+                bucket = self._buckets.get(key)
+                if bucket:
+                    bucket.discard(cluster_id)
+                    if not bucket:
+                        del self._buckets[key]
+
+    def add(self, cluster):
+        with self._lock:
+            self._add(cluster.id, cluster.signature, cluster.last_seen_at)
+
+    def refresh(self, force=False):
+        if not force and time.monotonic() - self._refreshed_at < settings.INCIDENT_REFRESH_SECONDS:
+            return
+        now = timezone.now()
+        cutoff = now - timedelta(hours=settings.INCIDENT_WINDOW_HOURS)
+        IncidentCluster.objects.filter(status='open', last_seen_at__lt=cutoff).update(status='closed')
+
+        queryset = IncidentCluster.objects.filter(status='open', last_seen_at__gte=cutoff)
+        if self._watermark is not None:
+            queryset = queryset.filter(last_seen_at__gte=self._watermark)
+        rows = list(queryset.values_list('id', 'signature', 'last_seen_at'))
+
+        with self._lock:
+            for cluster_id, signature, last_seen in rows:
+                self._add(cluster_id, signature, last_seen)
+            for cluster_id, last_seen in list(self._last_seen.items()):
+                if last_seen < cutoff:
+                    self._remove(cluster_id)
+            self._watermark = now - timedelta(seconds=settings.INCIDENT_REFRESH_SECONDS)
+            self._refreshed_at = time.monotonic()
+
+    def best_match(self, signature):
+        """Returns (cluster_id, similarity) of the most similar open cluster, or (None, 0)."""
+        with self._lock:
+            candidates = set()
+            for key in _band_keys(signature):
+                candidates |= self._buckets.get(key, set())
+            best_id, best_sim = None, 0.0
+            for cluster_id in candidates:
+                sim = similarity(signature, self._signatures[cluster_id])
+                if sim > best_sim:
+                    best_id, best_sim = cluster_id, sim
+        return best_id, best_sim
+
+
+incident_index = IncidentIndex()
+
+
+def find_incident(description):
+    """
+    Returns (cluster, signature). cluster is the open IncidentCluster this
+    description belongs to, or None if it should start a new one.
+    """
+    signature = minhash(description)
+    if signature is None:
+        return None, None
+
+    incident_index.refresh()
+    cluster_id, sim = incident_index.best_match(signature)
+    if cluster_id is None or sim < settings.INCIDENT_SIMILARITY:
+        return None, signature
+
+    cluster = IncidentCluster.objects.filter(pk=cluster_id, status='open').first()
+    return cluster, signature
+
+
+def join_incident(cluster):
+    now = timezone.now()
+    IncidentCluster.objects.filter(pk=cluster.pk).update(member_count=F('member_count') + 1, last_seen_at=now)
+    cluster.last_seen_at = now
+    incident_index.add(cluster)
+
+
+def open_incident(complaint, signature):
+    if signature is None:
+        return None
+    cluster = IncidentCluster.objects.create(
+        title=complaint.title,
+        representative_text=complaint.description,
+        signature=signature,
+        ai_severity_score=complaint.ai_severity_score,
+        priority=complaint.priority,
+        ai_predicted_resolution_time=complaint.ai_predicted_resolution_time,
+    )
+    Complaint.objects.filter(pk=complaint.pk).update(incident=cluster)
+    complaint.incident = cluster
+    incident_index.add(cluster)
+    return cluster
+
+
+def share_suggestion(complaint, suggestion):
+    """Stores the first suggestion generated for any member on its cluster."""
+    if complaint.incident_id and suggestion:
+        IncidentCluster.objects.filter(pk=complaint.incident_id, suggestion__isnull=True).update(suggestion=suggestion)
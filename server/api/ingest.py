@@ -0,0 +1,222 @@
+import csv
+import json
+from itertools import islice
+
+from django.db import DatabaseError, transaction
+
+from . import changes, rollups
+from .ai_engine import get_severity_ai
+from .models import Complaint, ResolutionEntry, User
+
+# ==========================================
+# BULK INGEST (helpdesk migrations)
+# Input is consumed as a stream of records and processed chunk by chunk:
+# one predict_batch() call and one bulk_create() per chunk, each chunk in
+# its own transaction. Memory stays bounded by the chunk size.
+# Imported tickets skip incident clustering and suggestion precompute;
+# suggestions are still generated on demand.
+# ==========================================
+
+DEFAULT_CHUNK_SIZE = 500
+MAX_REPORTED_ERRORS = 100  # further failures are counted, not listed
+
+FORMATS = ("jsonl", "csv")
+CONTENT_TYPES = {
+    "application/x-ndjson": "jsonl",
+    "application/jsonl": "jsonl",
+    "application/x-jsonlines": "jsonl",
+    "text/csv": "csv",
+}
+
+_STATUSES = {value for value, _ in Complaint.STATUS_CHOICES}
+_MAX_LENGTH = {name: Complaint._meta.get_field(name).max_length for name in ("title", "category")}
+
+
+class IngestError(Exception):
+    """The input as a whole cannot be read (unknown format, bad header...)."""
+
+
+def format_for(name):
+    """Guesses the input format from a file name or content type."""
+    name = (name or "").split(";")[0].strip().lower()
+    if name in CONTENT_TYPES:
+        return CONTENT_TYPES[name]
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if name.endswith(".csv"):
+        return "csv"
+    return None
+
+
+def iter_lines(stream, block_size=64 * 1024, encoding="utf-8"):
+    """Yields decoded lines (with their newline) from a binary stream."""
+    pending = b""
+    while True:
+        block = stream.read(block_size)
+        if not block:
+            break
+        pending += block
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield (line + b"\n").decode(encoding)
+    if pending:
+        yield pending.decode(encoding)
+
+
+def iter_records(lines, fmt):
+    """
+    Yields (row_number, record) from text lines. A record is a dict, or an
+    Exception for rows that could not be parsed.
+    """
+    if fmt == "jsonl":
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield number, e
+                continue
+            yield number, _as_record(record)
+    elif fmt == "csv":
+        reader = csv.DictReader(lines)
+        if reader.fieldnames is None:
+            return
+        if not {"title", "description"} <= set(reader.fieldnames):
+            raise IngestError("CSV header must include 'title' and 'description'")
+        for record in reader:
+            # line_num counts physical lines, including the header
+            yield reader.line_num, record
+    else:
+        raise IngestError(f"Unsupported format {fmt!r}; expected one of {', '.join(FORMATS)}")
+
+
+def _as_record(item):
+    return item if isinstance(item, dict) else ValueError("Expected a JSON object")
+
+
+def iter_items(items):
+    """Yields (row_number, record) from already parsed JSON items (a JSON array body)."""
+    for number, item in enumerate(items, start=1):
+        yield number, _as_record(item)
+
+
+def _clean(record):
+    """Returns (fields, errors) for one input record."""
+    errors = {}
+    fields = {}
+    for name in ("title", "description"):
+        value = record.get(name)
+        if not isinstance(value, str) or not value.strip():
+            errors[name] = "This field is required."
+        else:
+            fields[name] = value.strip()
+    category = record.get("category") or "General"
+    fields["category"] = str(category).strip()
+    for name, limit in _MAX_LENGTH.items():
+        if name in fields and len(fields[name]) > limit:
+            errors[name] = f"Ensure this field has no more than {limit} characters."
+
+    status = record.get("status") or "Pending"
+    if not isinstance(status, str):
+        errors["status"] = "Must be a string."
+    elif status not in _STATUSES:
+        errors["status"] = f"'{status}' is not a valid choice."
+    fields["status"] = status
+
+    if record.get("resolution"):
+        fields["resolution"] = str(record["resolution"])
+
+    user_id = record.get("user_id") or record.get("user")
+    if user_id not in (None, ""):
+        try:
+            fields["user_id"] = int(user_id)
+        except (TypeError, ValueError):
+            errors["user_id"] = "Must be an integer."
+    return fields, errors
+
+
+class IngestReport:
+    def __init__(self):
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def fail(self, row, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "errors": errors})
+
+    def as_dict(self):
+        return {
+            "created": self.created,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+def _ingest_chunk(chunk, report):
+    valid = []
+    for number, record in chunk:
+        if isinstance(record, Exception):
+            report.fail(number, {"row": str(record)})
+            continue
+        fields, errors = _clean(record)
+        if errors:
+            report.fail(number, errors)
+        else:
+            valid.append((number, fields))
+
+    # One query for every referenced user in the chunk
+    user_ids = {fields["user_id"] for _, fields in valid if "user_id" in fields}
+    known = set(User.objects.filter(pk__in=user_ids).values_list("pk", flat=True)) if user_ids else set()
+    rows = []
+    for number, fields in valid:
+        if "user_id" in fields and fields["user_id"] not in known:
+            report.fail(number, {"user_id": f"Invalid pk \"{fields['user_id']}\" - object does not exist."})
+        else:
+            rows.append((number, fields))
+    if not rows:
+        return []
+
+    predictions = get_severity_ai().predict_batch(fields["description"] for _, fields in rows)
+    resolutions = [fields.pop("resolution", None) for _, fields in rows]
+    complaints = [
+        Complaint(**fields, ai_severity_score=score, priority=priority, ai_predicted_resolution_time=eta)
+        for (_, fields), (score, priority, eta) in zip(rows, predictions)
+    ]
+    try:
+        with transaction.atomic():
+            created = Complaint.objects.bulk_create(complaints)
+            ResolutionEntry.objects.bulk_create(
+                ResolutionEntry(complaint=complaint, text=text)
+                for complaint, text in zip(created, resolutions)
+                if text
+            )
+            rollups.complaints_created(created)
+            changes.record(created, action="created")
+    except DatabaseError as e:
+        for number, _ in rows:
+            report.fail(number, {"database": str(e)})
+        return []
+    report.created += len(created)
+    return created
+
+
+def ingest(records, chunk_size=DEFAULT_CHUNK_SIZE, on_chunk=None):
+    """
+    Classifies and stores (row_number, record) pairs chunk by chunk.
+    Invalid rows are reported and skipped; valid rows in the same chunk are
+    still imported. `on_chunk(report)` is called after every chunk.
+    """
+    report = IngestReport()
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            break
+        _ingest_chunk(chunk, report)
+        if on_chunk:
+            on_chunk(report)
+    return report
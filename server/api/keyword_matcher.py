@@ -0,0 +1,96 @@
+from collections import deque, namedtuple
+
+# A single keyword hit: text[start:end] == term (after normalization)
+Match = namedtuple("Match", ["start", "end", "term", "value"])
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class AhoCorasickMatcher:
+    """
+    Multi-pattern matcher compiled into an Aho-Corasick automaton.
+
+    All patterns are found in a single pass over the text, so matching cost
+    is O(len(text) + matches) regardless of how many patterns are loaded.
+    Patterns map to a value (e.g. a severity label); when the same pattern
+    is added twice, the larger value wins.
+    """
+
+    def __init__(self, patterns=None):
+        # patterns: mapping of term -> value, or iterable of (term, value)
+        self._values = {}
+        if patterns:
+            items = patterns.items() if hasattr(patterns, "items") else patterns
+            for term, value in items:
+                term = normalize(term)
+                if term:
+                    self._values[term] = max(value, self._values.get(term, value))
+        self._build()
+
+    def __len__(self):
+        return len(self._values)
+
+    def _build(self):
+        goto = [{}]
+        outputs = [()]
+        for term in self._values:
+            node = 0
+            for ch in term:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    outputs.append(())
+                node = nxt
+            outputs[node] = (term,)
+
+        # BFS to compute failure links; each node's outputs also include the
+        # outputs of its failure node so no chain walking happens at match time.
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                queue.append(child)
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[child] = goto[f].get(ch, 0)
+                outputs[child] = outputs[child] + outputs[fail[child]]
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs = outputs
+
+    def iter_matches(self, text: str, word_boundary: bool = False):
+        """
+        Yields Match tuples for every (possibly overlapping) occurrence in
+        the normalized text. With word_boundary=True, hits that start or end
+        inside a word ("error" in "terrors") are skipped.
+        """
+        text = normalize(text)
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for term in outputs[node]:
+                end = i + 1
+                start = end - len(term)
+                if word_boundary and (
+                    (start > 0 and _is_word_char(text[start - 1]) and _is_word_char(term[0]))
+                    or (end < len(text) and _is_word_char(text[end]) and _is_word_char(term[-1]))
+                ):
+                    continue
+                yield Match(start, end, term, self._values[term])
+
+    def find_all(self, text: str, word_boundary: bool = False):
+        return list(self.iter_matches(text, word_boundary))
@@ -0,0 +1,233 @@
+import asyncio
+import contextlib
+import random
+import time
+import uuid
+from collections import Counter, defaultdict
+
+from benchmarks.stats import summarize
+from benchmarks.synthetic import ComplaintGenerator
+
+# ==========================================
+# API LOAD TEST (manage.py loadtest)
+# Many concurrent virtual clients, each a logged-in customer with its own
+# HTTP connection and cookies, pick scenarios from a weighted mix until the
+# time is up. Latencies are recorded per endpoint; anything that is not a
+# 2xx/304 response (or fails to arrive) counts as an error.
+# ==========================================
+
+PASSWORD = "loadtest-password"
+SETUP_CONCURRENCY = 16
+PATCH_STATUSES = ["Pending", "In Progress", "Resolved"]
+
+# scenario -> endpoint it exercises (the key results are reported under)
+SCENARIOS = {
+    "login": "POST /api/auth/login",
+    "list": "GET /api/complaints/",
+    "create": "POST /api/complaints/",
+    "patch": "PATCH /api/complaints/{id}/",
+    "suggest": "GET /api/complaints/{id}/suggest_resolution/",
+}
+DEFAULT_MIX = {"login": 1, "list": 6, "create": 2, "patch": 2, "suggest": 1}
+
+
+def parse_mix(text):
+    """'list=6,create=2' -> {"list": 6, "create": 2}; unknown scenarios raise ValueError."""
+    mix = {}
+    for part in filter(None, (p.strip() for p in text.split(","))):
+        name, _, weight = part.partition("=")
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario {name!r} (choose from {', '.join(SCENARIOS)})")
+        try:
+            mix[name] = float(weight or 1)
+        except ValueError:
+            raise ValueError(f"Weight for {name!r} must be a number")
+        if mix[name] < 0:
+            raise ValueError(f"Weight for {name!r} must not be negative")
+    if not any(mix.values()):
+        raise ValueError("The scenario mix needs at least one positive weight")
+    return mix
+
+
+class Account:
+    def __init__(self, email):
+        self.email = email
+        self.user_id = None
+        self.access = None
+        self.complaint_ids = []
+
+
+class LoadTest:
+    def __init__(self, base_url, clients=50, duration=30.0, mix=None, ramp_up=0.0, timeout=60.0, seed=0, log=print):
+        self.base_url = base_url.rstrip("/")
+        self.clients = clients
+        self.duration = duration
+        self.mix = mix or DEFAULT_MIX
+        self.ramp_up = ramp_up
+        self.timeout = timeout
+        self.seed = seed
+        self.log = log
+        self.generator = ComplaintGenerator(seed=seed)
+        self.latencies = defaultdict(list)
+        self.errors = Counter()
+        self.statuses = defaultdict(Counter)
+
+    def _client(self):
+        import httpx
+
+        # One connection per virtual client, like one browser tab
+        return httpx.AsyncClient(
+            base_url=self.base_url, timeout=self.timeout, limits=httpx.Limits(max_connections=1)
+        )
+
+    async def _call(self, http, scenario, method, path, **kwargs):
+        """Times one request and records it under the scenario's endpoint; returns the response or None."""
+        import httpx
+
+        endpoint = SCENARIOS[scenario]
+        t0 = time.perf_counter()
+        try:
+            response = await http.request(method, path, **kwargs)
+        except httpx.HTTPError as e:
+            self.errors[endpoint] += 1
+            self.statuses[endpoint][type(e).__name__] += 1
+            return None
+        elapsed = time.perf_counter() - t0
+        self.statuses[endpoint][str(response.status_code)] += 1
+        if response.is_success or response.status_code == 304:
+            self.latencies[endpoint].append(elapsed)
+            return response
+        self.errors[endpoint] += 1
+        return None
+
+    # ---- setup (not measured) ----
+
+    async def _prepare(self, http, account):
+        response = await http.post("/api/auth/register", json={
+            "email": account.email, "password": PASSWORD, "full_name": "Load Test",
+        })
+        response.raise_for_status()
+        response = await http.post("/api/auth/login", json={"email": account.email, "password": PASSWORD})
+        response.raise_for_status()
+        body = response.json()
+        account.user_id, account.access = body["id"], body["access"]
+        response = await http.post("/api/complaints/", json=self.generator.complaint(), headers=self._auth(account))
+        response.raise_for_status()
+        account.complaint_ids.append(response.json()["id"])
+
+    @staticmethod
+    def _auth(account):
+        return {"Authorization": f"Bearer {account.access}"}
+
+    # ---- scenarios ----
+
+    async def scenario_login(self, http, account, rng):
+        response = await self._call(http, "login", "POST", "/api/auth/login",
+                                    json={"email": account.email, "password": PASSWORD})
+        if response is not None:
+            account.access = response.json()["access"]
+
+    async def scenario_list(self, http, account, rng):
+        await self._call(http, "list", "GET", "/api/complaints/",
+                         params={"user_id": account.user_id, "page_size": 20}, headers=self._auth(account))
+
+    async def scenario_create(self, http, account, rng):
+        response = await self._call(http, "create", "POST", "/api/complaints/",
+                                    json=self.generator.complaint(), headers=self._auth(account))
+        if response is not None:
+            account.complaint_ids.append(response.json()["id"])
+
+    async def scenario_patch(self, http, account, rng):
+        if rng.random() < 0.5:
+            body = {"status": rng.choice(PATCH_STATUSES)}
+        else:
+            body = {"resolution": f"Follow-up {rng.randint(1, 10**6)}: {self.generator.description()}"}
+        await self._call(http, "patch", "PATCH", f"/api/complaints/{rng.choice(account.complaint_ids)}/",
+                         json=body, headers=self._auth(account))
+
+    async def scenario_suggest(self, http, account, rng):
+        await self._call(http, "suggest", "GET",
+                         f"/api/complaints/{rng.choice(account.complaint_ids)}/suggest_resolution/",
+                         headers=self._auth(account))
+
+    # ---- driver ----
+
+    async def _virtual_client(self, n, http, account, deadline):
+        rng = random.Random(f"{self.seed}-{n}")
+        names = [name for name, weight in self.mix.items() if weight > 0]
+        weights = [self.mix[name] for name in names]
+        if self.ramp_up:
+            await asyncio.sleep(self.ramp_up * n / self.clients)
+        while time.monotonic() < deadline:
+            scenario = rng.choices(names, weights)[0]
+            await getattr(self, f"scenario_{scenario}")(http, account, rng)
+
+    async def run(self):
+        run_id = uuid.uuid4().hex[:8]
+        async with contextlib.AsyncExitStack() as stack:
+            pairs = [
+                (await stack.enter_async_context(self._client()), Account(f"loadtest-{run_id}-{n}@example.com"))
+                for n in range(self.clients)
+            ]
+            # Setup (register, log in, one complaint each) is not measured;
+            # bounded so password hashing does not swamp the server
+            setup = asyncio.Semaphore(SETUP_CONCURRENCY)
+
+            async def prepare(http, account):
+                async with setup:
+                    await self._prepare(http, account)
+
+            self.log(f"Preparing {self.clients} accounts...")
+            outcomes = await asyncio.gather(*(prepare(*pair) for pair in pairs), return_exceptions=True)
+            failed = [o for o in outcomes if isinstance(o, Exception)]
+            for error in failed[:3]:
+                self.log(f"⚠️ Client setup failed: {error!r}")
+            ready = [pair for pair, outcome in zip(pairs, outcomes) if not isinstance(outcome, Exception)]
+            if not ready:
+                raise RuntimeError("No client could be set up; is the server running?")
+
+            self.log(f"Running {len(ready)} clients for {self.duration:.0f}s against {self.base_url}")
+            start = time.perf_counter()
+            deadline = time.monotonic() + self.ramp_up + self.duration
+            await asyncio.gather(*(
+                self._virtual_client(n, http, account, deadline) for n, (http, account) in enumerate(ready)
+            ))
+            return self.report(time.perf_counter() - start, clients_failed=len(failed))
+
+    def report(self, elapsed, clients_failed=0):
+        endpoints = {}
+        for scenario, endpoint in SCENARIOS.items():
+            ok, errors = self.latencies.get(endpoint, []), self.errors.get(endpoint, 0)
+            total = len(ok) + errors
+            if not total:
+                continue
+            row = summarize(ok, elapsed=elapsed)
+            row.update(
+                scenario=scenario,
+                requests=total,
+                errors=errors,
+                error_rate=round(errors / total, 4),
+                statuses=dict(self.statuses[endpoint]),
+            )
+            endpoints[endpoint] = row
+        requests = sum(row["requests"] for row in endpoints.values())
+        errors = sum(row["errors"] for row in endpoints.values())
+        return {
+            "config": {
+                "base_url": self.base_url,
+                "clients": self.clients,
+                "duration_s": self.duration,
+                "ramp_up_s": self.ramp_up,
+                "mix": self.mix,
+                "seed": self.seed,
+            },
+            "elapsed_s": round(elapsed, 3),
+            "clients_failed": clients_failed,
+            "total": {
+                "requests": requests,
+                "errors": errors,
+                "error_rate": round(errors / requests, 4) if requests else None,
+                "throughput_per_s": round(requests / elapsed, 2) if elapsed else None,
+            },
+            "endpoints": endpoints,
+        }
@@ -0,0 +1,69 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from api.filters import filter_complaints
+from api.models import Complaint
+from api.pagination import complaints_for_listing, keyset_page
+
+# One entry per filter shape the listing endpoint supports
+FILTER_SHAPES = {
+    "no filter": {},
+    "user_id": {"user_id": "1"},
+    "status": {"status": "Pending"},
+    "status + priority": {"status": "Pending", "priority": "High"},
+    "priority": {"priority": "High"},
+    "category": {"category": "Billing"},
+    "severity score range": {"min_score": "8", "max_score": "10"},
+    "created_at range": {"created_after": "2025-01-01", "created_before": "2025-01-31"},
+}
+
+# Full scans of the complaints table in each backend's plan output
+FULL_SCAN = {
+    "postgresql": re.compile(r"Seq Scan on api_complaint\b"),
+    "sqlite": re.compile(r"\bSCAN api_complaint\b(?! USING)"),
+}
+
+
+class Command(BaseCommand):
+    help = "Prints the query plan for each complaint listing filter shape and flags full table scans."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--page-size", type=int, default=50)
+        parser.add_argument("--analyze", action="store_true", help="EXPLAIN ANALYZE (PostgreSQL only; runs the query).")
+        parser.add_argument(
+            "--no-seqscan", action="store_true",
+            help="PostgreSQL: SET enable_seqscan = off, to check an index is usable even on a small table.",
+        )
+        parser.add_argument("--strict", action="store_true", help="Exit with an error if any shape does a full scan.")
+
+    def handle(self, *args, **options):
+        vendor = connection.vendor
+        explain_options = {"analyze": True} if options["analyze"] and vendor == "postgresql" else {}
+        if options["no_seqscan"] and vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET enable_seqscan = off")
+
+        self.stdout.write(f"Backend: {vendor}, rows in api_complaint: {Complaint.objects.count()}")
+        full_scans = []
+        for name, params in FILTER_SHAPES.items():
+            queryset = filter_complaints(complaints_for_listing(), params).order_by("-created_at", "-id")
+            queryset = queryset[:options["page_size"] + 1]
+            plan = queryset.explain(**explain_options)
+            scan = FULL_SCAN.get(vendor)
+            is_full_scan = bool(scan and scan.search(plan))
+            if is_full_scan:
+                full_scans.append(name)
+
+            status = self.style.ERROR("FULL SCAN") if is_full_scan else self.style.SUCCESS("index")
+            self.stdout.write(f"\n=== {name} {params} -> {status}")
+            self.stdout.write(plan)
+
+        if full_scans:
+            message = f"Full table scans for: {', '.join(full_scans)}"
+            if vendor == "postgresql" and not options["no_seqscan"]:
+                message += " (on small tables the planner prefers seq scans; retry with --no-seqscan or more data)"
+            if options["strict"]:
+                raise CommandError(message)
+            self.stdout.write(self.style.WARNING(f"\n{message}"))
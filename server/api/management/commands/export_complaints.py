@@ -0,0 +1,48 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.export import FORMATS, KINDS, ExportError, export_queryset, stream_export
+from api.filters import FilterError
+
+
+class Command(BaseCommand):
+    help = "Streams complaints or their history to NDJSON/CSV with constant memory."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--kind", choices=KINDS, default="complaints")
+        parser.add_argument("--format", choices=FORMATS, default="ndjson")
+        parser.add_argument("--output", "-o", default="-", help="Output file, or '-' for stdout.")
+        parser.add_argument("--gzip", action="store_true")
+        parser.add_argument(
+            "--filter", action="append", default=[], metavar="KEY=VALUE",
+            help="Listing filter, e.g. status=Resolved or created_after=2025-01-01 (repeatable).",
+        )
+
+    def handle(self, *args, **options):
+        params = {}
+        for item in options["filter"]:
+            key, sep, value = item.partition("=")
+            if not sep:
+                raise CommandError(f"--filter expects KEY=VALUE, got {item!r}")
+            params[key] = value
+        try:
+            queryset = export_queryset(options["kind"], params)
+            blocks = stream_export(queryset, options["kind"], options["format"], gzip=options["gzip"])
+        except (FilterError, ExportError) as e:
+            raise CommandError(str(e))
+
+        output = options["output"]
+        handle = sys.stdout.buffer if output == "-" else open(output, "wb")
+        written = 0
+        try:
+            for block in blocks:
+                handle.write(block)
+                written += len(block)
+        finally:
+            if output == "-":
+                handle.flush()
+            else:
+                handle.close()
+        if output != "-":
+            self.stderr.write(f"Wrote {written} bytes to {output}")
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from api.fake_gradio import FakeGradioServer
+
+
+class Command(BaseCommand):
+    help = "Runs a local fake of the Gradio chatbot Space (point CHATBOT_URL at it)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=7861)
+        parser.add_argument("--latency", type=float, default=1.0, help="Seconds before each result is returned.")
+
+    def handle(self, *args, **options):
+        server = FakeGradioServer(host=options["host"], port=options["port"], latency=options["latency"])
+        self.stdout.write(f"Fake Gradio server listening on {server.url} (latency {options['latency']}s)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
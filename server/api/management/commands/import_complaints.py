@@ -0,0 +1,38 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.ingest import DEFAULT_CHUNK_SIZE, FORMATS, IngestError, format_for, ingest, iter_records
+
+
+class Command(BaseCommand):
+    help = "Streams complaints from a JSONL or CSV file into the database, classifying them in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Input file, or '-' for stdin.")
+        parser.add_argument("--format", choices=FORMATS, help="Defaults to the file extension.")
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or format_for(path)
+        if fmt is None:
+            raise CommandError("Cannot tell the input format from the file name; pass --format.")
+
+        def progress(report):
+            self.stdout.write(f"  ... {report.created} imported, {report.failed} failed")
+
+        handle = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+        try:
+            report = ingest(iter_records(handle, fmt), chunk_size=options["chunk_size"], on_chunk=progress)
+        except (IngestError, UnicodeDecodeError) as e:
+            raise CommandError(str(e))
+        finally:
+            if handle is not sys.stdin:
+                handle.close()
+
+        for error in report.errors:
+            self.stderr.write(f"row {error['row']}: {error['errors']}")
+        if report.failed > len(report.errors):
+            self.stderr.write(f"... and {report.failed - len(report.errors)} more failed rows")
+        self.stdout.write(self.style.SUCCESS(f"Imported {report.created} complaints ({report.failed} failed)"))
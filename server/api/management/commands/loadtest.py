@@ -0,0 +1,172 @@
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.fake_gradio import FakeGradioServer
+from api.loadtest import DEFAULT_MIX, LoadTest, parse_mix
+
+
+class Command(BaseCommand):
+    help = (
+        "Load tests the API with concurrent async clients running a weighted mix of "
+        "login, list, create, patch and suggest scenarios; writes per-endpoint "
+        "p50/p95/p99 latency, throughput and error rate as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://127.0.0.1:8000", help="Server to load (ignored with --serve).")
+        parser.add_argument(
+            "--serve", action="store_true",
+            help="Start a local server (uvicorn if installed, else runserver) on a throwaway SQLite database, "
+                 "with the chatbot pointed at an in-process fake. Use --url to load a real deployment.",
+        )
+        parser.add_argument("--clients", type=int, default=50, help="Concurrent virtual clients.")
+        parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load after setup.")
+        parser.add_argument("--ramp-up", type=float, default=0.0, help="Seconds over which clients start.")
+        parser.add_argument(
+            "--mix", type=parse_mix, default=dict(DEFAULT_MIX),
+            help="Scenario weights, e.g. 'list=6,create=2,patch=2,suggest=1,login=1'.",
+        )
+        parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout (s).")
+        parser.add_argument("--upstream-latency", type=float, default=0.5, help="Fake chatbot response time (s).")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", type=Path, default=Path("loadtest.json"), help="JSON report path.")
+
+    def handle(self, *args, **options):
+        if options["clients"] < 1 or options["duration"] <= 0:
+            raise CommandError("--clients and --duration must be positive")
+        try:
+            import httpx  # noqa: F401
+        except ImportError:
+            raise CommandError("The load test needs httpx (pip install httpx)")
+
+        if options["serve"]:
+            with FakeGradioServer(latency=options["upstream_latency"]) as fake, LocalServer(fake.url) as url:
+                report = self.run_test(url, options)
+        else:
+            report = self.run_test(options["url"], options)
+
+        options["output"].write_text(json.dumps(report, indent=2))
+        self.print_report(report)
+        self.stdout.write(f"Report written to {options['output']}")
+
+    def run_test(self, url, options):
+        test = LoadTest(
+            url,
+            clients=options["clients"],
+            duration=options["duration"],
+            mix=options["mix"],
+            ramp_up=options["ramp_up"],
+            timeout=options["timeout"],
+            seed=options["seed"],
+            log=self.stdout.write,
+        )
+        try:
+            return asyncio.run(test.run())
+        except RuntimeError as e:
+            raise CommandError(str(e))
+
+    def print_report(self, report):
+        self.stdout.write(
+            f"\n{'endpoint':<46} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>8} {'errors':>7} {'err %':>6}"
+        )
+        self.stdout.write("-" * 100)
+        for endpoint, row in report["endpoints"].items():
+            cells = [row.get(k) for k in ("p50_ms", "p95_ms", "p99_ms")]
+            cells = [f"{c:>9.1f}" if c is not None else f"{'-':>9}" for c in cells]
+            self.stdout.write(
+                f"{endpoint:<46} {' '.join(cells)} {row['throughput_per_s']:>8.1f} "
+                f"{row['errors']:>7} {row['error_rate'] * 100:>6.2f}"
+            )
+        total = report["total"]
+        self.stdout.write(
+            f"\n{total['requests']} requests in {report['elapsed_s']:.1f}s "
+            f"({total['throughput_per_s']} req/s), error rate {total['error_rate']}"
+        )
+
+
+class LocalServer:
+    """
+    The project served on a free local port for the duration of a `with`
+    block, on a freshly migrated SQLite database that is deleted afterwards,
+    so the run's accounts and complaints never reach the real one.
+    """
+
+    def __init__(self, chatbot_url, timeout=60):
+        self.chatbot_url = chatbot_url
+        self.timeout = timeout
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+        self.process = None
+        self.tmpdir = None
+
+    def environment(self):
+        env = dict(
+            os.environ, CHATBOT_URL=self.chatbot_url, AI_WARMUP="0", PYTHONUNBUFFERED="1",
+            DB_ENGINE="sqlite", SQLITE_NAME=os.path.join(self.tmpdir.name, "loadtest.sqlite3"),
+        )
+        for name in ("SQLITE_REPLICAS", "DB_REPLICA_HOSTS"):
+            env.pop(name, None)
+        return env
+
+    def command(self):
+        try:
+            import uvicorn  # noqa: F401
+        except ImportError:
+            return [sys.executable, "manage.py", "runserver", f"127.0.0.1:{self.port}", "--noreload"]
+        return [sys.executable, "-m", "uvicorn", "supportflow.asgi:application",
+                "--host", "127.0.0.1", "--port", str(self.port), "--no-access-log"]
+
+    def __enter__(self):
+        self.tmpdir = tempfile.TemporaryDirectory(prefix="loadtest-")
+        env = self.environment()
+        migrate = subprocess.run(
+            [sys.executable, "manage.py", "migrate", "--noinput"],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if migrate.returncode != 0:
+            self.tmpdir.cleanup()
+            raise CommandError(f"Could not create the load test database:\n{migrate.stderr}")
+        self.process = subprocess.Popen(
+            self.command(), cwd=settings.BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        url = f"http://127.0.0.1:{self.port}"
+        try:
+            self._wait_until_up(url)
+        except BaseException:
+            self.__exit__()
+            raise
+        return url
+
+    def _wait_until_up(self, url):
+        import httpx
+
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise CommandError(f"The local server exited with code {self.process.returncode}")
+            try:
+                httpx.get(f"{url}/api/complaints/?page_size=1", timeout=2)
+                return
+            except httpx.HTTPError:
+                time.sleep(0.2)
+        raise CommandError(f"The local server did not come up within {self.timeout}s")
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.tmpdir.cleanup()
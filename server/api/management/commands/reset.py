@@ -0,0 +1,27 @@
+from django.core.management.base import CommandError
+
+from api.seeding import reset
+
+from .seed import Command as SeedCommand
+
+
+class Command(SeedCommand):
+    help = (
+        "Empties users, complaints and every derived table (TRUNCATE on PostgreSQL), then seeds "
+        "fresh synthetic data; takes the same options as `seed`. Destroys all application data."
+    )
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument("--no-input", "--noinput", action="store_false", dest="interactive",
+                            help="Do not ask for confirmation.")
+        parser.add_argument("--empty", action="store_true", help="Only empty the tables; do not seed.")
+
+    def handle(self, *args, **options):
+        if options["interactive"]:
+            answer = input("This deletes every user and complaint in the database. Type 'yes' to continue: ")
+            if answer != "yes":
+                raise CommandError("Reset cancelled.")
+        reset(log=self.stdout.write)
+        if not options["empty"]:
+            super().handle(*args, **options)
@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api import online_model
+from api.retraining import retrain
+
+
+class Command(BaseCommand):
+    help = "Incrementally folds agent-labelled complaints into the online severity model (versioned, with rollback)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=256, help="partial_fit mini-batch size.")
+        parser.add_argument("--loop", action="store_true", help="Keep running, retraining every --interval seconds.")
+        parser.add_argument("--interval", type=float, default=300.0)
+        parser.add_argument("--list", action="store_true", help="List model versions and exit.")
+        parser.add_argument(
+            "--rollback", nargs="?", const="parent", metavar="VERSION",
+            help="Re-activate VERSION (default: the active version's parent) and exit.",
+        )
+
+    def handle(self, *args, **options):
+        if options["list"]:
+            active = online_model.active_version()
+            for meta in online_model.list_versions():
+                marker = "*" if meta["version"] == active else " "
+                self.stdout.write(
+                    f"{marker} v{meta['version']}  parent={meta['parent']}  +{meta['new_samples']} samples  "
+                    f"total={meta['samples_seen']}  through={meta['trained_through']}  created={meta['created_at']}"
+                )
+            return
+
+        if options["rollback"]:
+            try:
+                target = None if options["rollback"] == "parent" else int(options["rollback"])
+                version = online_model.rollback(target)
+            except ValueError as e:
+                raise CommandError(str(e))
+            self.stdout.write(self.style.SUCCESS(f"Active online model is now v{version}"))
+            return
+
+        while True:
+            version = retrain(batch_size=options["batch_size"], log=self.stdout.write)
+            if version is None:
+                self.stdout.write("No new labelled complaints.")
+            if not options["loop"]:
+                return
+            time.sleep(options["interval"])
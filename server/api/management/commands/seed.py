@@ -0,0 +1,50 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from api.seeding import DEFAULT_CHUNK_SIZE, SEED_PASSWORD, seed
+
+
+class Command(BaseCommand):
+    help = (
+        "Adds synthetic users, complaints, history and resolution entries for scaling tests "
+        "(COPY on PostgreSQL with psycopg 3, bulk_create otherwise; parallel with --workers)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--complaints", type=int, default=20000)
+        parser.add_argument("--days", type=int, default=365, help="Age of the oldest complaints.")
+        parser.add_argument(
+            "--workers", type=int, default=None,
+            help="Loader processes (default: CPU count on PostgreSQL, 1 on SQLite, which has one writer anyway).",
+        )
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per transaction.")
+        parser.add_argument("--method", choices=("auto", "copy", "bulk_create"), default="auto")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed; the same seed gives the same data.")
+
+    def handle(self, *args, **options):
+        for name in ("users", "complaints", "days", "chunk_size"):
+            if options[name] < (0 if name in ("users", "complaints") else 1):
+                raise CommandError(f"--{name.replace('_', '-')} is out of range")
+        workers = options["workers"]
+        if workers is None:
+            workers = (os.cpu_count() or 1) if connection.vendor == "postgresql" else 1
+
+        try:
+            counts = seed(
+                users=options["users"],
+                complaints=options["complaints"],
+                days=options["days"],
+                workers=workers,
+                chunk_size=options["chunk_size"],
+                method=options["method"],
+                seed=options["seed"],
+                log=self.stdout.write,
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        summary = ", ".join(f"{n:,} {name}" for name, n in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Seeded {summary}"))
+        self.stdout.write(f"Every seeded account uses the password {SEED_PASSWORD!r}")
@@ -0,0 +1,72 @@
+import json
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Each component is measured in a fresh interpreter so earlier imports do not
+# hide its cost. "setup" runs untimed; "timed" is what gets measured.
+DJANGO_SETUP = (
+    "import os, django; "
+    "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'supportflow.settings'); "
+    "django.setup()"
+)
+
+COMPONENTS = [
+    ("import numpy", "", "import numpy"),
+    ("import scikit-learn", "", "import sklearn.feature_extraction.text, sklearn.naive_bayes, sklearn.pipeline"),
+    ("import httpx", "", "import httpx"),
+    ("django.setup()", "", DJANGO_SETUP),
+    ("import api.views", DJANGO_SETUP, "import api.views"),
+    ("SeverityAI() (artifact or train)", DJANGO_SETUP, "from api.ai_engine import get_severity_ai; get_severity_ai()"),
+    ("first predict()", DJANGO_SETUP + "; from api.ai_engine import get_severity_ai; ai = get_severity_ai()",
+     "ai.predict('The app crashes every time I open settings')"),
+    ("SupportChatbot()", DJANGO_SETUP, "from api.ai_engine import get_chatbot; get_chatbot()"),
+]
+
+SNIPPET = """
+import json, time
+{setup}
+start = time.perf_counter()
+{timed}
+print("@@TIMING@@" + json.dumps(time.perf_counter() - start))
+"""
+
+
+class Command(BaseCommand):
+    help = "Reports import and initialization cost of the API and AI stack, per component."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--skip-chatbot", action="store_true", help="Do not measure the chatbot client.")
+        parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+
+    def handle(self, *args, **options):
+        results = []
+        for name, setup, timed in COMPONENTS:
+            if options["skip_chatbot"] and "get_chatbot" in timed:
+                continue
+            results.append({"component": name, "seconds": self._measure(setup, timed)})
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.stdout.write(f"{'component':<38} {'seconds':>9}")
+        self.stdout.write("-" * 48)
+        for row in results:
+            seconds = "failed" if row["seconds"] is None else f"{row['seconds']:.3f}"
+            self.stdout.write(f"{row['component']:<38} {seconds:>9}")
+
+    def _measure(self, setup, timed):
+        proc = subprocess.run(
+            [sys.executable, "-c", SNIPPET.format(setup=setup, timed=timed)],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+        )
+        for line in proc.stdout.splitlines():
+            if line.startswith("@@TIMING@@"):
+                return json.loads(line[len("@@TIMING@@"):])
+        self.stderr.write(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "no output")
+        return None
@@ -0,0 +1,30 @@
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+
+from api.tasks import run_worker
+
+
+class Command(BaseCommand):
+    help = "Runs a pool of workers that precompute AI resolution suggestions from the job queue."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=4, help="Number of worker threads.")
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds to sleep when the queue is empty.")
+        parser.add_argument("--drain", action="store_true", help="Exit once no runnable jobs are left.")
+
+    def handle(self, *args, **options):
+        stop_event = threading.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: stop_event.set())
+
+        self.stdout.write(f"Suggestion worker started with {options['concurrency']} threads")
+        processed = run_worker(
+            concurrency=options["concurrency"],
+            poll_interval=options["poll_interval"],
+            drain=options["drain"],
+            stop_event=stop_event,
+            log=self.stdout.write,
+        )
+        self.stdout.write(f"Stopped: {processed['done']} done, {processed['failed']} failed attempts")
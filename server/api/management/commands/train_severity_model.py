@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from api import model_store
+from api.ai_engine import SeverityAI, get_training_data
+
+
+class Command(BaseCommand):
+    help = "Trains the severity classifier and writes a versioned model artifact for workers to load."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Retrain even if a matching artifact exists.")
+
+    def handle(self, *args, **options):
+        training_data = get_training_data()
+        key = model_store.artifact_key(training_data)
+        path = model_store.artifact_path(key)
+        if path.exists() and not options["force"]:
+            self.stdout.write(f"Artifact {path.name} is up to date.")
+            return
+
+        engine = SeverityAI(training_data=training_data, use_artifact=False)
+        path = model_store.save_model(engine.model, key)
+        self.stdout.write(self.style.SUCCESS(f"Wrote model artifact {path}"))
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.11 on 2026-10-17 21:54
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0003_suggestionjob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IncidentCluster",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("title", models.CharField(max_length=200)),
+                ("representative_text", models.TextField()),
+                ("signature", models.JSONField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("open", "Open"), ("closed", "Closed")],
+                        default="open",
+                        max_length=20,
+                    ),
+                ),
+                ("member_count", models.PositiveIntegerField(default=1)),
+                ("ai_severity_score", models.IntegerField(blank=True, null=True)),
+                ("priority", models.CharField(default="Medium", max_length=20)),
+                (
+                    "ai_predicted_resolution_time",
+                    models.CharField(blank=True, max_length=100, null=True),
+                ),
+                ("suggestion", models.TextField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "last_seen_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["status", "last_seen_at"],
+                        name="incident_status_seen_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddField(
+            model_name="complaint",
+            name="incident",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="complaints",
+                to="api.incidentcluster",
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.11 on 2026-10-17 21:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0004_incidentcluster"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="complaint",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="complaint_created_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.11 on 2026-10-17 22:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0005_complaint_created_id_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="complaint",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"], name="complaint_user_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="complaint",
+            index=models.Index(
+                fields=["status", "-created_at", "-id"],
+                name="complaint_status_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="complaint",
+            index=models.Index(
+                fields=["status", "priority", "-created_at", "-id"],
+                name="complaint_status_prio_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="complaint",
+            index=models.Index(
+                fields=["priority", "-created_at", "-id"], name="complaint_priority_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="complaint",
+            index=models.Index(
+                fields=["category", "-created_at", "-id"], name="complaint_category_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="complaint",
+            index=models.Index(
+                fields=["ai_severity_score"], name="complaint_score_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Full-text search structures for complaints; vendor specific, see api/search.py.
+# The SQL is a snapshot: api/search.py may change, this migration must not.
+
+from django.db import migrations
+
+POSTGRES_INSTALL = [
+    """
+    ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS complaint_search_gin ON {table} USING GIN (search_vector)",
+]
+POSTGRES_UNINSTALL = [
+    "DROP INDEX IF EXISTS complaint_search_gin",
+    "ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_INSTALL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS api_complaint_fts USING fts5(
+        title, description, content='{table}', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS api_complaint_fts_ai AFTER INSERT ON {table} BEGIN
+        INSERT INTO api_complaint_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS api_complaint_fts_ad AFTER DELETE ON {table} BEGIN
+        INSERT INTO api_complaint_fts(api_complaint_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS api_complaint_fts_au AFTER UPDATE OF title, description ON {table} BEGIN
+        INSERT INTO api_complaint_fts(api_complaint_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO api_complaint_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+    "INSERT INTO api_complaint_fts(api_complaint_fts) VALUES ('rebuild')",
+]
+SQLITE_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS api_complaint_fts_ai",
+    "DROP TRIGGER IF EXISTS api_complaint_fts_ad",
+    "DROP TRIGGER IF EXISTS api_complaint_fts_au",
+    "DROP TABLE IF EXISTS api_complaint_fts",
+]
+
+
+def _run(apps, schema_editor, statements):
+    table = apps.get_model("api", "Complaint")._meta.db_table
+    for sql in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql.format(table=table))
+
+
+def install_search(apps, schema_editor):
+    _run(apps, schema_editor, {"postgresql": POSTGRES_INSTALL, "sqlite": SQLITE_INSTALL})
+
+
+def uninstall_search(apps, schema_editor):
+    _run(apps, schema_editor, {"postgresql": POSTGRES_UNINSTALL, "sqlite": SQLITE_UNINSTALL})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0006_complaint_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search, uninstall_search),
+    ]
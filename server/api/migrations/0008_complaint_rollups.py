@@ -0,0 +1,116 @@
+# Generated by Django 5.2.11 on 2026-10-17 22:06
+
+from collections import Counter
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+DIMENSIONS = ("status", "priority", "category")
+
+
+def backfill(apps, schema_editor):
+    """Initial rollups (owner 0 is everyone); a snapshot of api.rollups.rebuild."""
+    Complaint = apps.get_model("api", "Complaint")
+    ComplaintHistory = apps.get_model("api", "ComplaintHistory")
+    ComplaintRollup = apps.get_model("api", "ComplaintRollup")
+    DailyComplaintRollup = apps.get_model("api", "DailyComplaintRollup")
+
+    def owners(user_id):
+        return (0, user_id) if user_id else (0,)
+
+    counts = Counter()
+    for dimension in DIMENSIONS:
+        for row in Complaint.objects.values("user_id", dimension).annotate(n=Count("id")).order_by():
+            for owner in owners(row["user_id"]):
+                counts[(owner, dimension, row[dimension])] += row["n"]
+
+    daily = Counter()
+    created = (
+        Complaint.objects.annotate(day=TruncDate("created_at")).values("user_id", "day").annotate(n=Count("id")).order_by()
+    )
+    for row in created:
+        for owner in owners(row["user_id"]):
+            daily[(owner, row["day"], "created")] += row["n"]
+    resolved = (
+        ComplaintHistory.objects.filter(action="STATUS_CHANGE", new_value="Resolved")
+        .annotate(day=TruncDate("timestamp"))
+        .values("complaint__user_id", "day")
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+    for row in resolved:
+        for owner in owners(row["complaint__user_id"]):
+            daily[(owner, row["day"], "resolved")] += row["n"]
+
+    ComplaintRollup.objects.bulk_create(
+        [ComplaintRollup(owner_id=o, dimension=d, value=v, count=n) for (o, d, v), n in counts.items() if n],
+        batch_size=1000,
+    )
+    days = {}
+    for (owner, day, field), n in daily.items():
+        days.setdefault((owner, day), DailyComplaintRollup(owner_id=owner, day=day))
+        setattr(days[(owner, day)], field, n)
+    DailyComplaintRollup.objects.bulk_create(days.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0007_complaint_search"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ComplaintRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("owner_id", models.PositiveIntegerField(default=0)),
+                ("dimension", models.CharField(max_length=20)),
+                ("value", models.CharField(max_length=50)),
+                ("count", models.IntegerField(default=0)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("owner_id", "dimension", "value"),
+                        name="complaintrollup_key",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="DailyComplaintRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("owner_id", models.PositiveIntegerField(default=0)),
+                ("day", models.DateField()),
+                ("created", models.IntegerField(default=0)),
+                ("resolved", models.IntegerField(default=0)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("owner_id", "day"), name="dailycomplaintrollup_key"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,134 @@
+# Generated by Django 5.2.11 on 2026-10-17 22:09
+
+import re
+from datetime import datetime
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+# Snapshot of the blob format in api/resolutions.py at the time of this migration
+SEPARATOR = "\n\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n**Update ({timestamp}):**\n"
+SEPARATOR_RE = re.compile(r"\n\n━+\n\*\*Update \((\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)\):\*\*\n")
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def split_resolution(text):
+    """[(timestamp or None, text)] for a combined blob; the first part has no time."""
+    pieces = SEPARATOR_RE.split(text)
+    parts = [(None, pieces[0])]
+    for stamp, body in zip(pieces[1::2], pieces[2::2]):
+        parts.append((timezone.make_aware(datetime.strptime(stamp, TIMESTAMP_FORMAT)), body))
+    return parts
+
+
+def combined_resolution(entries):
+    parts = []
+    for entry in entries:
+        if parts:
+            stamp = timezone.localtime(entry.created_at).strftime(TIMESTAMP_FORMAT)
+            parts.append(SEPARATOR.format(timestamp=stamp))
+        parts.append(entry.text)
+    return "".join(parts) if parts else None
+
+
+def split_resolutions(apps, schema_editor):
+    """One ResolutionEntry per update in each legacy resolution blob."""
+    Complaint = apps.get_model("api", "Complaint")
+    ComplaintHistory = apps.get_model("api", "ComplaintHistory")
+    ResolutionEntry = apps.get_model("api", "ResolutionEntry")
+
+    complaints = Complaint.objects.exclude(resolution__isnull=True).exclude(
+        resolution=""
+    )
+    for complaint in complaints.only("id", "resolution", "created_at").iterator(
+        chunk_size=500
+    ):
+        # The n-th RESOLUTION_ADDED history row recorded the n-th update
+        added = list(
+            ComplaintHistory.objects.filter(
+                complaint_id=complaint.id, action="RESOLUTION_ADDED"
+            )
+            .order_by("timestamp", "id")
+            .values_list("timestamp", "changed_by_id")
+        )
+        entries = []
+        for n, (when, text) in enumerate(split_resolution(complaint.resolution)):
+            logged_at, author_id = added[n] if n < len(added) else (None, None)
+            entries.append(
+                ResolutionEntry(
+                    complaint_id=complaint.id,
+                    text=text,
+                    author_id=author_id,
+                    # Without a log row the first answer is dated at the complaint
+                    created_at=when or logged_at or complaint.created_at,
+                )
+            )
+        ResolutionEntry.objects.bulk_create(entries)
+
+
+def join_resolutions(apps, schema_editor):
+    Complaint = apps.get_model("api", "Complaint")
+    ResolutionEntry = apps.get_model("api", "ResolutionEntry")
+    ids = ResolutionEntry.objects.values_list("complaint_id", flat=True).distinct()
+    for complaint_id in ids.iterator():
+        entries = ResolutionEntry.objects.filter(complaint_id=complaint_id).order_by(
+            "created_at", "id"
+        )
+        Complaint.objects.filter(pk=complaint_id).update(
+            resolution=combined_resolution(entries)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0008_complaint_rollups"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ResolutionEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("text", models.TextField()),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+                (
+                    "author",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "complaint",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="resolution_entries",
+                        to="api.complaint",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["complaint", "-created_at", "-id"],
+                        name="resolutionentry_complaint_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(split_resolutions, join_resolutions),
+    ]
@@ -0,0 +1,18 @@
+# Separate from 0009 so the column is dropped after the data migration has
+# committed (PostgreSQL refuses ALTER TABLE with pending deferred FK checks).
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0009_resolution_entries"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="complaint",
+            name="resolution",
+        ),
+    ]
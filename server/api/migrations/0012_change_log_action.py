@@ -0,0 +1,23 @@
+# Generated by Django 5.2.11 on 2026-10-17 22:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0011_change_feed"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="changelogentry",
+            name="action",
+            field=models.CharField(default="updated", max_length=50),
+        ),
+        migrations.AddField(
+            model_name="changelogentry",
+            name="user_id",
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.11 on 2026-10-17 23:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0012_change_log_action"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="incidentcluster",
+            index=models.Index(
+                condition=models.Q(("member_count__gt", 1)),
+                fields=["-created_at", "-id"],
+                name="incident_shared_created_idx",
+            ),
+        ),
+    ]
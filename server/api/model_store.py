@@ -0,0 +1,80 @@
+import hashlib
+import json
+import os
+import tempfile
+from importlib.metadata import version
+from pathlib import Path
+
+# Bump when the pipeline built in SeverityAI._train changes shape/params,
+# so stale artifacts are not picked up by new code.
+MODEL_CODE_VERSION = "1"
+
+ARTIFACT_DIR = Path(os.getenv("SEVERITY_MODEL_DIR", Path(__file__).resolve().parent.parent / "artifacts"))
+
+
+def artifact_key(training_data) -> str:
+    """
+    Hash of the training examples, the model code version and the sklearn
+    version (pickled estimators are not portable across sklearn releases).
+    """
+    digest = hashlib.sha256()
+    digest.update(f"code={MODEL_CODE_VERSION};sklearn={version('scikit-learn')};".encode())
+    digest.update(json.dumps([list(row) for row in training_data], ensure_ascii=False).encode())
+    return digest.hexdigest()[:16]
+
+
+def artifact_path(key: str) -> Path:
+    return ARTIFACT_DIR / f"severity-{key}.joblib"
+
+
+def load_model(key: str):
+    """
+    Loads the artifact for this key, memory-mapping its numpy arrays so
+    workers share pages instead of holding private copies. Returns None if
+    no matching artifact exists or it cannot be read.
+    """
+    return load_artifact(artifact_path(key))
+
+
+def save_model(model, key: str) -> Path:
+    return save_artifact(model, artifact_path(key))
+
+
+def load_artifact(path, mmap=True):
+    import joblib
+
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        return joblib.load(path, mmap_mode="r" if mmap else None)
+    except Exception as e:
+        print(f"⚠️ Failed to load model artifact {path}: {e}")
+        return None
+
+
+def save_artifact(obj, path) -> Path:
+    """Writes the artifact atomically so concurrent workers never see a partial file."""
+    import joblib
+
+    def dump(fh):
+        # Uncompressed on purpose: compressed artifacts cannot be memory-mapped
+        joblib.dump(obj, fh)
+
+    return write_atomic(path, dump)
+
+
+def write_atomic(path, write) -> Path:
+    """Calls write(fh) on a temp file next to path, then renames it into place."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            write(fh)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    return path
@@ -1,6 +1,7 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.conf import settings
+from django.utils import timezone
 
 class User(AbstractUser):
     ROLE_CHOICES = (
@@ -19,6 +20,38 @@ class User(AbstractUser):
     def __str__(self):
         return self.email
 
+class IncidentCluster(models.Model):
+    STATUS_CHOICES = (
+        ('open', 'Open'),
+        ('closed', 'Closed'),
+    )
+
+    title = models.CharField(max_length=200)
+    representative_text = models.TextField()
+    # MinHash signature of the first complaint, used to rebuild the LSH index
+    signature = models.JSONField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='open')
+    member_count = models.PositiveIntegerField(default=1)
+    ai_severity_score = models.IntegerField(null=True, blank=True)
+    priority = models.CharField(max_length=20, default='Medium')
+    ai_predicted_resolution_time = models.CharField(max_length=100, null=True, blank=True)
+    suggestion = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_seen_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'last_seen_at'], name='incident_status_seen_idx'),
+            # Listing: most clusters hold a single complaint and are skipped by default
+            models.Index(
+                fields=['-created_at', '-id'], name='incident_shared_created_idx',
+                condition=models.Q(member_count__gt=1),
+            ),
+        ]
+
+    def __str__(self):
+        return f"Incident {self.id}: {self.title} ({self.member_count} complaints)"
+
 class Complaint(models.Model):
     PRIORITY_CHOICES = (
         ('Low', 'Low'),
@@ -39,10 +72,23 @@ class Complaint(models.Model):
     priority = models.CharField(max_length=20, choices=PRIORITY_CHOICES, default='Medium')
     ai_severity_score = models.IntegerField(null=True, blank=True)
     ai_predicted_resolution_time = models.CharField(max_length=100, null=True, blank=True)
-    resolution = models.TextField(null=True, blank=True)
+    incident = models.ForeignKey(IncidentCluster, on_delete=models.SET_NULL, null=True, blank=True, related_name='complaints')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Keyset pagination order for the complaints listing (+ created_at range filters)
+            models.Index(fields=['-created_at', '-id'], name='complaint_created_id_idx'),
+            # One per listing filter shape (api/filters.py), each ending in the listing order
+            models.Index(fields=['user', '-created_at', '-id'], name='complaint_user_created_idx'),
+            models.Index(fields=['status', '-created_at', '-id'], name='complaint_status_created_idx'),
+            models.Index(fields=['status', 'priority', '-created_at', '-id'], name='complaint_status_prio_idx'),
+            models.Index(fields=['priority', '-created_at', '-id'], name='complaint_priority_idx'),
+            models.Index(fields=['category', '-created_at', '-id'], name='complaint_category_idx'),
+            models.Index(fields=['ai_severity_score'], name='complaint_score_idx'),
+        ]
+
     def __str__(self):
         return f"{self.title} ({self.status})"
 
@@ -56,3 +102,109 @@ class ComplaintHistory(models.Model):
 
     def __str__(self):
         return f"{self.action} on {self.complaint.id}"
+
+class ResolutionEntry(models.Model):
+    """One resolution update; the combined text is assembled on read (api/resolutions.py)."""
+    complaint = models.ForeignKey(Complaint, on_delete=models.CASCADE, related_name='resolution_entries')
+    text = models.TextField()
+    author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['complaint', '-created_at', '-id'], name='resolutionentry_complaint_idx'),
+        ]
+
+    def __str__(self):
+        return f"Resolution entry {self.id} on {self.complaint_id}"
+
+class SuggestionCache(models.Model):
+    # sha256 of the normalized complaint description
+    description_hash = models.CharField(max_length=64, unique=True)
+    suggestion = models.TextField()
+    hit_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_hit_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Suggestion {self.description_hash[:12]} ({self.hit_count} hits)"
+
+class SuggestionJob(models.Model):
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    )
+
+    complaint = models.ForeignKey(Complaint, on_delete=models.CASCADE, related_name='suggestion_jobs')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    # Not picked up before this time (retry backoff)
+    run_after = models.DateTimeField(default=timezone.now)
+    # Visibility timeout: a 'running' job whose lock expired is considered crashed
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='suggestionjob_claim_idx'),
+        ]
+
+    def __str__(self):
+        return f"SuggestionJob {self.id} for complaint {self.complaint_id} ({self.status})"
+
+class ComplaintRollup(models.Model):
+    """Complaint count per (owner, dimension, value); owner 0 = all complaints. See api/rollups.py."""
+    owner_id = models.PositiveIntegerField(default=0)
+    dimension = models.CharField(max_length=20)  # status / priority / category
+    value = models.CharField(max_length=50)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['owner_id', 'dimension', 'value'], name='complaintrollup_key'),
+        ]
+
+    def __str__(self):
+        return f"{self.owner_id}/{self.dimension}={self.value}: {self.count}"
+
+class DailyComplaintRollup(models.Model):
+    """Complaints created / resolved per (owner, day); owner 0 = all complaints."""
+    owner_id = models.PositiveIntegerField(default=0)
+    day = models.DateField()
+    created = models.IntegerField(default=0)
+    resolved = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['owner_id', 'day'], name='dailycomplaintrollup_key'),
+        ]
+
+    def __str__(self):
+        return f"{self.owner_id}/{self.day}: +{self.created} / {self.resolved} resolved"
+
+class ChangeCounter(models.Model):
+    """Single row (pk=1) holding the last allocated change sequence number."""
+    value = models.BigIntegerField(default=0)
+
+class ChangeLogEntry(models.Model):
+    """
+    One write to a complaint (or its history / resolution entries), in commit
+    order. Plain ids rather than foreign keys so deletions stay in the feed.
+    """
+    seq = models.BigIntegerField(unique=True)
+    complaint_id = models.BigIntegerField()
+    # Owner of the complaint, so per-user event streams need no join (and survive deletes)
+    user_id = models.BigIntegerField(null=True, blank=True)
+    history_id = models.BigIntegerField(null=True, blank=True)
+    # created / updated / deleted, or the ComplaintHistory action
+    action = models.CharField(max_length=50, default='updated')
+    deleted = models.BooleanField(default=False)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"#{self.seq} complaint {self.complaint_id}"
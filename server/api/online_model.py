@@ -0,0 +1,133 @@
+import json
+from datetime import datetime
+from pathlib import Path
+
+from . import model_store
+
+# ==========================================
+# ONLINE SEVERITY MODEL
+# HashingVectorizer (stateless, no vocabulary to refit) + MultinomialNB
+# updated with partial_fit, so agent-labelled complaints can be folded in
+# with small mini-batches instead of refitting from scratch.
+#
+# Versions live in ARTIFACT_DIR/online/ as v<N>.joblib + v<N>.json. The
+# ACTIVE file names the version workers should serve; it is replaced
+# atomically, and SeverityAI picks the change up without a restart.
+# ==========================================
+
+CLASSES = [0, 1, 2]
+PRIORITY_TO_LABEL = {"Low": 0, "Medium": 1, "High": 2}
+N_FEATURES = 2 ** 18
+
+
+class OnlineSeverityModel:
+    """Exposes the predict_proba/classes_ interface SeverityAI.predict_batch relies on."""
+
+    def __init__(self):
+        from sklearn.feature_extraction.text import HashingVectorizer
+        from sklearn.naive_bayes import MultinomialNB
+
+        # alternate_sign=False: MultinomialNB needs non-negative features
+        self.vectorizer = HashingVectorizer(n_features=N_FEATURES, alternate_sign=False, norm="l2")
+        self.classifier = MultinomialNB(alpha=0.1)
+        self.samples_seen = 0
+
+    @property
+    def classes_(self):
+        return self.classifier.classes_
+
+    def partial_fit(self, texts, labels):
+        if not texts:
+            return self
+        self.classifier.partial_fit(self.vectorizer.transform(texts), labels, classes=CLASSES)
+        self.samples_seen += len(texts)
+        return self
+
+    def predict_proba(self, texts):
+        return self.classifier.predict_proba(self.vectorizer.transform(texts))
+
+    def predict(self, texts):
+        return self.classifier.predict(self.vectorizer.transform(texts))
+
+
+def online_dir() -> Path:
+    return model_store.ARTIFACT_DIR / "online"
+
+
+def active_pointer() -> Path:
+    return online_dir() / "ACTIVE"
+
+
+def version_path(version: int) -> Path:
+    return online_dir() / f"v{version}.joblib"
+
+
+def _meta_path(version: int) -> Path:
+    return online_dir() / f"v{version}.json"
+
+
+def active_version():
+    try:
+        return int(active_pointer().read_text().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def version_meta(version: int):
+    try:
+        return json.loads(_meta_path(version).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def list_versions():
+    versions = []
+    for path in sorted(online_dir().glob("v*.json"), key=lambda p: int(p.stem[1:])):
+        meta = version_meta(int(path.stem[1:]))
+        if meta:
+            versions.append(meta)
+    return versions
+
+
+def activate(version: int):
+    if not version_path(version).exists():
+        raise ValueError(f"Online model version {version} does not exist")
+    model_store.write_atomic(active_pointer(), lambda fh: fh.write(str(version).encode()))
+
+
+def load_version(version: int, mmap=True):
+    return model_store.load_artifact(version_path(version), mmap=mmap)
+
+
+def save_version(model, parent=None, trained_through=None, new_samples=0) -> int:
+    """Writes a new immutable version and returns its number (does not activate it)."""
+    existing = [int(p.stem[1:]) for p in online_dir().glob("v*.json")]
+    version = max(existing, default=0) + 1
+    model_store.save_artifact(model, version_path(version))
+    meta = {
+        "version": version,
+        "parent": parent,
+        "trained_through": trained_through,
+        "new_samples": new_samples,
+        "samples_seen": model.samples_seen,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    model_store.write_atomic(_meta_path(version), lambda fh: fh.write(json.dumps(meta, indent=2).encode()))
+    return version
+
+
+def seed_model(training_data):
+    texts, labels = zip(*training_data)
+    return OnlineSeverityModel().partial_fit(list(texts), list(labels))
+
+
+def rollback(version=None) -> int:
+    """Re-activates `version`, or the parent of the active version."""
+    if version is None:
+        current = active_version()
+        meta = version_meta(current) if current else None
+        if not meta or not meta.get("parent"):
+            raise ValueError("Active version has no parent to roll back to")
+        version = meta["parent"]
+    activate(version)
+    return version
@@ -0,0 +1,69 @@
+import base64
+import json
+
+from django.conf import settings
+from django.db.models import Prefetch, Q
+from django.utils.dateparse import parse_datetime
+
+from .models import Complaint, ComplaintHistory, ResolutionEntry
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at, pk) -> str:
+    raw = json.dumps([created_at.isoformat(), pk]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, pk = json.loads(raw)
+        created_at = parse_datetime(created_at)
+        if created_at is None or not isinstance(pk, int):
+            raise ValueError
+        return created_at, pk
+    except (ValueError, TypeError):
+        raise InvalidCursor("Invalid cursor")
+
+
+def page_size_from(params) -> int:
+    try:
+        size = int(params.get("page_size", settings.COMPLAINTS_PAGE_SIZE))
+    except (TypeError, ValueError):
+        size = settings.COMPLAINTS_PAGE_SIZE
+    return max(1, min(size, settings.COMPLAINTS_MAX_PAGE_SIZE))
+
+
+def complaints_for_listing(queryset=None):
+    """
+    Everything ComplaintSerializer touches, loaded up front: a page costs one
+    query for complaints (+ users), one for their history (+ authors) and one
+    for their resolution entries.
+    """
+    queryset = queryset if queryset is not None else Complaint.objects.all()
+    return queryset.select_related("user").prefetch_related(
+        Prefetch("history", queryset=ComplaintHistory.objects.select_related("changed_by").order_by("timestamp", "id")),
+        Prefetch("resolution_entries", queryset=ResolutionEntry.objects.order_by("created_at", "id")),
+    )
+
+
+def keyset_page(queryset, cursor=None, page_size=50):
+    """
+    Newest-first page over (created_at, id). Unlike OFFSET, the cost of a page
+    does not grow with its depth, and rows inserted meanwhile do not shift it.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    queryset = queryset.order_by("-created_at", "-id")
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+
+    rows = list(queryset[:page_size + 1])
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].pk)
+    return rows, next_cursor
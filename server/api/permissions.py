@@ -0,0 +1,15 @@
+from rest_framework.permissions import BasePermission
+
+STAFF_ROLES = ('admin', 'agent')
+
+
+def is_support_staff(user):
+    """Admins and agents, signed in (session or bearer token); they may see every complaint."""
+    return bool(user and user.is_authenticated and (user.is_staff or user.role in STAFF_ROLES))
+
+
+class IsSupportStaff(BasePermission):
+    """Bulk reads and writes (export, import) are for admins and agents only."""
+
+    def has_permission(self, request, view):
+        return is_support_staff(request.user)
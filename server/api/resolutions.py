@@ -0,0 +1,43 @@
+import re
+from datetime import datetime
+
+from django.utils import timezone
+
+# ==========================================
+# RESOLUTION ENTRIES
+# Each resolution update is one ResolutionEntry row (append-only), so an
+# update costs one INSERT however long the ticket's history is, and two
+# agents writing at once cannot overwrite each other. The combined text the
+# API has always returned is assembled on read in the original format.
+# ==========================================
+
+SEPARATOR = "\n\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n**Update ({timestamp}):**\n"
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Matches SEPARATOR in blobs written before entries existed
+_SEPARATOR_RE = re.compile(r"\n\n━+\n\*\*Update \((\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)\):\*\*\n")
+
+
+def combined_resolution(entries):
+    """The single resolution text for entries in chronological order, or None."""
+    parts = []
+    for entry in entries:
+        if parts:
+            parts.append(SEPARATOR.format(timestamp=timezone.localtime(entry.created_at).strftime(TIMESTAMP_FORMAT)))
+        parts.append(entry.text)
+    return "".join(parts) if parts else None
+
+
+def split_resolution(text):
+    """
+    Splits a legacy combined blob into [(timestamp or None, text)]. The first
+    part has no recorded time of its own.
+    """
+    if not text:
+        return []
+    pieces = _SEPARATOR_RE.split(text)
+    parts = [(None, pieces[0])]
+    for stamp, body in zip(pieces[1::2], pieces[2::2]):
+        when = timezone.make_aware(datetime.strptime(stamp, TIMESTAMP_FORMAT))
+        parts.append((when, body))
+    return parts
@@ -0,0 +1,77 @@
+from django.db.models import OuterRef, Subquery
+
+from . import online_model
+from .ai_engine import get_training_data
+from .models import ChangeLogEntry, Complaint, ComplaintHistory
+
+
+def labelled_complaints(since=0):
+    """
+    (seq, description, priority) for every priority an agent corrected by
+    hand after change-feed sequence number `since`, oldest first. Only
+    corrections count as labels: a resolved ticket still carries the
+    model's own prediction. The feed's numbers become visible in commit
+    order, so a watermark on them neither skips a late commit nor folds a
+    correction twice when the complaint is edited again.
+    """
+    return (
+        ChangeLogEntry.objects.filter(seq__gt=since, action='PRIORITY_CHANGE')
+        .annotate(
+            description=Subquery(Complaint.objects.filter(pk=OuterRef('complaint_id')).values('description')),
+            priority=Subquery(ComplaintHistory.objects.filter(pk=OuterRef('history_id')).values('new_value')),
+        )
+        # Deleted complaints (or history) have nothing left to learn from
+        .filter(description__isnull=False, priority__in=online_model.PRIORITY_TO_LABEL)
+        .order_by('seq')
+        .values_list('seq', 'description', 'priority')
+    )
+
+
+def _trained_through(meta):
+    """The change-feed sequence number a version was trained through (0: nothing yet)."""
+    value = (meta or {}).get('trained_through')
+    return value if isinstance(value, int) else 0
+
+
+def retrain(batch_size=256, log=print):
+    """
+    Folds priority corrections made since the active version into a copy of
+    it with partial_fit mini-batches, then publishes and activates a new
+    version. Returns the new version, or None if there was nothing new.
+    """
+    parent = online_model.active_version()
+    if parent is not None:
+        model = online_model.load_version(parent, mmap=False)
+        since = _trained_through(online_model.version_meta(parent))
+    else:
+        model = None
+    if model is None:
+        log("🌱 Seeding online model from ai_config.TRAINING_DATA")
+        model = online_model.seed_model(get_training_data())
+        parent, since = None, 0
+
+    texts, labels, folded, trained_through = [], [], 0, since
+    for seq, description, priority in labelled_complaints(since).iterator(chunk_size=batch_size):
+        texts.append(description)
+        labels.append(online_model.PRIORITY_TO_LABEL[priority])
+        trained_through = seq
+        if len(texts) >= batch_size:
+            model.partial_fit(texts, labels)
+            folded += len(texts)
+            texts, labels = [], []
+    if texts:
+        model.partial_fit(texts, labels)
+        folded += len(texts)
+
+    if folded == 0 and parent is not None:
+        return None
+
+    version = online_model.save_version(
+        model,
+        parent=parent,
+        trained_through=trained_through,
+        new_samples=folded,
+    )
+    online_model.activate(version)
+    log(f"✅ Activated online model v{version} (+{folded} samples)")
+    return version
@@ -0,0 +1,156 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import Complaint, ComplaintHistory, ComplaintRollup, DailyComplaintRollup
+
+# ==========================================
+# DASHBOARD ROLLUPS
+# Counts by status/priority/category and per-day created/resolved counts,
+# kept per owner (user id) and for everyone (owner 0). Writers apply
+# deltas with one INSERT ... ON CONFLICT DO UPDATE per table, so the stats
+# endpoint reads a handful of rows whatever the size of the complaint table.
+# `manage.py rebuild_complaint_stats` recomputes everything if they drift
+# (admin edits, deletes, raw SQL).
+# ==========================================
+
+ALL = 0
+DIMENSIONS = ("status", "priority", "category")
+
+
+def _owners(user_id):
+    return (ALL, user_id) if user_id else (ALL,)
+
+
+def _upsert(model, key_columns, deltas):
+    """deltas: {key tuple: value-column tuple of increments}"""
+    rows = [key + values for key, values in deltas.items() if any(values)]
+    if not rows:
+        return
+    table = connection.ops.quote_name(model._meta.db_table)
+    value_columns = [f.column for f in model._meta.concrete_fields if f.column not in key_columns and not f.primary_key]
+    columns = list(key_columns) + value_columns
+    quoted = [connection.ops.quote_name(c) for c in columns]
+    updates = ", ".join(f"{q} = {table}.{q} + EXCLUDED.{q}" for q in quoted[len(key_columns):])
+    sql = (
+        f"INSERT INTO {table} ({', '.join(quoted)}) VALUES ({', '.join(['%s'] * len(columns))}) "
+        f"ON CONFLICT ({', '.join(quoted[:len(key_columns)])}) DO UPDATE SET {updates}"
+    )
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, rows)
+
+
+def _apply(counts, daily):
+    with transaction.atomic():
+        _upsert(ComplaintRollup, ("owner_id", "dimension", "value"), {k: (v,) for k, v in counts.items()})
+        _upsert(DailyComplaintRollup, ("owner_id", "day"), daily)
+
+
+def complaints_created(complaints):
+    """Counts newly created complaints (single create or a bulk_create batch)."""
+    counts = Counter()
+    daily = Counter()
+    for complaint in complaints:
+        day = timezone.localdate(complaint.created_at)
+        for owner in _owners(complaint.user_id):
+            for dimension in DIMENSIONS:
+                counts[(owner, dimension, getattr(complaint, dimension))] += 1
+            daily[(owner, day)] += 1
+    _apply(counts, {key: (created, 0) for key, created in daily.items()})
+
+
+def complaint_changed(complaint, before):
+    """
+    Moves a complaint between buckets after an update. `before` maps the
+    dimensions to their previous values. Becoming Resolved counts towards
+    today's resolved total (matching STATUS_CHANGE history).
+    """
+    counts = Counter()
+    daily = {}
+    for dimension in DIMENSIONS:
+        old, new = before.get(dimension), getattr(complaint, dimension)
+        if old is None or old == new:
+            continue
+        for owner in _owners(complaint.user_id):
+            counts[(owner, dimension, old)] -= 1
+            counts[(owner, dimension, new)] += 1
+    if before.get("status") not in (None, "Resolved") and complaint.status == "Resolved":
+        today = timezone.localdate()
+        daily = {(owner, today): (0, 1) for owner in _owners(complaint.user_id)}
+    _apply(counts, daily)
+
+
+@transaction.atomic
+def rebuild():
+    """Recomputes every rollup row from the source tables. Returns row counts."""
+    ComplaintRollup.objects.all().delete()
+    DailyComplaintRollup.objects.all().delete()
+
+    counts = Counter()
+    for dimension in DIMENSIONS:
+        for row in Complaint.objects.values("user_id", dimension).annotate(n=Count("id")).order_by():
+            for owner in _owners(row["user_id"]):
+                counts[(owner, dimension, row[dimension])] += row["n"]
+
+    daily = Counter()
+    created = (
+        Complaint.objects.annotate(day=TruncDate("created_at")).values("user_id", "day").annotate(n=Count("id")).order_by()
+    )
+    for row in created:
+        for owner in _owners(row["user_id"]):
+            daily[(owner, row["day"], "created")] += row["n"]
+    resolved = (
+        ComplaintHistory.objects.filter(action="STATUS_CHANGE", new_value="Resolved")
+        .annotate(day=TruncDate("timestamp"))
+        .values("complaint__user_id", "day")
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+    for row in resolved:
+        for owner in _owners(row["complaint__user_id"]):
+            daily[(owner, row["day"], "resolved")] += row["n"]
+
+    ComplaintRollup.objects.bulk_create(
+        [ComplaintRollup(owner_id=o, dimension=d, value=v, count=n) for (o, d, v), n in counts.items() if n],
+        batch_size=1000,
+    )
+    days = {}
+    for (owner, day, field), n in daily.items():
+        days.setdefault((owner, day), DailyComplaintRollup(owner_id=owner, day=day))
+        setattr(days[(owner, day)], field, n)
+    DailyComplaintRollup.objects.bulk_create(days.values(), batch_size=1000)
+    return {"counts": sum(1 for n in counts.values() if n), "days": len(days)}
+
+
+def complaint_stats(user_id=None, days=30):
+    """Dashboard numbers for one user (or everyone), read from the rollups."""
+    owner = user_id or ALL
+    result = {dimension: {} for dimension in DIMENSIONS}
+    for dimension, value, count in ComplaintRollup.objects.filter(owner_id=owner).values_list("dimension", "value", "count"):
+        if count:
+            result[dimension][value] = count
+
+    today = timezone.localdate()
+    start = today - timedelta(days=days - 1)
+    rows = {
+        day: (created, resolved)
+        for day, created, resolved in DailyComplaintRollup.objects.filter(owner_id=owner, day__gte=start)
+        .values_list("day", "created", "resolved")
+    }
+    daily = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        created, resolved = rows.get(day, (0, 0))
+        daily.append({"date": day.isoformat(), "created": created, "resolved": resolved})
+
+    return {
+        "total": sum(result["status"].values()),
+        "by_status": result["status"],
+        "by_priority": result["priority"],
+        "by_category": result["category"],
+        "daily": daily,
+    }
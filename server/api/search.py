@@ -0,0 +1,200 @@
+import html
+
+from django.conf import settings
+from django.db import connections, router
+
+from .models import Complaint
+
+# ==========================================
+# FULL-TEXT SEARCH over Complaint.title / description
+# PostgreSQL: generated tsvector column (title weighted A, description B)
+#             with a GIN index, ranked with ts_rank_cd.
+# SQLite:     external-content FTS5 table kept in sync by triggers,
+#             ranked with bm25. Lets the feature run in local tests.
+# Both are created by migration 0007_complaint_search.
+# ==========================================
+
+# Highlight markers that cannot appear in user text; swapped for <mark>
+# after HTML-escaping so snippets are safe to render.
+_START, _STOP = "\x02", "\x03"
+
+POSTGRES_INSTALL = [
+    """
+    ALTER TABLE api_complaint ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS complaint_search_gin ON api_complaint USING GIN (search_vector)",
+]
+POSTGRES_UNINSTALL = [
+    "DROP INDEX IF EXISTS complaint_search_gin",
+    "ALTER TABLE api_complaint DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_TABLE = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS api_complaint_fts USING fts5(
+        title, description, content='api_complaint', content_rowid='id', tokenize='porter unicode61'
+    )
+"""
+SQLITE_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS api_complaint_fts_ai AFTER INSERT ON api_complaint BEGIN
+        INSERT INTO api_complaint_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS api_complaint_fts_ad AFTER DELETE ON api_complaint BEGIN
+        INSERT INTO api_complaint_fts(api_complaint_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS api_complaint_fts_au AFTER UPDATE OF title, description ON api_complaint BEGIN
+        INSERT INTO api_complaint_fts(api_complaint_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO api_complaint_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+SQLITE_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS api_complaint_fts_ai",
+    "DROP TRIGGER IF EXISTS api_complaint_fts_ad",
+    "DROP TRIGGER IF EXISTS api_complaint_fts_au",
+    "DROP TABLE IF EXISTS api_complaint_fts",
+]
+
+
+def install(conn):
+    """Creates the search structures for this backend (idempotent)."""
+    with conn.cursor() as cursor:
+        if conn.vendor == "postgresql":
+            for sql in POSTGRES_INSTALL:
+                cursor.execute(sql)
+        elif conn.vendor == "sqlite":
+            # SQLite table rebuilds in later migrations drop triggers; recreate
+            # them and reindex only if something was missing.
+            cursor.execute(
+                "SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'api_complaint_fts_%'"
+            )
+            complete = cursor.fetchone()[0] == len(SQLITE_TRIGGERS)
+            cursor.execute(SQLITE_TABLE)
+            for sql in SQLITE_TRIGGERS:
+                cursor.execute(sql)
+            if not complete:
+                cursor.execute("INSERT INTO api_complaint_fts(api_complaint_fts) VALUES ('rebuild')")
+
+
+def uninstall(conn):
+    statements = {"postgresql": POSTGRES_UNINSTALL, "sqlite": SQLITE_UNINSTALL}.get(conn.vendor, [])
+    with conn.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def _fts5_query(q):
+    # Quote every term: user input is never interpreted as FTS5 syntax
+    terms = [t.replace('"', '""') for t in q.split()]
+    return " ".join(f'"{t}"' for t in terms)
+
+
+def _render(fragment):
+    return html.escape(fragment or "").replace(_START, "<mark>").replace(_STOP, "</mark>")
+
+
+def _search_postgresql(connection, q, limit, offset):
+    # Rank/paginate in the inner query; ts_headline only runs on the page rows
+    sql = f"""
+        SELECT c.id, page.rank,
+               ts_headline('english', c.title, query, 'StartSel={_START}, StopSel={_STOP}, HighlightAll=true'),
+               ts_headline('english', c.description, query,
+                           'StartSel={_START}, StopSel={_STOP}, MaxFragments=2, MaxWords=30, MinWords=10')
+        FROM (
+            SELECT id, ts_rank_cd(search_vector, query) AS rank
+            FROM api_complaint, websearch_to_tsquery('english', %s) AS query
+            WHERE search_vector @@ query
+            ORDER BY rank DESC, id DESC
+            LIMIT %s OFFSET %s
+        ) AS page
+        JOIN api_complaint c ON c.id = page.id, websearch_to_tsquery('english', %s) AS query
+        ORDER BY page.rank DESC, c.id DESC
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [q, limit, offset, q])
+        return cursor.fetchall()
+
+
+def _search_sqlite(connection, q, limit, offset):
+    sql = f"""
+        SELECT rowid, -bm25(api_complaint_fts, 10.0, 1.0) AS rank,
+               highlight(api_complaint_fts, 0, '{_START}', '{_STOP}'),
+               snippet(api_complaint_fts, 1, '{_START}', '{_STOP}', '…', 24)
+        FROM api_complaint_fts
+        WHERE api_complaint_fts MATCH %s
+        ORDER BY bm25(api_complaint_fts, 10.0, 1.0), rowid DESC
+        LIMIT %s OFFSET %s
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [_fts5_query(q), limit, offset])
+        return cursor.fetchall()
+
+
+def _search_fallback(connection, q, limit, offset):
+    # Unindexed substring match for other backends
+    from django.db.models import Q
+
+    rows = (
+        Complaint.objects.using(connection.alias).filter(Q(title__icontains=q) | Q(description__icontains=q))
+        .order_by('-created_at', '-id')
+        .values_list('id', 'title', 'description')[offset:offset + limit]
+    )
+    return [(pk, None, title, description[:200]) for pk, title, description in rows]
+
+
+def page_from(params) -> int:
+    """1-based page number, capped so OFFSET scans stay bounded."""
+    try:
+        page = int(params.get("page", 1))
+    except (TypeError, ValueError):
+        page = 1
+    return max(1, min(page, settings.COMPLAINTS_SEARCH_MAX_PAGE))
+
+
+def search_complaints(q, page=1, page_size=20):
+    """
+    Returns (results, has_more). Each result holds the complaint summary,
+    its rank and HTML-safe title/description snippets with <mark> tags.
+    """
+    q = (q or "").strip()
+    if not q:
+        return [], False
+    offset = (page - 1) * page_size
+    # Raw SQL bypasses the router; ask it which database (replica or primary) to read
+    connection = connections[router.db_for_read(Complaint)]
+    search = {"postgresql": _search_postgresql, "sqlite": _search_sqlite}.get(connection.vendor, _search_fallback)
+    rows = search(connection, q, page_size + 1, offset)
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    # Only what the result card needs; the full record is one detail GET away
+    complaints = Complaint.objects.using(connection.alias).only(
+        'id', 'title', 'status', 'priority', 'category', 'created_at'
+    ).in_bulk([row[0] for row in rows])
+    results = []
+    for pk, rank, title_hl, snippet in rows:
+        complaint = complaints.get(pk)
+        if complaint is None:
+            continue
+        results.append({
+            "id": pk,
+            "title": complaint.title,
+            "status": complaint.status,
+            "priority": complaint.priority,
+            "category": complaint.category,
+            "created_at": complaint.created_at,
+            "rank": round(rank, 6) if rank is not None else None,
+            "title_highlight": _render(title_hl),
+            "snippet": _render(snippet),
+        })
+    return results, has_more
@@ -0,0 +1,287 @@
+import contextlib
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import timedelta
+
+from django.apps import apps
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from . import rollups
+from .ai_engine import PRIORITY_LABELS, RESOLUTION_ETA, SCORE_BASE, SCORE_SPREAD
+from .models import ChangeCounter, Complaint, ComplaintHistory, ResolutionEntry, User
+
+# ==========================================
+# SYNTHETIC DATA (manage.py seed / manage.py reset)
+# Users, complaints, status/priority history and resolution entries with
+# skewed, age-dependent distributions, for scaling tests. Ids are assigned
+# up front in fixed-size chunks, so chunks are independent: they run in
+# parallel worker processes and produce the same rows whatever the worker
+# count. Rows go in with PostgreSQL COPY under psycopg 3, bulk_create
+# elsewhere. Derived tables (rollups) are rebuilt once at the end; seeded
+# rows are not in the change feed.
+# ==========================================
+
+SEED_PASSWORD = "seed-password"
+DEFAULT_CHUNK_SIZE = 5000
+
+FIRST_NAMES = (
+    "Aarav Amelia Ana Ben Chen Chloe Daniel Diego Elena Emma Fatima Grace Hana Ivan James Jin Leila "
+    "Liam Lucas Maria Mateo Mia Noah Olivia Omar Priya Rahul Sara Sofia Tom Yuki Zoe"
+).split()
+LAST_NAMES = (
+    "Ahmed Brown Costa Dubois Garcia Gupta Hansen Ito Jones Kim Kowalski Lee Martin Mehta Miller Nguyen "
+    "Novak Okafor Patel Rossi Santos Schmidt Silva Smith Tanaka Wang Williams Yilmaz"
+).split()
+
+# Most traffic comes from a minority of customers; most complaints are routine
+CATEGORY_WEIGHTS = {"General": 30, "Technical": 30, "Billing": 20, "Account": 15, "Feature Request": 5}
+PRIORITY_WEIGHTS = (35, 45, 20)  # Low / Medium / High, as PRIORITY_LABELS
+PRIORITY_CHANGE_RATE = 0.08  # complaints whose priority an agent corrected
+# (max age in days, status weights Pending / In Progress / Resolved): older complaints are mostly resolved
+STATUS_BY_AGE = ((1, (70, 25, 5)), (7, (30, 40, 30)), (None, (5, 15, 80)))
+STATUSES = ("Pending", "In Progress", "Resolved")
+
+
+def role_for(index):
+    """Deterministic role mix by user index: 1% admins, 5% agents, the rest customers."""
+    if index % 100 == 0:
+        return "admin"
+    if index % 20 == 1:
+        return "agent"
+    return "customer"
+
+
+def chunks(first_id, count, chunk_size):
+    return [(start, min(start + chunk_size, first_id + count)) for start in range(first_id, first_id + count, chunk_size)]
+
+
+def use_copy(method="auto"):
+    # COPY needs psycopg 3's cursor.copy(); psycopg2 falls back to bulk_create
+    available = connection.vendor == "postgresql" and connection.Database.__name__ == "psycopg"
+    if method == "copy" and not available:
+        raise ValueError("COPY needs PostgreSQL with psycopg 3")
+    return available if method == "auto" else method == "copy"
+
+
+@contextlib.contextmanager
+def _explicit_timestamps(*models):
+    """bulk_create would stamp auto_now/auto_now_add fields with the current time."""
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def _copy(model, objs):
+    with_pk = objs[0].pk is not None
+    fields = [f for f in model._meta.concrete_fields if with_pk or not f.primary_key]
+    quote = connection.ops.quote_name
+    sql = f"COPY {quote(model._meta.db_table)} ({', '.join(quote(f.column) for f in fields)}) FROM STDIN"
+    with connection.cursor() as cursor, cursor.cursor.copy(sql) as copy:
+        for obj in objs:
+            copy.write_row([f.get_db_prep_save(getattr(obj, f.attname), connection) for f in fields])
+
+
+def _insert(model, objs, copy):
+    if not objs:
+        return
+    if copy:
+        _copy(model, objs)
+    else:
+        model.objects.bulk_create(objs, batch_size=1000)
+
+
+# ---- chunk builders (run in worker processes) ----
+
+def _users(start, stop, task):
+    rng = random.Random(f"{task['seed']}-users-{start}")
+    now = task["now"]
+    users = []
+    for pk in range(start, stop):
+        role = role_for(pk - task["user_base"])
+        email = f"seed{pk}@example.com"
+        users.append(User(
+            id=pk,
+            username=email,
+            email=email,
+            password=task["password_hash"],
+            full_name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            role=role,
+            is_staff=role == "admin",
+            date_joined=now - timedelta(days=task["days"] + rng.uniform(0, 30)),
+        ))
+    return {User: users}
+
+
+def _status_for(rng, age_days):
+    for max_age, weights in STATUS_BY_AGE:
+        if max_age is None or age_days < max_age:
+            return rng.choices(STATUSES, weights)[0]
+
+
+def _complaints(start, stop, task):
+    from benchmarks.synthetic import ComplaintGenerator
+
+    rng = random.Random(f"{task['seed']}-complaints-{start}")
+    text = ComplaintGenerator(seed=f"{task['seed']}-text-{start}")
+    now, days, users, agents = task["now"], task["days"], task["users"], task["agents"]
+    categories, category_weights = list(CATEGORY_WEIGHTS), list(CATEGORY_WEIGHTS.values())
+    complaints, history, entries = [], [], []
+
+    for pk in range(start, stop):
+        # Skewed towards low user indexes: a few customers file many complaints
+        owner = task["user_base"] + int(users * rng.random() ** 2)
+        # Exponential age: most complaints are recent, a long tail goes back `days`
+        age = min(rng.expovariate(4 / days), days)
+        created = now - timedelta(days=age)
+        label = rng.choices(range(len(PRIORITY_LABELS)), PRIORITY_WEIGHTS)[0]
+        status = _status_for(rng, age)
+        description = text.description()
+        complaint = Complaint(
+            id=pk,
+            user_id=owner,
+            title=" ".join(description.split()[:6]).capitalize(),
+            description=description,
+            category=rng.choices(categories, category_weights)[0],
+            status=status,
+            priority=PRIORITY_LABELS[label],
+            ai_severity_score=min(SCORE_BASE[label] + rng.randint(0, SCORE_SPREAD[label]), 10),
+            ai_predicted_resolution_time=RESOLUTION_ETA[label],
+            created_at=created,
+            updated_at=created,
+        )
+        complaints.append(complaint)
+
+        def event(action, previous=None, new=None, when=None):
+            at = when or created + (now - created) * rng.random()
+            history.append(ComplaintHistory(
+                complaint_id=pk, action=action, previous_value=previous, new_value=new,
+                changed_by_id=rng.choice(agents) if agents else None, timestamp=at,
+            ))
+            complaint.updated_at = max(complaint.updated_at, at)
+            return at
+
+        if rng.random() < PRIORITY_CHANGE_RATE:
+            original = PRIORITY_LABELS[max(label - 1, 0)] if label else PRIORITY_LABELS[1]
+            event("PRIORITY_CHANGE", original, complaint.priority)
+        if status != "Pending":
+            started = event("STATUS_CHANGE", "Pending", "In Progress",
+                            when=created + (now - created) * rng.random() * 0.3)
+            if status == "Resolved":
+                resolved = event("STATUS_CHANGE", "In Progress", "Resolved",
+                                 when=started + (now - started) * rng.random())
+                entries.append(ResolutionEntry(
+                    complaint_id=pk, text=f"Resolved: {text.description()}",
+                    author_id=history[-1].changed_by_id, created_at=resolved,
+                ))
+                event("RESOLUTION_ADDED", None, "Resolution Provided", when=resolved)
+
+    return {Complaint: complaints, ComplaintHistory: history, ResolutionEntry: entries}
+
+
+BUILDERS = {"users": _users, "complaints": _complaints}
+
+
+def run_chunk(kind, start, stop, task):
+    """Builds and inserts one chunk in one transaction; returns rows per model."""
+    rows = BUILDERS[kind](start, stop, task)
+    with _explicit_timestamps(*rows), transaction.atomic():
+        for model, objs in rows.items():
+            _insert(model, objs, task["copy"])
+    return {model.__name__: len(objs) for model, objs in rows.items()}
+
+
+def _run_all(kind, ranges, task, workers, log):
+    totals = {}
+    step = max(len(ranges) // 10, 1)
+
+    def add(done, counts):
+        for name, n in counts.items():
+            totals[name] = totals.get(name, 0) + n
+        if done % step == 0 or done == len(ranges):
+            log(f"  ... {kind}: {done}/{len(ranges)} chunks")
+
+    if workers <= 1:
+        for done, (start, stop) in enumerate(ranges, start=1):
+            add(done, run_chunk(kind, start, stop, task))
+        return totals
+
+    # Forked workers inherit the configured Django; each must open its own connection
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork")) as pool:
+        futures = [pool.submit(run_chunk, kind, start, stop, task) for start, stop in ranges]
+        for done, future in enumerate(as_completed(futures), start=1):
+            add(done, future.result())
+    return totals
+
+
+def seed(users, complaints, days=365, workers=1, chunk_size=DEFAULT_CHUNK_SIZE, method="auto", seed=0, log=print):
+    """Appends `users` users and `complaints` complaints (plus history); returns row counts per model."""
+    if users < 1 and complaints:
+        raise ValueError("Complaints need at least one user")
+    copy = use_copy(method)
+    user_base = (User.objects.aggregate(m=Max("id"))["m"] or 0) + 1
+    complaint_base = (Complaint.objects.aggregate(m=Max("id"))["m"] or 0) + 1
+    task = {
+        "seed": seed,
+        "now": timezone.now(),
+        "days": days,
+        "copy": copy,
+        "user_base": user_base,
+        "users": users,
+        "agents": [user_base + i for i in range(users) if role_for(i) == "agent"],
+        # One hash for every seeded account: hashing millions of passwords would dominate
+        "password_hash": make_password(SEED_PASSWORD),
+    }
+    started = time.perf_counter()
+    log(f"Seeding {users:,} users and {complaints:,} complaints with {'COPY' if copy else 'bulk_create'}, "
+        f"{workers} worker(s)")
+    totals = _run_all("users", chunks(user_base, users, chunk_size), task, workers, log)
+    totals.update(_run_all("complaints", chunks(complaint_base, complaints, chunk_size), task, workers, log))
+
+    # Explicit ids leave the sequences behind
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), [User, Complaint]):
+            cursor.execute(sql)
+        if connection.vendor == "postgresql":
+            cursor.execute("ANALYZE")
+    rollups.rebuild()
+    log(f"Seeded in {time.perf_counter() - started:.1f}s")
+    return totals
+
+
+def reset(log=print):
+    """
+    Empties the app's tables (and sessions) with the backend's fastest flush:
+    TRUNCATE on PostgreSQL. The change counter is kept so sequence numbers
+    never go backwards for dashboards that hold a cursor.
+    """
+    keep = {ChangeCounter._meta.db_table}
+    tables = [
+        model._meta.db_table
+        for model in apps.get_app_config("api").get_models(include_auto_created=True)
+        if model._meta.db_table not in keep
+    ]
+    existing = set(connection.introspection.table_names())
+    tables += [t for t in ("django_session", "django_admin_log") if t in existing]
+    started = time.perf_counter()
+    statements = connection.ops.sql_flush(no_style(), tables, reset_sequences=True, allow_cascade=True)
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+    log(f"Emptied {len(tables)} tables in {time.perf_counter() - started:.1f}s")
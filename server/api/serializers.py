@@ -1,5 +1,6 @@
 from rest_framework import serializers
-from .models import User, Complaint, ComplaintHistory
+from .models import User, Complaint, ComplaintHistory, IncidentCluster, ResolutionEntry
+from .resolutions import combined_resolution
 
 class UserSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
@@ -31,9 +32,22 @@ class ComplaintHistorySerializer(serializers.ModelSerializer):
         model = ComplaintHistory
         fields = '__all__'
 
+class ResolutionEntrySerializer(serializers.ModelSerializer):
+    author_name = serializers.CharField(source='author.full_name', read_only=True)
+
+    class Meta:
+        model = ResolutionEntry
+        fields = ('id', 'text', 'author', 'author_name', 'created_at')
+
 class ComplaintSerializer(serializers.ModelSerializer):
     user_name = serializers.CharField(source='user.full_name', read_only=True)
     history = ComplaintHistorySerializer(many=True, read_only=True)
+    # Combined view of the resolution entries, same format as the old text field
+    resolution = serializers.SerializerMethodField()
+
+    def get_resolution(self, obj):
+        entries = sorted(obj.resolution_entries.all(), key=lambda e: (e.created_at, e.id))
+        return combined_resolution(entries)
 
     class Meta:
         model = Complaint
@@ -46,6 +60,14 @@ class ComplaintCreateSerializer(serializers.ModelSerializer):
         fields = ('user', 'title', 'category', 'description')
 
 class ComplaintUpdateSerializer(serializers.ModelSerializer):
+    # Appended as a ResolutionEntry by the view, never written to the complaint row
+    resolution = serializers.CharField(write_only=True, required=False, allow_blank=True)
+
     class Meta:
         model = Complaint
-        fields = ('status', 'title', 'description', 'resolution')
+        fields = ('status', 'priority', 'title', 'description', 'resolution')
+
+class IncidentClusterSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = IncidentCluster
+        exclude = ('signature',)
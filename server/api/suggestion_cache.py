@@ -0,0 +1,154 @@
+import hashlib
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .models import SuggestionCache
+
+
+def normalize_description(description: str) -> str:
+    return " ".join((description or "").lower().split())
+
+
+def description_key(description: str) -> str:
+    return hashlib.sha256(normalize_description(description).encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    """Thread-safe in-process LRU with a per-entry TTL."""
+
+    def __init__(self, maxsize=1024, ttl=900):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class SuggestionStore:
+    """
+    Two-tier cache for AI resolution suggestions, keyed by a hash of the
+    normalized complaint description:
+      1. per-process LRU (fast, lost on restart, not shared across workers)
+      2. SuggestionCache table (shared, persistent)
+    Only on a miss in both tiers is the remote chatbot called.
+    """
+
+    def __init__(self, maxsize=None, ttl=None):
+        self.memory = LRUCache(
+            maxsize=maxsize or settings.SUGGESTION_CACHE_SIZE,
+            ttl=ttl or settings.SUGGESTION_CACHE_TTL,
+        )
+        self._counters = Counter()
+        self._lock = threading.Lock()
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def lookup(self, description):
+        """Returns the cached suggestion or None, without calling the remote service."""
+        key = description_key(description)
+        suggestion = self.memory.get(key)
+        if suggestion is not None:
+            self._count("memory_hits")
+            return suggestion
+
+        row = SuggestionCache.objects.filter(description_hash=key).only("suggestion").first()
+        if row is None:
+            return None
+
+        self._count("db_hits")
+        SuggestionCache.objects.filter(pk=row.pk).update(hit_count=F("hit_count") + 1, last_hit_at=timezone.now())
+        self.memory.set(key, row.suggestion)
+        return row.suggestion
+
+    def store(self, description, suggestion):
+        key = description_key(description)
+        try:
+            SuggestionCache.objects.update_or_create(description_hash=key, defaults={"suggestion": suggestion})
+        except IntegrityError:
+            # Another worker stored the same description concurrently
+            pass
+        self.memory.set(key, suggestion)
+
+    def get_or_compute(self, description, compute, is_cacheable=lambda value: True):
+        suggestion = self.lookup(description)
+        if suggestion is not None:
+            return suggestion
+
+        self._count("misses")
+        suggestion = compute(description)
+        if is_cacheable(suggestion):
+            self.store(description, suggestion)
+        return suggestion
+
+    async def aget_or_compute(self, description, compute, is_cacheable=lambda value: True):
+        """get_or_compute for a coroutine `compute`; only the cache reads/writes use a thread."""
+        suggestion = await sync_to_async(self.lookup)(description)
+        if suggestion is not None:
+            return suggestion
+
+        self._count("misses")
+        suggestion = await compute(description)
+        if is_cacheable(suggestion):
+            await sync_to_async(self.store)(description, suggestion)
+        return suggestion
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+        memory_hits = counters.get("memory_hits", 0)
+        db_hits = counters.get("db_hits", 0)
+        misses = counters.get("misses", 0)
+        lookups = memory_hits + db_hits + misses
+        return {
+            # Per-process counters (this worker since start-up)
+            "memory_hits": memory_hits,
+            "db_hits": db_hits,
+            "misses": misses,
+            "hit_rate": round((memory_hits + db_hits) / lookups, 4) if lookups else None,
+            "remote_calls_saved": memory_hits + db_hits,
+            "memory_entries": len(self.memory),
+            # Shared across all workers
+            "db_entries": SuggestionCache.objects.count(),
+            "db_total_hits": SuggestionCache.objects.aggregate(total=Sum("hit_count"))["total"] or 0,
+        }
+
+
+suggestion_store = SuggestionStore()
@@ -0,0 +1,159 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import SuggestionJob
+
+# ==========================================
+# LOCAL DB-BACKED TASK QUEUE
+# Jobs live in the SuggestionJob table. A worker claims a job with a
+# conditional UPDATE (portable across PostgreSQL and SQLite) that also sets
+# a visibility timeout; if the worker dies, the lock expires and another
+# worker re-runs the job.
+# ==========================================
+
+WORKER_MAX_BACKOFF = 30.0  # seconds a worker thread waits after repeated errors
+
+
+def enqueue_suggestion(complaint):
+    return SuggestionJob.objects.create(
+        complaint=complaint,
+        max_attempts=settings.SUGGESTION_JOB_MAX_ATTEMPTS,
+    )
+
+
+def _claimable(now):
+    return Q(status='pending', run_after__lte=now) | Q(status='running', locked_until__lt=now)
+
+
+def claim_job(visibility_timeout=None):
+    """Atomically claims the next runnable job, or returns None."""
+    visibility_timeout = visibility_timeout or settings.SUGGESTION_JOB_VISIBILITY_TIMEOUT
+    now = timezone.now()
+    candidates = (
+        SuggestionJob.objects.filter(_claimable(now))
+        .order_by('run_after', 'id')
+        .values_list('id', 'attempts', 'max_attempts')[:10]
+    )
+    for job_id, attempts, max_attempts in candidates:
+        if attempts >= max_attempts:
+            # Crashed on its last attempt: give up instead of retrying forever
+            SuggestionJob.objects.filter(_claimable(now), pk=job_id).update(
+                status='failed', locked_until=None, last_error='Visibility timeout expired on final attempt'
+            )
+            continue
+        claimed = SuggestionJob.objects.filter(_claimable(now), pk=job_id).update(
+            status='running',
+            attempts=F('attempts') + 1,
+            locked_until=now + timedelta(seconds=visibility_timeout),
+        )
+        if claimed:
+            return SuggestionJob.objects.select_related('complaint').get(pk=job_id)
+    return None
+
+
+def backoff_delay(attempts):
+    delay = settings.SUGGESTION_JOB_BACKOFF_BASE * (2 ** max(attempts - 1, 0))
+    delay = min(delay, settings.SUGGESTION_JOB_BACKOFF_MAX)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def run_job(job, compute=None):
+    """
+    Computes and caches the suggestion for a claimed job. Failures are
+    rescheduled with exponential backoff until max_attempts is reached.
+    The outcome is only written while this claim still holds: `attempts`
+    grows with every claim, so a job reclaimed after its visibility timeout
+    is left to the worker that holds it now.
+    """
+    from .ai_engine import get_chatbot
+    from .incidents import share_suggestion
+    from .suggestion_cache import suggestion_store
+
+    compute = compute or get_chatbot().suggest
+    claim = SuggestionJob.objects.filter(pk=job.pk, status='running', attempts=job.attempts)
+    try:
+        description = job.complaint.description
+        suggestion = suggestion_store.lookup(description)
+        if suggestion is None:
+            suggestion = compute(description)
+            suggestion_store.store(description, suggestion)
+        share_suggestion(job.complaint, suggestion)
+    except Exception as e:
+        if job.attempts >= job.max_attempts:
+            updates = {'status': 'failed'}
+        else:
+            updates = {
+                'status': 'pending',
+                'run_after': timezone.now() + timedelta(seconds=backoff_delay(job.attempts)),
+            }
+        claim.update(locked_until=None, last_error=str(e) or e.__class__.__name__, **updates)
+        return False
+
+    claim.update(status='done', locked_until=None, last_error=None)
+    return True
+
+
+def job_status(complaint):
+    """
+    Status of the latest suggestion job for a complaint, or None. Members of
+    an incident share the job queued for the complaint that opened it.
+    """
+    scope = Q(complaint=complaint)
+    if complaint.incident_id:
+        scope |= Q(complaint__incident_id=complaint.incident_id)
+    return (
+        SuggestionJob.objects.filter(scope)
+        .order_by('-created_at', '-id')
+        .values_list('status', flat=True)
+        .first()
+    )
+
+
+def run_worker(concurrency=4, poll_interval=1.0, drain=False, stop_event=None, log=print, compute=None):
+    """
+    Runs `concurrency` worker threads that claim and execute jobs until
+    stop_event is set (or, with drain=True, until the queue is empty).
+    """
+    stop_event = stop_event or threading.Event()
+    processed = {'done': 0, 'failed': 0}
+    lock = threading.Lock()
+
+    def loop():
+        errors = 0
+        try:
+            while not stop_event.is_set():
+                close_old_connections()
+                try:
+                    job = claim_job()
+                    if job is None:
+                        if drain:
+                            return
+                        stop_event.wait(poll_interval)
+                        continue
+                    ok = run_job(job, compute=compute)
+                except Exception as e:
+                    # e.g. the database went away: keep the thread alive and retry
+                    errors += 1
+                    log(f"⚠️ Suggestion worker error: {e!r}")
+                    close_old_connections()
+                    stop_event.wait(min(poll_interval * 2 ** min(errors, 6), WORKER_MAX_BACKOFF))
+                    continue
+                errors = 0
+                with lock:
+                    processed['done' if ok else 'failed'] += 1
+                log(f"{'✅' if ok else '⚠️'} Suggestion job {job.id} (complaint {job.complaint_id}) attempt {job.attempts}")
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='suggestion-worker') as pool:
+        for _ in range(concurrency):
+            pool.submit(loop)
+    return processed
@@ -1,3 +1,1411 @@
-from django.test import TestCase
+import asyncio
+import csv
+import gzip
+import io
+import json
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.management import call_command
+from django.db import OperationalError, connection, connections, transaction
+from django.test import AsyncClient, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.test import APIClient, APIRequestFactory
+
+from . import db_metrics, model_store, online_model
+from .resolutions import SEPARATOR, split_resolution
+from .retraining import retrain
+from .chatbot_client import AsyncGradioClient, ChatbotError, ChatbotTimeout, CircuitBreaker, CircuitOpenError
+from .fake_gradio import FakeGradioServer
+from .db_router import PRIMARY_PIN_COOKIE, replicas
+from .events import EventBroker, get_broker
+from .authentication import BearerTokenAuthentication, TokenUser
+from .tokens import InvalidToken, access_token, verify_access
+from .ai_engine import CHATBOT_ERROR_MESSAGE, CHATBOT_UNAVAILABLE_MESSAGE, KeywordSeverityModel, SeverityAI, SupportChatbot
+from .incidents import incident_index, minhash, similarity
+from .models import ChangeCounter, ChangeLogEntry, Complaint, ComplaintHistory, IncidentCluster, ResolutionEntry, SuggestionCache, SuggestionJob, User
+from .suggestion_cache import description_key, suggestion_store
+from .tasks import claim_job, enqueue_suggestion, run_job, run_worker
+from .keyword_matcher import AhoCorasickMatcher
+
+
+class SeverityBatchTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.engine = SeverityAI()
+
+    def test_predict_batch_matches_single_predictions(self):
+        texts = [
+            "The app crashes every time I open settings",
+            "Loading is a bit slow today",
+            "Suggestion: add dark mode",
+            "I was double charged this month",
+        ]
+        batch = self.engine.predict_batch(texts)
+        self.assertEqual(batch, [self.engine.predict(text) for text in texts])
+
+    def test_keyword_override_raises_priority(self):
+        score, priority, est_time = self.engine.predict("Where is the office? Also there was an outage")
+        self.assertEqual(priority, "High")
+        self.assertEqual(est_time, "2-4 hours")
+        self.assertGreaterEqual(score, 8)
+
+    def test_predict_batch_empty(self):
+        self.assertEqual(self.engine.predict_batch([]), [])
+
+
+class KeywordMatcherTests(SimpleTestCase):
+    def test_finds_overlapping_patterns_in_one_pass(self):
+        matcher = AhoCorasickMatcher({"he": 1, "she": 2, "hers": 3})
+        terms = [(m.term, m.start) for m in matcher.find_all("ushers")]
+        self.assertEqual(terms, [("she", 1), ("he", 2), ("hers", 2)])
+
+    def test_word_boundary(self):
+        matcher = AhoCorasickMatcher({"error": 1, "data loss": 2})
+        text = "Terrors aside, an error caused DATA  loss"
+        self.assertEqual(len(matcher.find_all(text)), 3)
+        self.assertEqual(
+            [m.term for m in matcher.find_all(text, word_boundary=True)],
+            ["error", "data loss"],
+        )
+
+    def test_keyword_model_reports_matched_terms(self):
+        model = KeywordSeverityModel({2: ["outage"], 1: ["slow", "error"]})
+        self.assertEqual(model.predict("Dashboard is slow after the outage"), 2)
+        self.assertEqual(KeywordSeverityModel({1: ["error"]}, word_boundary=True).predict("No terrors here"), 0)
+        self.assertEqual(
+            model.matched_terms("slow page, error, then an outage"),
+            {1: ["slow", "error"], 2: ["outage"]},
+        )
+
+    def test_default_keywords_match_inside_words(self):
+        model = KeywordSeverityModel()
+        self.assertEqual(model.predict("The app keeps crashing"), 2)
+        self.assertEqual(model.predict("Scrolling is lagging"), 1)
+
+    def test_automaton_rebuilt_only_when_keywords_change(self):
+        model = KeywordSeverityModel({2: ["outage"]})
+        matcher = model._matcher
+        model.keyword_map = {2: ["Outage"]}
+        self.assertIs(model._matcher, matcher)
+        model.keyword_map = {2: ["outage", "breach"]}
+        self.assertIsNot(model._matcher, matcher)
+        self.assertEqual(model.predict("security breach"), 2)
+
+
+class ModelArtifactTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = mock.patch.object(model_store, "ARTIFACT_DIR", Path(tmp.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_artifact_written_then_loaded_without_training(self):
+        data = [("server is down", 2), ("slow page", 1), ("add dark mode", 0)]
+        first = SeverityAI(training_data=data)
+        self.assertTrue(model_store.artifact_path(model_store.artifact_key(data)).exists())
+
+        with mock.patch.object(SeverityAI, "_train") as train:
+            second = SeverityAI(training_data=data)
+        train.assert_not_called()
+        self.assertEqual(second.predict_batch(["server is down"]), first.predict_batch(["server is down"]))
+
+    def test_key_changes_with_training_data(self):
+        self.assertNotEqual(
+            model_store.artifact_key([("a", 0)]),
+            model_store.artifact_key([("a", 1)]),
+        )
+
+
+class LazyInitTests(SimpleTestCase):
+    def test_importing_views_does_not_load_ai_stack(self):
+        code = (
+            "import os, sys, django; "
+            "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'supportflow.settings'); "
+            "django.setup(); import api.views; "
+            "print(sorted(m for m in ('sklearn', 'numpy', 'httpx') if m in sys.modules))"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", code], cwd=settings.BASE_DIR, capture_output=True, text=True, check=True
+        ).stdout
+        self.assertEqual(out.strip().splitlines()[-1], "[]")
+
+
+class SuggestionCacheTests(TestCase):
+    def setUp(self):
+        suggestion_store.memory.clear()
+        self.addCleanup(suggestion_store.memory.clear)
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="c@example.com", email="c@example.com", password="pw", full_name="Cust"
+        )
+        self.complaint = Complaint.objects.create(
+            user=self.user, title="Login", description="I cannot  login to my account"
+        )
+        self.url = f"/api/complaints/{self.complaint.pk}/suggest_resolution/"
+
+    def test_remote_called_once_then_served_from_cache(self):
+        with mock.patch("api.views.agenerate_ai_suggestion", return_value="Reset your password") as remote:
+            first = self.client.get(self.url).json()
+            second = self.client.get(self.url).json()
+            suggestion_store.memory.clear()
+            third = self.client.get(self.url).json()
+
+        self.assertEqual(remote.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertEqual(third["suggestion"], "Reset your password")
+        row = SuggestionCache.objects.get(description_hash=description_key("i cannot login to my ACCOUNT"))
+        self.assertEqual(row.hit_count, 1)
+
+    def test_error_responses_are_not_cached(self):
+        with mock.patch("api.views.agenerate_ai_suggestion", return_value=CHATBOT_ERROR_MESSAGE) as remote:
+            self.client.get(self.url)
+            self.client.get(self.url)
+        self.assertEqual(remote.call_count, 2)
+        self.assertFalse(SuggestionCache.objects.exists())
+
+    def test_description_edit_keeps_shared_entry(self):
+        twin = Complaint.objects.create(user=self.user, title="Login", description="I cannot login to my account")
+        with mock.patch("api.views.agenerate_ai_suggestion", side_effect=["old answer", "new answer"]) as remote:
+            self.client.get(self.url)
+            self.client.patch(
+                f"/api/complaints/{self.complaint.pk}/", {"description": "Payment failed"}, format="json"
+            )
+            response = self.client.get(self.url).json()
+            shared = self.client.get(f"/api/complaints/{twin.pk}/suggest_resolution/").json()
+
+        self.assertEqual(response["suggestion"], "new answer")
+        # The other complaint with the old text is still served from the cache
+        self.assertEqual(shared["suggestion"], "old answer")
+        self.assertEqual(remote.call_count, 2)
+
+    def test_stats_endpoint(self):
+        with mock.patch("api.views.agenerate_ai_suggestion", return_value="Reset your password"):
+            self.client.get(self.url)
+            self.client.get(self.url)
+        stats = self.client.get("/api/suggestions/cache_stats/").json()
+        self.assertGreaterEqual(stats["misses"], 1)
+        self.assertGreaterEqual(stats["remote_calls_saved"], 1)
+        self.assertEqual(stats["db_entries"], 1)
+
+
+class AsyncChatbotClientTests(SimpleTestCase):
+    def setUp(self):
+        self.fake = FakeGradioServer(latency=0.2).start()
+        self.addCleanup(self.fake.stop)
+
+    def run_calls(self, client, messages):
+        async def main():
+            try:
+                return await asyncio.gather(*(client.predict(m) for m in messages), return_exceptions=True)
+            finally:
+                await client.aclose()
+        return asyncio.run(main())
+
+    def test_identical_requests_are_coalesced(self):
+        client = AsyncGradioClient(self.fake.url, timeout=5)
+        results = self.run_calls(client, ["Service is down"] * 10)
+        self.assertEqual(self.fake.calls, 1)
+        self.assertEqual(set(results), {"Suggested resolution for: Service is down"})
+
+    def test_concurrency_is_bounded(self):
+        client = AsyncGradioClient(self.fake.url, timeout=5, max_concurrency=2)
+        results = self.run_calls(client, [f"complaint {i}" for i in range(6)])
+        self.assertEqual(len(set(results)), 6)
+        self.assertLessEqual(self.fake.max_active, 2)
+
+    def test_deadline(self):
+        self.fake.latency = 1.0
+        client = AsyncGradioClient(self.fake.url, timeout=0.2)
+        [result] = self.run_calls(client, ["slow"])
+        self.assertIsInstance(result, ChatbotTimeout)
+
+    def test_circuit_opens_after_repeated_failures(self):
+        self.fake.latency = 0
+        self.fake.fail_next = 100
+        client = AsyncGradioClient(self.fake.url, timeout=5, breaker=CircuitBreaker(threshold=3, reset_timeout=60))
+
+        async def main():
+            results = []
+            for i in range(5):
+                try:
+                    results.append(await client.predict(f"m{i}"))
+                except ChatbotError as e:
+                    results.append(e)
+            await client.aclose()
+            return results
+
+        results = asyncio.run(main())
+        self.assertEqual(self.fake.calls, 3)
+        self.assertIsInstance(results[-1], CircuitOpenError)
+
+    def test_unexpected_failures_end_the_half_open_trial(self):
+        self.fake.latency = 0
+        breaker = CircuitBreaker(threshold=1, reset_timeout=0)
+        client = AsyncGradioClient(self.fake.url, timeout=5, breaker=breaker)
+        self.fake.malformed_next = 1
+        [result] = self.run_calls(client, ["malformed"])
+        self.assertIsInstance(result, ChatbotError)
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+        client = AsyncGradioClient(self.fake.url, timeout=5, breaker=breaker)
+        with mock.patch.object(client, "_request", side_effect=TypeError("bug")):
+            [result] = self.run_calls(client, ["trial"])
+        self.assertIsInstance(result, TypeError)
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+        client = AsyncGradioClient(self.fake.url, timeout=5, breaker=breaker)
+        self.assertEqual(self.run_calls(client, ["recovered"]), ["Suggested resolution for: recovered"])
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_sync_chatbot_wrapper_falls_back_to_error_messages(self):
+        self.fake.latency = 0
+        chatbot = SupportChatbot(url=self.fake.url, breaker_threshold=1, breaker_reset=60)
+        self.addCleanup(chatbot.service.close)
+        self.assertEqual(chatbot.get_response("hello"), "Suggested resolution for: hello")
+        self.fake.fail_next = 1
+        self.assertEqual(chatbot.get_response("boom"), CHATBOT_ERROR_MESSAGE)
+        self.assertEqual(chatbot.get_response("again"), CHATBOT_UNAVAILABLE_MESSAGE)
+
+
+class SuggestionJobTests(TransactionTestCase):
+    def setUp(self):
+        suggestion_store.memory.clear()
+        self.addCleanup(suggestion_store.memory.clear)
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="q@example.com", email="q@example.com", password="pw", full_name="Queue"
+        )
+
+    def create_complaint(self):
+        # Autocommit here, so the on_commit enqueue runs immediately
+        response = self.client.post(
+            "/api/complaints/",
+            {"title": "Down", "description": "Service is down completely", "user_id": self.user.id},
+            format="json",
+        )
+        return Complaint.objects.get(pk=response.json()["id"])
+
+    def test_create_enqueues_job_and_view_reports_pending_until_done(self):
+        complaint = self.create_complaint()
+        job = SuggestionJob.objects.get(complaint=complaint)
+        self.assertEqual(job.status, "pending")
+
+        url = f"/api/complaints/{complaint.pk}/suggest_resolution/"
+        with mock.patch("api.views.agenerate_ai_suggestion") as remote:
+            response = self.client.get(url)
+        remote.assert_not_called()
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json(), {"suggestion": None, "status": "pending"})
+
+        processed = run_worker(concurrency=1, drain=True, log=lambda msg: None, compute=lambda text: "Restart")
+        self.assertEqual(processed["done"], 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, "done")
+        self.assertEqual(self.client.get(url).json(), {"suggestion": "Restart", "status": "done"})
+
+    def test_failed_attempt_is_retried_with_backoff(self):
+        job = enqueue_suggestion(self.create_complaint())
+        SuggestionJob.objects.exclude(pk=job.pk).delete()
+
+        claimed = claim_job()
+        self.assertFalse(run_job(claimed, compute=mock.Mock(side_effect=ChatbotError("boom"))))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.last_error), ("pending", 1, "boom"))
+        self.assertGreater(job.run_after, timezone.now())
+        self.assertIsNone(claim_job())
+
+        SuggestionJob.objects.filter(pk=job.pk).update(attempts=job.max_attempts - 1, run_after=timezone.now())
+        self.assertFalse(run_job(claim_job(), compute=mock.Mock(side_effect=ChatbotError("boom"))))
+        job.refresh_from_db()
+        self.assertEqual(job.status, "failed")
+
+    def test_expired_visibility_timeout_is_reclaimed(self):
+        complaint = self.create_complaint()
+        first = claim_job(visibility_timeout=60)
+        self.assertEqual(first.complaint_id, complaint.pk)
+        self.assertIsNone(claim_job())
+
+        # Worker crashed: lock expires and the job becomes claimable again
+        SuggestionJob.objects.filter(pk=first.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        second = claim_job()
+        self.assertEqual(second.pk, first.pk)
+        self.assertEqual(second.attempts, 2)
+
+        # The first worker finishing late must not overwrite the new claim
+        self.assertTrue(run_job(first, compute=lambda text: "Late"))
+        second.refresh_from_db()
+        self.assertEqual(second.status, "running")
+        self.assertTrue(run_job(second, compute=lambda text: "Restart"))
+        second.refresh_from_db()
+        self.assertEqual(second.status, "done")
+
+    def test_worker_survives_database_errors(self):
+        self.create_complaint()
+        messages = []
+        outage = iter([OperationalError("gone")])
+
+        def flaky_claim():
+            error = next(outage, None)
+            if error:
+                raise error
+            return claim_job()
+
+        with mock.patch("api.tasks.claim_job", side_effect=flaky_claim):
+            processed = run_worker(concurrency=1, poll_interval=0.01, drain=True, log=messages.append,
+                                   compute=lambda text: "Restart")
+        self.assertEqual(processed["done"], 1)
+        self.assertIn("gone", messages[0])
+
+
+class IncidentClusteringTests(TestCase):
+    def setUp(self):
+        incident_index.clear()
+        suggestion_store.memory.clear()
+        self.addCleanup(incident_index.clear)
+        self.addCleanup(suggestion_store.memory.clear)
+        self.client = APIClient()
+
+    def post(self, description):
+        return self.client.post(
+            "/api/complaints/", {"title": "Help", "description": description}, format="json"
+        ).json()
+
+    def test_minhash_similarity(self):
+        a = minhash("The service is down and I cannot access my dashboard")
+        b = minhash("The service is down, I cannot access my dashboard!")
+        c = minhash("How do I change my profile picture?")
+        self.assertGreater(similarity(a, b), 0.6)
+        self.assertLess(similarity(a, c), 0.3)
+
+    def test_flood_is_classified_once_and_shares_a_cluster(self):
+        from .ai_engine import get_severity_ai
+
+        engine = get_severity_ai()
+        with mock.patch.object(engine, "predict", wraps=engine.predict) as predict:
+            first = self.post("The service is down and I cannot access my dashboard")
+            for _ in range(4):
+                self.post("The service is down, I cannot access my dashboard!")
+            other = self.post("How do I change my profile picture?")
+
+        self.assertEqual(predict.call_count, 2)
+        cluster = IncidentCluster.objects.get(pk=first["incident"])
+        self.assertEqual(cluster.member_count, 5)
+        self.assertEqual(cluster.complaints.count(), 5)
+        self.assertNotEqual(other["incident"], cluster.pk)
+        self.assertEqual(set(Complaint.objects.filter(incident=cluster).values_list("priority", flat=True)), {cluster.priority})
+
+        listing = self.client.get("/api/incidents/").json()
+        self.assertEqual([row["member_count"] for row in listing["results"]], [5])
+        self.assertIsNone(listing["next_cursor"])
+        listing = self.client.get("/api/incidents/", {"all": "1", "page_size": 1}).json()
+        self.assertEqual([row["id"] for row in listing["results"]], [other["incident"]])
+        rest = self.client.get("/api/incidents/", {"all": "1", "cursor": listing["next_cursor"]}).json()
+        self.assertEqual([row["id"] for row in rest["results"]], [cluster.pk])
+
+    def test_members_reuse_cluster_suggestion(self):
+        first = self.post("The service is down and I cannot access my dashboard")
+        second = self.post("The service is down, I cannot access my dashboard!")
+
+        with mock.patch("api.views.agenerate_ai_suggestion", return_value="We are on it") as remote:
+            self.client.get(f"/api/complaints/{first['id']}/suggest_resolution/")
+            response = self.client.get(f"/api/complaints/{second['id']}/suggest_resolution/").json()
+        self.assertEqual(remote.call_count, 1)
+        self.assertEqual(response["suggestion"], "We are on it")
+
+    def test_index_is_rebuilt_from_database(self):
+        first = self.post("The service is down and I cannot access my dashboard")
+        incident_index.clear()  # e.g. another worker / restart
+        second = self.post("The service is down, I cannot access my dashboard!")
+        self.assertEqual(first["incident"], second["incident"])
+
+
+class OnlineRetrainingTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = mock.patch.object(model_store, "ARTIFACT_DIR", Path(tmp.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = APIClient()
+        self.log = lambda msg: None
+
+    def test_feedback_is_folded_in_versioned_and_rolled_back(self):
+        v1 = retrain(log=self.log)
+        self.assertEqual(online_model.active_version(), v1)
+        self.assertIsNone(retrain(log=self.log))
+
+        complaint = Complaint.objects.create(title="Q", description="quantum flux capacitor overheating", priority="Low")
+        response = self.client.patch(f"/api/complaints/{complaint.pk}/", {"priority": "High"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(complaint.history.filter(action="PRIORITY_CHANGE").exists())
+
+        v2 = retrain(log=self.log)
+        self.assertEqual(online_model.version_meta(v2)["parent"], v1)
+        self.assertEqual(online_model.version_meta(v2)["new_samples"], 1)
+
+        engine = SeverityAI()
+        self.assertEqual(engine.online_version, v2)
+
+        self.assertEqual(online_model.rollback(), v1)
+        engine._maybe_reload(force=True)
+        self.assertEqual(engine.online_version, v1)
+
+    def test_only_new_priority_corrections_are_folded(self):
+        retrain(log=self.log)
+        # Resolved with the model's own priority: not a label
+        resolved = Complaint.objects.create(title="R", description="printer jammed again", priority="Low")
+        self.client.patch(f"/api/complaints/{resolved.pk}/", {"status": "Resolved"}, format="json")
+        self.assertIsNone(retrain(log=self.log))
+
+        corrected = Complaint.objects.create(title="C", description="payment gateway rejects cards", priority="Low")
+        self.client.patch(f"/api/complaints/{corrected.pk}/", {"priority": "High"}, format="json")
+        version = retrain(log=self.log)
+        self.assertEqual(online_model.version_meta(version)["new_samples"], 1)
+
+        # Later edits that do not correct the priority are not folded again
+        self.client.patch(f"/api/complaints/{corrected.pk}/", {"status": "Resolved"}, format="json")
+        self.client.patch(f"/api/complaints/{corrected.pk}/", {"resolution": "Gateway restarted"}, format="json")
+        self.assertIsNone(retrain(log=self.log))
+
+    def test_running_engine_swaps_to_new_version(self):
+        engine = SeverityAI(training_data=[("server down", 2), ("slow", 1), ("hello", 0)])
+        self.assertIsNone(engine.online_version)
+        version = retrain(log=self.log)
+        engine._maybe_reload(force=True)
+        self.assertEqual(engine.online_version, version)
+        self.assertEqual(len(engine.predict_batch(["Service is down completely"])), 1)
+
+
+class BenchmarkSuiteTests(SimpleTestCase):
+    def test_generator_is_deterministic_and_respects_length(self):
+        from benchmarks.synthetic import ComplaintGenerator
+
+        a = ComplaintGenerator(seed=7, min_words=10, max_words=12).descriptions(20)
+        b = ComplaintGenerator(seed=7, min_words=10, max_words=12).descriptions(20)
+        self.assertEqual(a, b)
+        self.assertTrue(all(10 <= len(text.split()) <= 12 for text in a))
+
+    def test_regressions_beyond_threshold_are_reported(self):
+        from benchmarks.stats import summarize
+        from benchmarks.suite import compare
+
+        stats = summarize([0.001] * 99 + [0.01])
+        self.assertEqual((stats["p50_ms"], stats["p99_ms"]), (1.0, 1.0))
+        baseline = {"classifier.short": {"p50_ms": 1.0, "p95_ms": 2.0, "throughput_per_s": 1000}}
+        ok = {"classifier.short": {"p50_ms": 1.1, "p95_ms": 2.2, "throughput_per_s": 900}}
+        slow = {"classifier.short": {"p50_ms": 1.5, "p95_ms": 2.0, "throughput_per_s": 600}}
+        self.assertEqual(compare(ok, baseline, 0.25), [])
+        self.assertEqual(len(compare(slow, baseline, 0.25)), 2)
+
+    def test_load_test_mix_and_report(self):
+        from api.loadtest import LoadTest, parse_mix
+
+        self.assertEqual(parse_mix("list=6, create=2,suggest"), {"list": 6.0, "create": 2.0, "suggest": 1.0})
+        for bad in ("list=x", "browse=1", "list=0"):
+            with self.assertRaises(ValueError):
+                parse_mix(bad)
+
+        test = LoadTest("http://testserver/", clients=2, duration=1)
+        test.latencies["GET /api/complaints/"] = [0.01] * 9
+        test.errors["GET /api/complaints/"] = 1
+        report = test.report(elapsed=2.0)
+        row = report["endpoints"]["GET /api/complaints/"]
+        self.assertEqual((row["requests"], row["error_rate"], row["p50_ms"]), (10, 0.1, 10.0))
+        self.assertEqual(list(report["endpoints"]), ["GET /api/complaints/"])
+        self.assertEqual(report["total"]["throughput_per_s"], 5.0)
+
+
+class ComplaintListingTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.users = [
+            User.objects.create_user(username=f"u{i}@example.com", email=f"u{i}@example.com", password="pw", full_name=f"User {i}")
+            for i in range(3)
+        ]
+        self.complaints = [
+            Complaint.objects.create(user=self.users[i % 3], title=f"C{i}", description=f"Complaint number {i}")
+            for i in range(7)
+        ]
+        # Same created_at for several rows: the id tie-breaker must keep pages stable
+        Complaint.objects.filter(pk__in=[c.pk for c in self.complaints[2:5]]).update(
+            created_at=self.complaints[2].created_at
+        )
+
+    def fetch_all(self, page_size, **params):
+        seen, cursor = [], None
+        while True:
+            query = dict(params, page_size=page_size, **({"cursor": cursor} if cursor else {}))
+            body = self.client.get("/api/complaints/", query).json()
+            seen.extend(row["id"] for row in body["results"])
+            cursor = body["next_cursor"]
+            if not cursor:
+                return seen
+
+    def test_pages_cover_every_row_once_newest_first(self):
+        expected = list(Complaint.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+        self.assertEqual(self.fetch_all(page_size=3), expected)
+        self.assertEqual(self.fetch_all(page_size=100), expected)
+
+    def test_user_filter_and_bad_cursor(self):
+        ids = self.fetch_all(page_size=2, user_id=self.users[0].id)
+        self.assertEqual(sorted(ids), sorted(c.pk for c in self.complaints if c.user_id == self.users[0].id))
+        self.assertEqual(self.client.get("/api/complaints/", {"cursor": "nope"}).status_code, 400)
+
+    def test_query_count_does_not_depend_on_page_contents(self):
+        with CaptureQueriesContext(connection) as empty_history:
+            self.client.get("/api/complaints/", {"page_size": 5})
+
+        for complaint in self.complaints:
+            for n in range(4):
+                ComplaintHistory.objects.create(
+                    complaint=complaint, action="STATUS_CHANGE", new_value=str(n), changed_by=self.users[n % 3]
+                )
+        with CaptureQueriesContext(connection) as full_history:
+            response = self.client.get("/api/complaints/", {"page_size": 5})
+
+        self.assertEqual(len(response.json()["results"][0]["history"]), 4)
+        self.assertEqual(len(full_history), len(empty_history))
+        # ETag validator + change cursor + complaints/users + history/authors + resolution entries
+        self.assertEqual(len(full_history), 5)
+
+
+class ComplaintFilterTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="f@example.com", email="f@example.com", password="pw", full_name="F")
+        rows = [
+            ("Pending", "High", "Billing", 9, "2025-01-05T10:00:00Z"),
+            ("Pending", "Low", "General", 2, "2025-01-10T10:00:00Z"),
+            ("Resolved", "High", "Billing", 8, "2025-02-01T10:00:00Z"),
+            ("In Progress", "Medium", "Technical", 5, "2025-02-15T10:00:00Z"),
+        ]
+        for status_value, priority, category, score, created in rows:
+            complaint = Complaint.objects.create(
+                user=self.user if category == "Billing" else None, title="t", description="d",
+                status=status_value, priority=priority, category=category, ai_severity_score=score,
+            )
+            Complaint.objects.filter(pk=complaint.pk).update(created_at=created)
+
+    def titles(self, **params):
+        response = self.client.get("/api/complaints/", params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return [(r["status"], r["priority"]) for r in response.json()["results"]]
+
+    def test_filters(self):
+        self.assertEqual(self.titles(status="Pending"), [("Pending", "Low"), ("Pending", "High")])
+        self.assertEqual(self.titles(status="Pending", priority="High"), [("Pending", "High")])
+        self.assertEqual(len(self.titles(status="Pending,Resolved")), 3)
+        self.assertEqual(len(self.titles(category="Billing")), 2)
+        self.assertEqual(len(self.titles(user_id=self.user.id)), 2)
+        self.assertEqual(len(self.titles(min_score=5, max_score=8)), 2)
+        self.assertEqual(
+            self.titles(created_after="2025-01-06", created_before="2025-02-01"),
+            [("Resolved", "High"), ("Pending", "Low")],
+        )
+
+    def test_invalid_filters_are_rejected(self):
+        for params in ({"status": "Closed"}, {"min_score": "high"}, {"created_after": "last week"}):
+            self.assertEqual(self.client.get("/api/complaints/", params).status_code, 400)
+
+    def test_explain_command_reports_no_full_scans(self):
+        out = io.StringIO()
+        call_command("explain_complaint_filters", "--strict", stdout=out)
+        self.assertNotIn("FULL SCAN", out.getvalue())
+
+
+class ComplaintSearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.refund = Complaint.objects.create(title="Refund not received", description="I was charged twice and still wait for my refund.")
+        self.outage = Complaint.objects.create(title="Website down", description="The checkout page shows an error, refunds <b>broken</b> too.")
+        Complaint.objects.create(title="Password reset", description="Reset email never arrives.")
+
+    def search(self, **params):
+        response = self.client.get("/api/complaints/search/", params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_ranked_results_with_snippets(self):
+        body = self.search(q="refund")
+        ids = [r["id"] for r in body["results"]]
+        # Title hits (weight A) outrank description-only hits
+        self.assertEqual(ids, [self.refund.id, self.outage.id])
+        self.assertIn("<mark>Refund</mark>", body["results"][0]["title_highlight"])
+        # Stemmed match, and user text is escaped around the marks
+        self.assertIn("<mark>refunds</mark> &lt;b&gt;broken&lt;/b&gt;", body["results"][1]["snippet"])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.outage.description = "Checkout is fine now."
+        self.outage.save()
+        self.refund.delete()
+        self.assertEqual(self.search(q="refund")["results"], [])
+        self.assertEqual([r["id"] for r in self.search(q="checkout")["results"]], [self.outage.id])
+
+    def test_pagination_and_query_syntax(self):
+        page = self.search(q="refund", page_size=1)
+        self.assertTrue(page["has_more"])
+        second = self.search(q="refund", page_size=1, page=2)
+        self.assertFalse(second["has_more"])
+        self.assertEqual(second["results"][0]["id"], self.outage.id)
+        # FTS operators in user input are treated as plain words
+        self.assertEqual(self.search(q='refund" OR (')["results"], [])
+        self.assertEqual(self.client.get("/api/complaints/search/").status_code, 400)
+
+
+class BulkIngestTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="b@example.com", email="b@example.com", password="pw", full_name="B")
+        self.client.force_authenticate(User.objects.create_user(
+            username="ba@example.com", email="ba@example.com", full_name="BA", role="agent"
+        ))
+
+    def test_import_is_for_admins_and_agents(self):
+        body = json.dumps({"title": "a", "description": "b"})
+        self.assertEqual(APIClient().post("/api/complaints/bulk/", body, content_type="application/x-ndjson").status_code, 401)
+        customer = APIClient()
+        customer.force_authenticate(self.user)
+        self.assertEqual(customer.post("/api/complaints/bulk/", body, content_type="application/x-ndjson").status_code, 403)
+        self.assertFalse(Complaint.objects.exists())
+
+    def test_jsonl_endpoint_reports_row_errors(self):
+        body = "\n".join([
+            json.dumps({"title": "Outage", "description": "Server outage, site is down", "user_id": self.user.id}),
+            "{not json",
+            json.dumps({"title": "", "description": "missing title"}),
+            json.dumps({"title": "Ghost", "description": "unknown user", "user_id": 99999}),
+            json.dumps({"title": "Old ticket", "description": "Question about invoices", "status": "Resolved"}),
+        ])
+        response = self.client.post("/api/complaints/bulk/", body, content_type="application/x-ndjson")
+        self.assertEqual(response.status_code, 200, response.content)
+        report = response.json()
+        self.assertEqual((report["created"], report["failed"]), (2, 3))
+        self.assertEqual([e["row"] for e in report["errors"]], [2, 3, 4])
+        outage = Complaint.objects.get(title="Outage")
+        self.assertEqual((outage.user, outage.priority), (self.user, "High"))
+        self.assertEqual(Complaint.objects.get(title="Old ticket").status, "Resolved")
+
+    def test_json_array_reports_items_that_are_not_objects(self):
+        body = [
+            {"title": "a", "description": "b"}, "oops", 5, None, ["title"],
+            {"title": "c", "description": "d", "status": ["Resolved"]},
+        ]
+        response = self.client.post("/api/complaints/bulk/", body, format="json")
+        self.assertEqual(response.status_code, 200, response.content)
+        report = response.json()
+        self.assertEqual((report["created"], report["failed"]), (1, 5))
+        self.assertEqual([e["row"] for e in report["errors"]], [2, 3, 4, 5, 6])
+        self.assertEqual(report["errors"][0]["errors"], {"row": "Expected a JSON object"})
+        self.assertEqual(report["errors"][-1]["errors"], {"status": "Must be a string."})
+
+    def test_import_command_chunks_csv(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, newline="") as handle:
+            handle.write("title,description,category\n")
+            for i in range(7):
+                handle.write(f'T{i},"Refund request\nnumber {i}",Billing\n')
+            handle.write("Bad,,Billing\n")
+        out = io.StringIO()
+        with mock.patch.object(SeverityAI, "predict_batch", autospec=True, side_effect=lambda self, texts: [(3, "Low", "1 day")] * len(list(texts))) as predict:
+            call_command("import_complaints", handle.name, "--chunk-size", "3", stdout=out, stderr=io.StringIO())
+        Path(handle.name).unlink()
+        # 8 rows in chunks of 3: one classification call per chunk with valid rows
+        self.assertEqual(predict.call_count, 3)
+        self.assertIn("Imported 7 complaints (1 failed)", out.getvalue())
+        self.assertEqual(Complaint.objects.filter(category="Billing").count(), 7)
+        self.assertEqual(Complaint.objects.get(title="T6").description, "Refund request\nnumber 6")
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.agent = User.objects.create_user(username="ex@example.com", email="ex@example.com", full_name="Ex", role="agent")
+        self.client = APIClient()
+        self.client.force_authenticate(self.agent)
+        for i in range(5):
+            complaint = Complaint.objects.create(title=f"T{i}", description=f"line one\nline, two {i}", status="Resolved" if i % 2 else "Pending")
+            ComplaintHistory.objects.create(complaint=complaint, action="STATUS_CHANGE", previous_value="Pending", new_value=complaint.status)
+
+    def body(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content)
+
+    async def test_asgi_export_is_streamed_block_by_block(self):
+        from . import export
+
+        produced = []
+
+        def counting_export(*args, **kwargs):
+            for block in export.stream_export(*args, **kwargs):
+                produced.append(block)
+                yield block
+
+        await sync_to_async(lambda: [
+            Complaint.objects.create(title=f"Bulk {i}", description="x" * 2000) for i in range(200)
+        ])()
+        with mock.patch("api.views.stream_export", side_effect=counting_export):
+            response = await AsyncClient().get(
+                "/api/complaints/export/", {"format": "ndjson"},
+                headers={"Authorization": f"Bearer {access_token(self.agent)}"},
+            )
+            self.assertTrue(response.is_async)
+            blocks = aiter(response.streaming_content)
+            first = await anext(blocks)
+            self.assertEqual(produced, [first])  # nothing read ahead of the client
+            rest = [block async for block in blocks]
+        self.assertGreater(len(rest), 1)
+        self.assertEqual(b"".join([first, *rest]).count(b"\n"), 205)
+
+    def test_ndjson_and_csv(self):
+        lines = self.body(self.client.get("/api/complaints/export/", {"format": "ndjson", "status": "Resolved"})).splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual([r["title"] for r in rows], ["T1", "T3"])
+
+        data = self.body(self.client.get("/api/complaints/export/", {"format": "csv", "kind": "history"})).decode()
+        rows = list(csv.DictReader(io.StringIO(data)))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]["action"], "STATUS_CHANGE")
+
+    def test_gzip_and_errors(self):
+        raw = self.body(self.client.get("/api/complaints/export/", {"format": "csv", "gzip": "1"}))
+        rows = list(csv.reader(io.StringIO(gzip.decompress(raw).decode())))
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[1][3], "line one\nline, two 0")
+        self.assertEqual(self.client.get("/api/complaints/export/", {"status": "Closed"}).status_code, 400)
+        self.assertEqual(self.client.get("/api/complaints/export/", {"kind": "users"}).status_code, 400)
+
+    def test_export_is_for_admins_and_agents(self):
+        self.assertEqual(APIClient().get("/api/complaints/export/").status_code, 401)
+        customer = APIClient()
+        customer.force_authenticate(User.objects.create_user(username="cu@example.com", email="cu@example.com", full_name="Cu"))
+        self.assertEqual(customer.get("/api/complaints/export/").status_code, 403)
+
+    def test_command_writes_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "complaints.ndjson.gz"
+            call_command("export_complaints", "--gzip", "-o", str(path), "--filter", "status=Pending", stderr=io.StringIO())
+            rows = [json.loads(line) for line in gzip.decompress(path.read_bytes()).splitlines()]
+        self.assertEqual([r["title"] for r in rows], ["T0", "T2", "T4"])
+
+
+class ComplaintStatsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="s@example.com", email="s@example.com", password="pw", full_name="S")
+
+    def stats(self, **params):
+        response = self.client.get("/api/complaints/stats/", params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def create(self, user=None, **data):
+        data = {"title": "t", "description": "Question about my invoice", "category": "Billing", **data}
+        if user:
+            data["user_id"] = user.id
+        response = self.client.post("/api/complaints/", data, format="json")
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()["id"]
+
+    def test_rollups_follow_creates_patches_and_imports(self):
+        first = self.create(self.user)
+        self.create(category="Technical")
+        self.client.patch(f"/api/complaints/{first}/", {"status": "Resolved", "priority": "High"}, format="json")
+        body = "\n".join(json.dumps({"title": "i", "description": "imported", "user_id": self.user.id}) for _ in range(2))
+        importer = APIClient()
+        importer.force_authenticate(User.objects.create_user(username="sa@example.com", email="sa@example.com", full_name="SA", role="admin"))
+        importer.post("/api/complaints/bulk/", body, content_type="application/x-ndjson")
+
+        overall = self.stats()
+        self.assertEqual(overall["total"], 4)
+        self.assertEqual(overall["by_status"], {"Pending": 3, "Resolved": 1})
+        self.assertEqual(overall["by_category"], {"Billing": 1, "Technical": 1, "General": 2})
+        self.assertEqual(overall["by_priority"]["High"], 1)
+        self.assertEqual(overall["daily"][-1], {"date": timezone.localdate().isoformat(), "created": 4, "resolved": 1})
+        self.assertEqual(len(overall["daily"]), 30)
+
+        mine = self.stats(user_id=self.user.id, days=7)
+        self.assertEqual((mine["total"], mine["by_status"]), (3, {"Pending": 2, "Resolved": 1}))
+
+        # Served from the rollups, independent of the complaint table size
+        with CaptureQueriesContext(connection) as queries:
+            self.stats()
+        self.assertEqual(len(queries), 2)
+
+    def test_rebuild_repairs_drift(self):
+        first = self.create(self.user)
+        self.client.patch(f"/api/complaints/{first}/", {"status": "Resolved"}, format="json")
+        expected = self.stats(user_id=self.user.id)
+        Complaint.objects.filter(pk=first).update(category="Technical")  # bypasses the rollups
+        Complaint.objects.create(title="raw", description="raw")
+        call_command("rebuild_complaint_stats", stdout=io.StringIO())
+
+        self.assertEqual(self.stats(user_id=self.user.id)["daily"], expected["daily"])
+        self.assertEqual(self.stats(user_id=self.user.id)["by_category"], {"Technical": 1})
+        self.assertEqual(self.stats()["total"], 2)
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.complaint = Complaint.objects.create(title="t", description="Refund please")
+        Complaint.objects.create(title="u", description="Other")
+
+    def test_detail_revalidation(self):
+        url = f"/api/complaints/{self.complaint.id}/"
+        first = self.client.get(url)
+        etag = first["ETag"]
+        self.assertEqual(first["Cache-Control"], "private, no-cache")
+
+        with CaptureQueriesContext(connection) as queries:
+            cached = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(len(queries), 1)
+        # Second-resolution dates cannot tell same-second edits apart: no Last-Modified
+        self.assertNotIn("Last-Modified", first)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 60)).status_code, 200)
+
+        # Appending history changes the representation
+        ComplaintHistory.objects.create(complaint=self.complaint, action="STATUS_CHANGE", new_value="x")
+        changed = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], etag)
+        self.assertEqual(self.client.get("/api/complaints/999999/").status_code, 404)
+
+    def test_list_revalidation(self):
+        first = self.client.get("/api/complaints/", {"page_size": 1})
+        etag = first["ETag"]
+        self.assertNotIn("Last-Modified", first)
+        with CaptureQueriesContext(connection) as queries:
+            cached = self.client.get("/api/complaints/", {"page_size": 1}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual((cached.status_code, len(queries)), (304, 1))
+        # Different page or filter -> different validator
+        self.assertNotEqual(self.client.get("/api/complaints/", {"page_size": 2})["ETag"], etag)
+
+        self.client.patch(f"/api/complaints/{self.complaint.id}/", {"status": "In Progress"}, format="json")
+        self.assertEqual(self.client.get("/api/complaints/", {"page_size": 2}, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class ResolutionEntryTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.agent = User.objects.create_user(username="a@example.com", email="a@example.com", password="pw", full_name="Agent")
+        self.complaint = Complaint.objects.create(title="t", description="d")
+        self.url = f"/api/complaints/{self.complaint.id}/"
+
+    def test_updates_append_entries_and_read_back_combined(self):
+        self.client.force_authenticate(self.agent)
+        first = self.client.patch(self.url, {"resolution": "Refund issued."}, format="json").json()
+        self.assertEqual(first["resolution"], "Refund issued.")
+        second = self.client.patch(self.url, {"resolution": "Customer confirmed."}, format="json").json()
+
+        entries = list(ResolutionEntry.objects.filter(complaint=self.complaint).order_by("id"))
+        self.assertEqual([e.text for e in entries], ["Refund issued.", "Customer confirmed."])
+        self.assertEqual(entries[0].author, self.agent)
+        stamp = timezone.localtime(entries[1].created_at).strftime("%Y-%m-%d %H:%M:%S")
+        self.assertEqual(second["resolution"], "Refund issued." + SEPARATOR.format(timestamp=stamp) + "Customer confirmed.")
+        self.assertEqual(self.client.get("/api/complaints/").json()["results"][-1]["resolution"], second["resolution"])
+
+        page = self.client.get(f"{self.url}resolutions/", {"page_size": 1}).json()
+        self.assertEqual([e["text"] for e in page["results"]], ["Customer confirmed."])
+        self.assertEqual(page["results"][0]["author_name"], "Agent")
+        rest = self.client.get(f"{self.url}resolutions/", {"cursor": page["next_cursor"]}).json()
+        self.assertEqual([e["text"] for e in rest["results"]], ["Refund issued."])
+
+    def test_legacy_blobs_split_on_the_separator(self):
+        blob = "First answer" + SEPARATOR.format(timestamp="2025-03-01 10:00:00") + "Second\n\nwith paragraphs"
+        parts = split_resolution(blob)
+        self.assertEqual([text for _, text in parts], ["First answer", "Second\n\nwith paragraphs"])
+        self.assertIsNone(parts[0][0])
+        self.assertEqual(parts[1][0].isoformat(), "2025-03-01T10:00:00+00:00")
+        self.assertEqual(split_resolution(None), [])
+
+
+class ChangeFeedTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username="cf@example.com", email="cf@example.com", full_name="CF", role="admin")
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def changes(self, since, **params):
+        response = self.client.get("/api/complaints/changes/", {"since": since, **params})
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_deltas_since_list_cursor(self):
+        old = Complaint.objects.create(title="old", description="d")
+        cursor = self.client.get("/api/complaints/").json()["change_cursor"]
+        self.assertEqual(self.changes(cursor)["complaints"], [])
+
+        created = self.client.post("/api/complaints/", {"title": "new", "description": "Refund please"}, format="json").json()
+        self.client.patch(f"/api/complaints/{old.id}/", {"status": "Resolved", "resolution": "Done"}, format="json")
+        body = self.changes(cursor)
+        self.assertEqual({c["id"] for c in body["complaints"]}, {created["id"], old.id})
+        self.assertEqual([h["action"] for h in body["history"]], ["STATUS_CHANGE", "RESOLUTION_ADDED"])
+        self.assertEqual(next(c for c in body["complaints"] if c["id"] == old.id)["resolution"], "Done")
+
+        # Polling from the returned cursor yields only newer changes
+        cursor, old_id = body["cursor"], old.id
+        old.delete()
+        body = self.changes(cursor)
+        self.assertEqual((body["complaints"], body["deleted"]), ([], [old_id]))
+        self.assertEqual(self.changes(body["cursor"])["deleted"], [])
+
+    def test_sequence_is_gapless_and_paginated(self):
+        body = "\n".join(json.dumps({"title": f"t{i}", "description": "bulk"}) for i in range(5))
+        self.client.post("/api/complaints/bulk/", body, content_type="application/x-ndjson")
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                Complaint.objects.create(title="rolled back", description="d")
+                raise RuntimeError
+        Complaint.objects.create(title="after", description="d")
+
+        seqs = list(ChangeLogEntry.objects.order_by("seq").values_list("seq", flat=True))
+        self.assertEqual(seqs, list(range(seqs[0], seqs[0] + 6)))
+
+        first = self.changes(0, limit=4)
+        self.assertTrue(first["has_more"])
+        rest = self.changes(first["cursor"], limit=4)
+        self.assertFalse(rest["has_more"])
+        titles = [c["title"] for c in first["complaints"] + rest["complaints"]]
+        self.assertEqual(sorted(titles), ["after", "t0", "t1", "t2", "t3", "t4"])
+        self.assertEqual(self.client.get("/api/complaints/changes/", {"since": "abc"}).status_code, 400)
+
+    def test_only_staff_get_every_complaint(self):
+        alice = User.objects.create_user(username="al@example.com", email="al@example.com", full_name="Al")
+        bob = User.objects.create_user(username="bo@example.com", email="bo@example.com", full_name="Bo")
+        mine = Complaint.objects.create(user=alice, title="mine", description="d")
+        Complaint.objects.create(user=bob, title="theirs", description="d")
+
+        anonymous = APIClient()
+        self.assertEqual(anonymous.get("/api/complaints/changes/").status_code, 400)
+        body = anonymous.get("/api/complaints/changes/", {"user_id": alice.id}).json()
+        self.assertEqual([c["id"] for c in body["complaints"]], [mine.id])
+
+        # A signed-in customer gets their own complaints, whatever user_id says
+        customer = APIClient()
+        customer.force_authenticate(alice)
+        body = customer.get("/api/complaints/changes/", {"user_id": bob.id}).json()
+        self.assertEqual([c["id"] for c in body["complaints"]], [mine.id])
+        self.assertEqual(len(self.changes(0)["complaints"]), 2)
+
+
+@override_settings(EVENTS_POLL_INTERVAL=0.05, EVENTS_HEARTBEAT=0.2)
+class ComplaintEventTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user(username="al@example.com", email="al@example.com", password="pw", full_name="Al")
+        self.bob = User.objects.create_user(username="bo@example.com", email="bo@example.com", password="pw", full_name="Bo")
+        self.admin = User.objects.create_user(username="ad@example.com", email="ad@example.com", password="pw", full_name="Ad", role="admin")
+
+    @staticmethod
+    def drain(subscription):
+        events = []
+        while not subscription.queue.empty():
+            events.append(subscription.queue.get_nowait())
+        return [(e["type"], e["data"]["complaint_id"]) for e in events]
+
+    async def test_fan_out_is_filtered_per_user(self):
+        broker = EventBroker()
+        alice = await broker.subscribe(user_id=self.alice.id)
+        admin = await broker.subscribe(user_id=self.admin.id, see_all=True)
+
+        mine = await Complaint.objects.acreate(user=self.alice, title="mine", description="d")
+        theirs = await Complaint.objects.acreate(user=self.bob, title="theirs", description="d")
+        mine.status = "Resolved"
+        await mine.asave()
+        await ComplaintHistory.objects.acreate(complaint=mine, action="STATUS_CHANGE", new_value="Resolved")
+        await broker.poll()
+
+        self.assertEqual(self.drain(alice), [("created", mine.id), ("updated", mine.id), ("status_changed", mine.id)])
+        self.assertEqual([t for t, _ in self.drain(admin)], ["created", "created", "updated", "status_changed"])
+        broker.unsubscribe(alice)
+        broker.unsubscribe(admin)
+
+    async def test_concurrent_first_subscribers_share_one_poll_loop(self):
+        broker = EventBroker()
+        started = []
+
+        async def run(self):
+            started.append(self)
+            await asyncio.Event().wait()
+
+        with mock.patch.object(EventBroker, "_run", run):
+            subscriptions = await asyncio.gather(*(broker.subscribe(see_all=True) for _ in range(5)))
+            await asyncio.sleep(0)
+        self.assertEqual(len(started), 1)
+        broker._task.cancel()
+        await Complaint.objects.acreate(user=self.alice, title="once", description="d")
+        await broker.poll()
+        self.assertEqual([len(self.drain(s)) for s in subscriptions], [1] * 5)
+        for subscription in subscriptions:
+            broker.unsubscribe(subscription)
+
+    async def test_resume_replays_in_order_and_slow_subscribers_are_cut_off(self):
+        broker = EventBroker()
+        watcher = await broker.subscribe(see_all=True)
+        first = await Complaint.objects.acreate(user=self.alice, title="a", description="d")
+        await broker.poll()
+        self.drain(watcher)
+        since = (await ChangeLogEntry.objects.aget(complaint_id=first.id)).seq
+        second = await Complaint.objects.acreate(user=self.alice, title="b", description="d")
+        await broker.poll()
+
+        resumed = await broker.subscribe(user_id=self.alice.id, since=since - 1)
+        self.assertEqual(self.drain(resumed), [("created", first.id), ("created", second.id)])
+
+        slow = await broker.subscribe(see_all=True, maxsize=1)
+        for title in "xyz":
+            await Complaint.objects.acreate(title=title, description="d")
+        await broker.poll()
+        self.assertTrue(slow.overflowed)
+        self.assertEqual(slow.queue.qsize(), 1)
+        for subscription in (watcher, resumed, slow):
+            broker.unsubscribe(subscription)
+
+    async def test_sse_endpoint(self):
+        client = AsyncClient()
+        self.assertEqual((await client.get("/api/complaints/events/")).status_code, 400)
+        response = await client.get("/api/complaints/events/", {"user_id": self.alice.id})
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = aiter(response.streaming_content)
+        self.assertTrue((await anext(stream)).startswith(b"retry:"))
+
+        # First event: the stream subscribes lazily, so create once it is waiting
+        pending = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0.05)
+        complaint = await Complaint.objects.acreate(user=self.alice, title="live", description="d")
+        chunk = (await asyncio.wait_for(pending, 2)).decode()
+        while chunk.startswith(":"):
+            chunk = (await asyncio.wait_for(anext(stream), 2)).decode()
+        lines = dict(line.split(": ", 1) for line in chunk.strip().splitlines())
+        self.assertEqual(lines["event"], "created")
+        self.assertEqual(json.loads(lines["data"])["complaint_id"], complaint.id)
+        # Client disconnect: the ASGI handler cancels the streaming task
+        waiting = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0.05)
+        waiting.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiting
+        self.assertFalse(get_broker().subscribers)
+
+    async def test_event_stream_needs_a_login_to_see_everything(self):
+        with mock.patch("api.views.event_stream", return_value=iter(())) as stream:
+            # An admin's id in the query is not a login
+            await AsyncClient().get("/api/complaints/events/", {"user_id": self.admin.id})
+            self.assertEqual(stream.call_args.kwargs, {"user_id": self.admin.id, "see_all": False, "since": None})
+
+            await AsyncClient().get("/api/complaints/events/", {"access_token": access_token(self.admin)})
+            self.assertEqual(stream.call_args.kwargs["see_all"], True)
+
+            client = AsyncClient()
+            await client.aforce_login(self.admin)
+            await client.get("/api/complaints/events/")
+            self.assertEqual(stream.call_args.kwargs["see_all"], True)
+
+
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        suggestion_store.memory.clear()
+        self.addCleanup(suggestion_store.memory.clear)
+        self.user = User.objects.create_user(username="as@example.com", email="as@example.com", password="pw", full_name="As")
+
+    async def test_create_complaint(self):
+        client = AsyncClient()
+        response = await client.post(
+            "/api/complaints/", {"title": "Down", "description": "Service is down", "user_id": self.user.id},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()["user"], self.user.id)
+        self.assertTrue(await Complaint.objects.filter(pk=response.json()["id"], priority__isnull=False).aexists())
+
+        invalid = await client.post("/api/complaints/", {"title": "No description"}, content_type="application/json")
+        self.assertIn("description", invalid.json())
+        malformed = await client.post("/api/complaints/", "{", content_type="application/json")
+        self.assertEqual(malformed.status_code, 400)
+        plain = await client.post("/api/complaints/", "Service is down", content_type="text/plain")
+        self.assertEqual(plain.status_code, 415)
+        self.assertIn("text/plain", plain.json()["detail"])
+        self.assertEqual((await client.put("/api/complaints/")).status_code, 405)
+
+    async def test_session_create_needs_csrf_token(self):
+        client = AsyncClient(enforce_csrf_checks=True)
+        body = {"title": "Down", "description": "Service is down"}
+        self.assertEqual((await client.post("/api/complaints/", body, content_type="application/json")).status_code, 201)
+
+        await client.aforce_login(self.user)
+        forged = await client.post("/api/complaints/", body, content_type="application/json")
+        self.assertEqual(forged.status_code, 403)
+        self.assertIn("CSRF", forged.json()["detail"])
+
+        client.cookies["csrftoken"] = token = "x" * 32
+        allowed = await client.post("/api/complaints/", body, content_type="application/json", headers={"X-CSRFToken": token})
+        self.assertEqual(allowed.status_code, 201, allowed.content)
+        self.assertEqual(allowed.json()["user"], self.user.id)
+
+        bearer = AsyncClient(enforce_csrf_checks=True, headers={"Authorization": f"Bearer {access_token(self.user)}"})
+        self.assertEqual((await bearer.post("/api/complaints/", body, content_type="application/json")).status_code, 201)
+
+    async def test_waiting_on_the_chatbot_does_not_block_other_requests(self):
+        complaint = await Complaint.objects.acreate(user=self.user, title="Slow", description="Nobody has answered yet")
+        release = asyncio.Event()
+
+        async def slow_chatbot(text):
+            await release.wait()
+            return "Try again"
+
+        client = AsyncClient()
+        with mock.patch("api.views.agenerate_ai_suggestion", side_effect=slow_chatbot):
+            suggestion = asyncio.ensure_future(client.get(f"/api/complaints/{complaint.pk}/suggest_resolution/"))
+            await asyncio.sleep(0.05)
+            listing = await asyncio.wait_for(client.get("/api/complaints/"), 5)
+            self.assertEqual(listing.status_code, 200)
+            self.assertFalse(suggestion.done())
+            release.set()
+            response = await asyncio.wait_for(suggestion, 5)
+        self.assertEqual(response.json(), {"suggestion": "Try again", "status": "done"})
+        self.assertEqual((await client.get("/api/complaints/0/suggest_resolution/")).status_code, 404)
+
+    def test_sync_views_do_not_share_one_thread_under_asgi(self):
+        # What gunicorn's uvicorn workers run: each request gets its own thread for sync code
+        from django.core.handlers.asgi import ASGIHandler
+        from django.http import HttpResponse
+
+        threads = set()
+
+        def slow_listing(request):
+            threads.add(threading.get_ident())
+            time.sleep(0.3)
+            return HttpResponse("ok")
+
+        async def get(app, path):
+            messages, received = [], []
+
+            async def receive():
+                if not received:
+                    received.append(True)
+                    return {"type": "http.request", "body": b"", "more_body": False}
+                await asyncio.Event().wait()  # no disconnect
+
+            async def send(message):
+                messages.append(message)
+
+            scope = {"type": "http", "method": "GET", "path": path, "query_string": b"",
+                     "headers": [(b"host", b"testserver")], "server": ("testserver", 80)}
+            await app(scope, receive, send)
+            return messages[0]["status"]
+
+        async def burst():
+            app = ASGIHandler()
+            return await asyncio.gather(*(get(app, "/api/complaints/") for _ in range(4)))
+
+        # A fresh event loop, like a uvicorn worker (not the test runner's async_to_sync)
+        with mock.patch("api.views.list_complaints", side_effect=slow_listing):
+            start = time.perf_counter()
+            statuses = asyncio.run(burst())
+            elapsed = time.perf_counter() - start
+        self.assertEqual(statuses, [200] * 4)
+        self.assertEqual(len(threads), 4)
+        self.assertLess(elapsed, 0.9)  # serialized would take 1.2s
+
+
+class TokenAuthTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="tok@example.com", email="tok@example.com", password="secret-pw", full_name="Tok"
+        )
+        response = self.client.post("/api/auth/login", {"email": "tok@example.com", "password": "secret-pw"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.tokens = response.json()
+        self.complaint = Complaint.objects.create(user=self.user, title="t", description="d")
+
+    def test_access_token_authenticates_without_a_query(self):
+        self.assertEqual(self.tokens["id"], self.user.id)
+        self.assertEqual(self.tokens["token_type"], "Bearer")
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {self.tokens['access']}")
+        with self.assertNumQueries(0):
+            user, claims = BearerTokenAuthentication().authenticate(request)
+            self.assertEqual((user.id, user.role, user.is_authenticated), (self.user.id, "customer", True))
+        # Anything beyond the claims loads the row, once
+        with self.assertNumQueries(1):
+            self.assertEqual((user.email, user.full_name), ("tok@example.com", "Tok"))
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.tokens['access']}")
+        self.client.patch(f"/api/complaints/{self.complaint.pk}/", {"resolution": "Done"}, format="json")
+        self.assertEqual(ResolutionEntry.objects.get(complaint=self.complaint).author_id, self.user.id)
+
+    def test_invalid_tokens_are_rejected(self):
+        access, refresh = self.tokens["access"], self.tokens["refresh"]
+        with self.assertRaises(InvalidToken):
+            verify_access(access[:-2] + ("AA" if not access.endswith("AA") else "BB"))
+        with self.assertRaises(InvalidToken):
+            verify_access(refresh)  # refresh tokens are not access tokens
+        with mock.patch("api.tokens.time.time", return_value=time.time() + settings.AUTH_ACCESS_TOKEN_TTL + 1):
+            with self.assertRaises(InvalidToken):
+                verify_access(access)
+
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer nonsense")
+        response = self.client.get(f"/api/complaints/{self.complaint.pk}/")
+        self.assertEqual(response.status_code, 401)
+        self.assertIn("Bearer", response["WWW-Authenticate"])
+
+    def test_stale_token_does_not_block_login_or_register(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer garbage.token")
+        response = self.client.post("/api/auth/login", {"email": "tok@example.com", "password": "secret-pw"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        response = self.client.post("/api/auth/register", {
+            "email": "new@example.com", "password": "secret-pw", "full_name": "New",
+        }, format="json")
+        self.assertEqual(response.status_code, 201, response.content)
+
+    def test_refresh_issues_access_until_password_changes(self):
+        response = self.client.post("/api/auth/refresh", {"refresh": self.tokens["refresh"]}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(verify_access(response.json()["access"])["sub"], self.user.id)
+
+        self.user.set_password("new-secret-pw")
+        self.user.save()
+        response = self.client.post("/api/auth/refresh", {"refresh": self.tokens["refresh"]}, format="json")
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(self.client.post("/api/auth/refresh", {}, format="json").status_code, 401)
+
+    async def test_async_views_accept_tokens(self):
+        client = AsyncClient()
+        response = await client.post(
+            "/api/complaints/", {"title": "Mine", "description": "Created with a token"},
+            content_type="application/json", headers={"Authorization": f"Bearer {self.tokens['access']}"},
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()["user"], self.user.id)
+        response = await client.get("/api/complaints/events/", {"access_token": "nonsense"})
+        self.assertEqual(response.status_code, 401)
+
+
+@override_settings(DATABASE_REPLICAS=["replica"], DATABASE_REPLICA_CHECK_INTERVAL=3600)
+class ReadReplicaTests(TransactionTestCase):
+    """Aliases mirroring the test database stand in for replicas."""
+
+    aliases = ("replica", "replica2")
+
+    @classmethod
+    def setUpClass(cls):
+        # Added here rather than in settings, so the runner neither creates nor checks them
+        cls.databases = {"default", *cls.aliases}
+        settings_dict = dict(connections.settings["default"], TEST={"MIRROR": "default"})
+        for alias in cls.aliases:
+            connections.settings[alias] = connections.configure_settings({"default": settings_dict})["default"]
+            connections[alias].creation.set_as_test_mirror(connections["default"].settings_dict)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        for alias in cls.aliases:
+            connections[alias].close()
+            del connections[alias]
+            del connections.settings[alias]
+
+    def setUp(self):
+        replicas.reset()
+        self.user = User.objects.create_user(username="rr@example.com", email="rr@example.com", full_name="RR")
+        self.complaint = Complaint.objects.create(user=self.user, title="Router crash", description="Replica test")
+        db_metrics.reset()
+
+    def queries(self):
+        stats = db_metrics.snapshot()
+        return stats["default"]["queries"], stats["replica"]["queries"]
+
+    def test_reads_go_to_the_replica(self):
+        client = APIClient()
+        for url in ("/api/complaints/", f"/api/complaints/{self.complaint.pk}/",
+                    "/api/complaints/stats/", "/api/complaints/search/?q=router"):
+            response = client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+        self.assertEqual(client.get("/api/complaints/search/?q=router").json()["results"][0]["id"], self.complaint.pk)
+        primary, replica = self.queries()
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+        self.assertEqual(db_metrics.snapshot()["replica"]["health"]["healthy"], True)
+
+    @override_settings(DATABASE_REPLICAS=["replica", "replica2"])
+    def test_one_replica_serves_each_request(self):
+        client = APIClient()
+        used = set()
+        for _ in range(4):
+            db_metrics.reset()
+            self.assertEqual(client.get("/api/complaints/?page_size=1").status_code, 200)
+            stats = db_metrics.snapshot()
+            counts = {alias: stats[alias]["queries"] for alias in ("default", *self.aliases)}
+            # The listing runs several queries (count, page, ...); all on the same replica
+            self.assertGreater(sum(counts.values()), 1)
+            self.assertEqual([alias for alias, n in counts.items() if n], [max(counts, key=counts.get)])
+            self.assertEqual(counts["default"], 0)
+            used.add(max(counts, key=counts.get))
+        self.assertEqual(used, set(self.aliases))
+
+    def test_writes_pin_the_client_to_the_primary(self):
+        client = APIClient()
+        response = client.patch(f"/api/complaints/{self.complaint.pk}/", {"status": "In Progress"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(PRIMARY_PIN_COOKIE, response.cookies)
+        self.assertEqual(self.queries()[1], 0)
+
+        self.assertEqual(client.get(f"/api/complaints/{self.complaint.pk}/").json()["status"], "In Progress")
+        self.assertEqual(self.queries()[1], 0)
+        # Other clients (and this one once the cookie expires) read from the replica again
+        APIClient().get(f"/api/complaints/{self.complaint.pk}/")
+        self.assertGreater(self.queries()[1], 0)
+
+    def test_failing_replica_falls_back_to_the_primary(self):
+        def fail(execute, sql, params, many, context):
+            raise OperationalError("replica went away")
+
+        with connections["replica"].execute_wrapper(fail):
+            response = APIClient().get("/api/complaints/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["results"]), 1)
+        self.assertFalse(replicas.status()["replica"]["healthy"])
+        # Skipped until the next health check
+        APIClient().get("/api/complaints/stats/")
+        self.assertEqual(db_metrics.snapshot()["replica"]["errors"], 1)
+        self.assertGreater(self.queries()[0], 0)
+
+
+class SeedTests(TestCase):
+    def test_seed_is_deterministic_and_consistent(self):
+        from .seeding import reset, seed
+
+        ChangeCounter.objects.update_or_create(pk=1, defaults={"value": 42})
+        log = lambda *args: None
+        first = seed(users=40, complaints=300, days=90, chunk_size=64, log=log)
+        self.assertEqual((first["User"], first["Complaint"]), (40, 300))
+        self.assertEqual(first["ComplaintHistory"], ComplaintHistory.objects.count())
+        self.assertEqual(first["ResolutionEntry"], Complaint.objects.filter(status="Resolved").count())
+
+        # Timestamps are spread over the window, not stamped at insert time
+        oldest = Complaint.objects.order_by("created_at").first()
+        self.assertLess(oldest.created_at, timezone.now() - timedelta(days=7))
+        self.assertGreaterEqual(oldest.updated_at, oldest.created_at)
+        self.assertEqual(set(Complaint.objects.values_list("status", flat=True)), {"Pending", "In Progress", "Resolved"})
+        self.assertEqual(self.client.get("/api/complaints/stats/").json()["total"], 300)
+        self.assertTrue(User.objects.get(email=f"seed{User.objects.order_by('id').first().id}@example.com").check_password("seed-password"))
+
+        reset(log=log)
+        self.assertEqual((User.objects.count(), Complaint.objects.count(), ComplaintHistory.objects.count()), (0, 0, 0))
+        self.assertEqual(ChangeCounter.objects.get(pk=1).value, 42)  # cursors never go backwards
+
+        # Same seed and chunk size, same data
+        second = seed(users=40, complaints=300, days=90, chunk_size=64, log=log)
+        self.assertEqual(first, second)
@@ -0,0 +1,74 @@
+import time
+
+from django.conf import settings
+from django.core import signing
+from django.utils.crypto import salted_hmac
+
+from .models import User
+
+# ==========================================
+# SIGNED TOKENS (stateless authentication)
+# Tokens are JSON claims signed with HMAC-SHA256 under SECRET_KEY
+# (django.core.signing). An access token is checked from its signature and
+# expiry alone, so authenticating a request costs no database read and no
+# password hashing. A refresh token is checked against the user row when it
+# is used; it carries a fingerprint of the password hash, so changing the
+# password revokes every refresh token issued before.
+# ==========================================
+
+ACCESS_SALT = "api.tokens.access"
+REFRESH_SALT = "api.tokens.refresh"
+
+
+class InvalidToken(ValueError):
+    pass
+
+
+def password_fingerprint(user):
+    return salted_hmac("api.tokens.password", user.password).hexdigest()[:16]
+
+
+def _sign(claims, salt, ttl):
+    return signing.Signer(salt=salt).sign_object(dict(claims, exp=int(time.time()) + ttl))
+
+
+def _verify(token, salt):
+    try:
+        claims = signing.Signer(salt=salt).unsign_object(token)
+    except (signing.BadSignature, ValueError, TypeError):
+        raise InvalidToken("Invalid token.")
+    if not isinstance(claims, dict) or claims.get("exp", 0) < time.time():
+        raise InvalidToken("Token has expired.")
+    return claims
+
+
+def access_token(user):
+    claims = {"sub": user.pk, "role": user.role, "staff": user.is_staff}
+    return _sign(claims, ACCESS_SALT, settings.AUTH_ACCESS_TOKEN_TTL)
+
+
+def refresh_token(user):
+    return _sign({"sub": user.pk, "pwd": password_fingerprint(user)}, REFRESH_SALT, settings.AUTH_REFRESH_TOKEN_TTL)
+
+
+def issue_tokens(user):
+    return {
+        "access": access_token(user),
+        "refresh": refresh_token(user),
+        "token_type": "Bearer",
+        "expires_in": settings.AUTH_ACCESS_TOKEN_TTL,
+    }
+
+
+def verify_access(token):
+    """Claims of a valid access token (sub, role, staff, exp); no database access."""
+    return _verify(token, ACCESS_SALT)
+
+
+def verify_refresh(token):
+    """The user a valid refresh token belongs to."""
+    claims = _verify(token, REFRESH_SALT)
+    user = User.objects.filter(pk=claims.get("sub"), is_active=True).first()
+    if user is None or claims.get("pwd") != password_fingerprint(user):
+        raise InvalidToken("Token has been revoked.")
+    return user
@@ -4,8 +4,19 @@ from . import views
 urlpatterns = [
     path('auth/register', views.register, name='register'),
     path('auth/login', views.user_login, name='login'),
+    path('auth/refresh', views.token_refresh, name='token_refresh'),
     
     path('complaints/', views.complaints_list, name='complaints_list'),
+    path('complaints/bulk/', views.complaints_bulk, name='complaints_bulk'),
+    path('complaints/export/', views.complaints_export, name='complaints_export'),
+    path('complaints/events/', views.complaint_events, name='complaint_events'),
+    path('complaints/changes/', views.complaints_changes, name='complaints_changes'),
+    path('complaints/stats/', views.complaints_stats, name='complaints_stats'),
+    path('complaints/search/', views.complaints_search, name='complaints_search'),
     path('complaints/<int:pk>/', views.complaint_detail, name='complaint_detail'),
+    path('complaints/<int:pk>/resolutions/', views.resolution_entries, name='resolution_entries'),
     path('complaints/<int:pk>/suggest_resolution/', views.suggest_resolution_view, name='suggest_resolution'),
+    path('incidents/', views.incidents_list, name='incidents_list'),
+    path('suggestions/cache_stats/', views.suggestion_cache_stats, name='suggestion_cache_stats'),
+    path('db/stats/', views.database_stats, name='database_stats'),
 ]
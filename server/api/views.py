@@ -1,17 +1,49 @@
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.decorators import api_view, authentication_classes, permission_classes, renderer_classes
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from asgiref.sync import sync_to_async
+from django.http import HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET
+from django.conf import settings
 from django.shortcuts import get_object_or_404
 from django.contrib.auth import authenticate, login
+from django.db import transaction
 from django.db.models import F
-from .models import User, Complaint, ComplaintHistory
+from .models import User, Complaint, ComplaintHistory, IncidentCluster, ResolutionEntry
 from .serializers import (
     UserSerializer, UserResponseSerializer, 
-    ComplaintSerializer, ComplaintCreateSerializer, ComplaintUpdateSerializer
+    ComplaintSerializer, ComplaintCreateSerializer, ComplaintUpdateSerializer,
+    IncidentClusterSerializer, ResolutionEntrySerializer, ComplaintHistorySerializer
+)
+from .ai_engine import get_severity_ai, agenerate_ai_suggestion, is_cacheable_suggestion
+from .suggestion_cache import suggestion_store
+from .tasks import enqueue_suggestion, job_status
+from .filters import FilterError, filter_complaints
+from .pagination import InvalidCursor, complaints_for_listing, keyset_page, page_size_from
+from .incidents import find_incident, join_incident, open_incident, share_suggestion
+from .search import page_from, search_complaints
+from . import rollups
+from .conditional import detail_validators, page_validators
+from .events import event_stream, get_broker
+from .authentication import user_from_token
+from .permissions import IsSupportStaff, is_support_staff
+from .db_router import replica_reads
+from . import db_metrics
+from .tokens import InvalidToken, access_token, issue_tokens, verify_refresh
+from .changes import DEFAULT_LIMIT, MAX_LIMIT, InvalidSince, changes_since, current_cursor, parse_since
+from .ingest import IngestError, format_for, ingest, iter_items, iter_lines, iter_records
+from .export import (
+    CONTENT_TYPES, CSVRenderer, ExportError, NDJSONRenderer,
+    export_queryset, filename_for, stream_export
 )
-from .ai_engine import ai_engine, generate_ai_suggestion
-import datetime
 
 # ==========================================
 # AUTHENTICATION
@@ -19,6 +51,7 @@ import datetime
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@authentication_classes([])
 def register(request):
     serializer = UserSerializer(data=request.data)
     if serializer.is_valid():
@@ -41,6 +74,7 @@ def register(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@authentication_classes([])
 def user_login(request):
     email = request.data.get('email')
     password = request.data.get('password')
@@ -52,114 +86,443 @@ def user_login(request):
     user = authenticate(username=email, password=password)
     
     if user:
+        # Password hashing happens here only; later requests send the access token
         return Response({
             "id": user.id,
             "email": user.email,
             "full_name": user.full_name,
-            "role": user.role
+            "role": user.role,
+            **issue_tokens(user),
         })
     return Response({'detail': 'Invalid email or password'}, status=status.HTTP_401_UNAUTHORIZED)
 
+@api_view(['POST'])
+@permission_classes([AllowAny])
+@authentication_classes([])
+def token_refresh(request):
+    """Exchanges a refresh token for a new access token."""
+    try:
+        user = verify_refresh(str(request.data.get('refresh') or ''))
+    except InvalidToken as e:
+        return Response({'detail': str(e)}, status=status.HTTP_401_UNAUTHORIZED)
+    return Response({
+        "access": access_token(user),
+        "token_type": "Bearer",
+        "expires_in": settings.AUTH_ACCESS_TOKEN_TTL,
+    })
+
 # ==========================================
 # COMPLAINTS
 # ==========================================
 
-@api_view(['GET', 'POST'])
+@csrf_exempt
+async def complaints_list(request):
+    """
+    GET lists complaints; POST creates one. Creation is async so that an
+    ASGI worker keeps serving other requests while it runs.
+    """
+    if request.method == 'POST':
+        return await create_complaint(request)
+    if request.method in ('GET', 'HEAD', 'OPTIONS'):
+        return await sync_to_async(list_complaints)(request)
+    return HttpResponseNotAllowed(['GET', 'POST'])
+
+@api_view(['GET'])
 @permission_classes([AllowAny]) # Todo: secure this later
-def complaints_list(request):
-    if request.method == 'GET':
-        user_id = request.query_params.get('user_id')
-        queryset = Complaint.objects.all().order_by('-created_at')
-        
-        if user_id:
-            queryset = queryset.filter(user_id=user_id)
-            
-        serializer = ComplaintSerializer(queryset, many=True)
-        return Response(serializer.data)
-        
-    elif request.method == 'POST':
-        # Need to reshape request data slightly
-        data = request.data.copy()
-        user_id = data.get('user_id')
-        if not user_id and request.user.is_authenticated:
-            user_id = request.user.id
+@replica_reads
+def list_complaints(request):
+    cursor = request.query_params.get('cursor')
+    page_size = page_size_from(request.query_params)
+    try:
+        queryset = filter_complaints(Complaint.objects.all(), request.query_params)
+        # Cheap validator query first; a 304 skips loading and serializing the page
+        validators = page_validators(queryset, cursor, page_size)
+        not_modified = validators.not_modified(request)
+        if not_modified is not None:
+            return not_modified
+        # Read before the page: replaying from here can repeat changes, never miss them
+        change_cursor = current_cursor()
+        page, next_cursor = keyset_page(complaints_for_listing(queryset), cursor=cursor, page_size=page_size)
+    except (FilterError, InvalidCursor) as e:
+        return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
-        # DRF expects 'user' as pk
-        if user_id:
-            data['user'] = user_id
-            
-        serializer = ComplaintCreateSerializer(data=data)
-        if serializer.is_valid():
-            # 1. AI Analysis
-            description = serializer.validated_data['description']
-            score, priority, est_time = ai_engine.predict(description)
-            
-            # Save with AI fields
-            complaint = serializer.save(
-                ai_severity_score=score,
-                priority=priority,
-                ai_predicted_resolution_time=est_time
-            )
-            
-            # Re-serialize for full response info
-            return Response(ComplaintSerializer(complaint).data, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    serializer = ComplaintSerializer(page, many=True)
+    return validators.apply(Response({
+        "results": serializer.data,
+        "next_cursor": next_cursor,
+        "change_cursor": str(change_cursor),
+    }))
+
+def _save_complaint(data):
+    """Validates, classifies and stores a complaint; returns (payload, status)."""
+    serializer = ComplaintCreateSerializer(data=data)
+    if not serializer.is_valid():
+        return serializer.errors, status.HTTP_400_BAD_REQUEST
+    description = serializer.validated_data['description']
+
+    # 1. Part of an ongoing incident? Reuse the cluster's analysis
+    incident, signature = find_incident(description)
+    if incident:
+        score, priority, est_time = incident.ai_severity_score, incident.priority, incident.ai_predicted_resolution_time
+    else:
+        # 2. AI Analysis
+        score, priority, est_time = get_severity_ai().predict(description)
+
+    # One transaction: the change feed entry covers the final row state
+    with transaction.atomic():
+        # Save with AI fields
+        complaint = serializer.save(
+            ai_severity_score=score,
+            priority=priority,
+            ai_predicted_resolution_time=est_time,
+            incident=incident
+        )
+
+        rollups.complaints_created([complaint])
+
+        if incident:
+            join_incident(incident)
+        else:
+            open_incident(complaint, signature)
+            # Precompute the AI suggestion in the background (manage.py suggestion_worker)
+            transaction.on_commit(lambda: enqueue_suggestion(complaint))
+
+    # Re-serialize for full response info
+    return ComplaintSerializer(complaint).data, status.HTTP_201_CREATED
+
+async def create_complaint(request):
+    # Same body formats as the DRF views (JSON, form, multipart)
+    drf_request = Request(request, parsers=[parser() for parser in api_settings.DEFAULT_PARSER_CLASSES])
+    try:
+        user = user_from_token(request)
+        if user is None:
+            user = await request.auser()
+            if user.is_authenticated:
+                # A session cookie rides along on cross-site requests: check CSRF as DRF's views do
+                SessionAuthentication().enforce_csrf(drf_request)
+        data = drf_request.data.copy()
+    except InvalidToken as e:
+        return JsonResponse({'detail': str(e)}, status=401)
+    except APIException as e:
+        # PermissionDenied (CSRF, 403), ParseError (400), UnsupportedMediaType (415)
+        return JsonResponse({'detail': str(e.detail)}, status=e.status_code)
+    user_id = data.get('user_id')
+    if not user_id and user.is_authenticated:
+        user_id = user.id
+
+    # DRF expects 'user' as pk
+    if user_id:
+        data['user'] = user_id
+
+    # The ORM and the classifier are synchronous: one hop to a worker thread
+    payload, code = await sync_to_async(_save_complaint)(data)
+    return JsonResponse(payload, status=code)
 
 @api_view(['GET', 'PATCH'])
 @permission_classes([AllowAny])
+@replica_reads
 def complaint_detail(request, pk):
+    if request.method == 'GET':
+        validators = detail_validators(Complaint.objects.all(), pk)
+        if validators is None:
+            return Response({'detail': 'No Complaint matches the given query.'}, status=status.HTTP_404_NOT_FOUND)
+        not_modified = validators.not_modified(request)
+        if not_modified is not None:
+            return not_modified
+        complaint = get_object_or_404(complaints_for_listing(), pk=pk)
+        return validators.apply(Response(ComplaintSerializer(complaint).data))
+
     complaint = get_object_or_404(Complaint, pk=pk)
     
-    if request.method == 'GET':
-        serializer = ComplaintSerializer(complaint)
-        return Response(serializer.data)
-        
-    elif request.method == 'PATCH':
+    if request.method == 'PATCH':
         old_status = complaint.status
-        old_resolution = complaint.resolution
+        old_priority = complaint.priority
+        old_description = complaint.description
+        before = {dimension: getattr(complaint, dimension) for dimension in rollups.DIMENSIONS}
         
-        # Prepare data with special resolution handling if needed
-        data = request.data.copy()
-        new_resolution_text = data.get('resolution')
-        
-        if new_resolution_text:
-            if old_resolution:
-                timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                combined_resolution = f"{old_resolution}\n\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n**Update ({timestamp}):**\n{new_resolution_text}"
-                data['resolution'] = combined_resolution
-            # Else just new_resolution_text is fine
-        
-        serializer = ComplaintUpdateSerializer(complaint, data=data, partial=True)
+        serializer = ComplaintUpdateSerializer(complaint, data=request.data, partial=True)
         if serializer.is_valid():
-            updated_complaint = serializer.save()
+            with transaction.atomic():
+                # Resolution updates are appended as entries, never rewritten
+                new_resolution_text = serializer.validated_data.pop('resolution', None)
+                updated_complaint = serializer.save()
+                if new_resolution_text:
+                    ResolutionEntry.objects.create(
+                        complaint=updated_complaint,
+                        text=new_resolution_text,
+                        author_id=request.user.id if request.user.is_authenticated else None
+                    )
+                rollups.complaint_changed(updated_complaint, before)
+
+                # The new text has its own cache key; the old entry stays, other
+                # complaints with the same text still share it
+                if 'description' in serializer.validated_data and updated_complaint.description != old_description:
+                    transaction.on_commit(lambda: enqueue_suggestion(updated_complaint))
+            
+                # Audit Log Logic: Status Change
+                if 'status' in serializer.validated_data and serializer.validated_data['status'] != old_status:
+                    ComplaintHistory.objects.create(
+                        complaint=complaint,
+                        action='STATUS_CHANGE',
+                        previous_value=old_status,
+                        new_value=updated_complaint.status,
+                        changed_by_id=request.user.id if request.user.is_authenticated else None
+                    )
             
-            # Audit Log Logic: Status Change
-            if 'status' in serializer.validated_data and serializer.validated_data['status'] != old_status:
-                ComplaintHistory.objects.create(
-                    complaint=complaint,
-                    action='STATUS_CHANGE',
-                    previous_value=old_status,
-                    new_value=updated_complaint.status,
-                    changed_by=request.user if request.user.is_authenticated else None
-                )
+                # Audit Log Logic: Priority corrected by an agent (feeds online retraining)
+                if 'priority' in serializer.validated_data and serializer.validated_data['priority'] != old_priority:
+                    ComplaintHistory.objects.create(
+                        complaint=complaint,
+                        action='PRIORITY_CHANGE',
+                        previous_value=old_priority,
+                        new_value=updated_complaint.priority,
+                        changed_by_id=request.user.id if request.user.is_authenticated else None
+                    )
             
-            # Audit Log Logic: Resolution Added
-            if new_resolution_text:
-                 ComplaintHistory.objects.create(
-                    complaint=complaint,
-                    action='RESOLUTION_ADDED',
-                    new_value='Resolution Provided',
-                    changed_by=request.user if request.user.is_authenticated else None
-                )
+                # Audit Log Logic: Resolution Added
+                if new_resolution_text:
+                     ComplaintHistory.objects.create(
+                        complaint=complaint,
+                        action='RESOLUTION_ADDED',
+                        new_value='Resolution Provided',
+                        changed_by_id=request.user.id if request.user.is_authenticated else None
+                    )
             
             return Response(ComplaintSerializer(updated_complaint).data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
-def suggest_resolution_view(request, pk):
+def resolution_entries(request, pk):
+    """Resolution entries of one complaint, newest first, keyset-paginated."""
     complaint = get_object_or_404(Complaint, pk=pk)
-    # Check if existing resolution model exists logic
-    suggestion = generate_ai_suggestion(complaint.description)
-    return Response({"suggestion": suggestion})
+    try:
+        page, next_cursor = keyset_page(
+            complaint.resolution_entries.select_related('author'),
+            cursor=request.query_params.get('cursor'),
+            page_size=page_size_from(request.query_params),
+        )
+    except InvalidCursor as e:
+        return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({"results": ResolutionEntrySerializer(page, many=True).data, "next_cursor": next_cursor})
+
+def _known_suggestion(pk):
+    """(complaint, suggestion or None, job status) without calling the chatbot."""
+    complaint = Complaint.objects.filter(pk=pk).first()
+    if complaint is None:
+        return None, None, None
+
+    # Precomputed by the suggestion worker, or shared by the complaint's incident?
+    suggestion = suggestion_store.lookup(complaint.description)
+    if suggestion is None and complaint.incident_id:
+        suggestion = complaint.incident.suggestion
+    if suggestion is not None:
+        return complaint, suggestion, 'done'
+    return complaint, None, job_status(complaint)
+
+@require_GET
+async def suggest_resolution_view(request, pk):
+    """Async: waiting on the chatbot holds no worker thread."""
+    complaint, suggestion, job = await sync_to_async(_known_suggestion)(pk)
+    if complaint is None:
+        return JsonResponse({'detail': 'No Complaint matches the given query.'}, status=404)
+    if suggestion is not None:
+        return JsonResponse({"suggestion": suggestion, "status": "done"})
+
+    if job in ('pending', 'running'):
+        return JsonResponse({"suggestion": None, "status": "pending"}, status=202)
+
+    # No job queued (older complaint) or it failed: compute inline
+    suggestion = await suggestion_store.aget_or_compute(
+        complaint.description,
+        agenerate_ai_suggestion,
+        is_cacheable=is_cacheable_suggestion,
+    )
+    if is_cacheable_suggestion(suggestion):
+        await sync_to_async(share_suggestion)(complaint, suggestion)
+    return JsonResponse({"suggestion": suggestion, "status": "done"})
+
+@api_view(['POST'])
+@permission_classes([IsSupportStaff])
+def complaints_bulk(request):
+    """
+    Bulk import: the body is JSONL (application/x-ndjson) or CSV (text/csv),
+    read as a stream, or a JSON array for small batches. Admins and agents only.
+    """
+    content_type = request.content_type or ''
+    fmt = format_for(content_type)
+    try:
+        if fmt:
+            stream = request.stream
+            lines = iter_lines(stream) if stream is not None else iter(())
+            records = iter_records(lines, fmt)
+        elif content_type.startswith('application/json'):
+            if not isinstance(request.data, list):
+                return Response({'detail': 'Expected a JSON array of complaints.'}, status=status.HTTP_400_BAD_REQUEST)
+            records = iter_items(request.data)
+        else:
+            return Response({'detail': f"Unsupported content type '{content_type}'."},
+                            status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+        report = ingest(records)
+    except (IngestError, UnicodeDecodeError) as e:
+        return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(report.as_dict())
+
+async def _iterate_async(blocks):
+    """Pulls one block at a time from a sync iterator (and its database cursor) on the request's thread."""
+    next_block = sync_to_async(next)
+    done = object()
+    try:
+        while (block := await next_block(blocks, done)) is not done:
+            yield block
+    finally:
+        if hasattr(blocks, 'close'):
+            await sync_to_async(blocks.close)()
+
+@api_view(['GET'])
+@permission_classes([IsSupportStaff])
+@renderer_classes([NDJSONRenderer, CSVRenderer, JSONRenderer])
+def complaints_export(request):
+    """
+    Streams every matching row: ?format=ndjson|csv, ?kind=complaints|history|resolutions,
+    ?gzip=1, plus the listing filters. Admins and agents only.
+    """
+    fmt = request.query_params.get('format', 'ndjson')
+    kind = request.query_params.get('kind', 'complaints')
+    gzip = request.query_params.get('gzip') in ('1', 'true')
+    try:
+        queryset = export_queryset(kind, request.query_params)
+        body = stream_export(queryset, kind, fmt, gzip=gzip)
+    except (FilterError, ExportError) as e:
+        return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    if isinstance(request._request, ASGIRequest):
+        # Django would list() a sync iterator under ASGI, buffering the whole export
+        body = _iterate_async(body)
+    response = StreamingHttpResponse(body, content_type='application/gzip' if gzip else CONTENT_TYPES[fmt])
+    response['Content-Disposition'] = f'attachment; filename="{filename_for(kind, fmt, gzip)}"'
+    return response
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def complaints_changes(request):
+    """
+    Delta sync: complaints (full rows) and history rows written after
+    ?since=<cursor>, ids of deleted complaints, and the cursor to poll with
+    next. Start from the change_cursor of a list response. Like the event
+    stream, only signed-in admins and agents get every complaint; anyone
+    else gets their own (or ?user_id='s) complaints.
+    """
+    try:
+        since = parse_since(request.query_params.get('since'))
+        limit = max(1, min(int(request.query_params.get('limit', DEFAULT_LIMIT)), MAX_LIMIT))
+        user_id = int(request.query_params['user_id']) if request.query_params.get('user_id') else None
+    except (InvalidSince, ValueError) as e:
+        return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    if is_support_staff(request.user):
+        pass  # everything, or ?user_id= to narrow it
+    elif request.user.is_authenticated:
+        user_id = request.user.pk
+    elif user_id is None:
+        return Response({'detail': 'Sign in, or pass user_id.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    complaint_ids, history_ids, deleted, cursor, has_more = changes_since(since, limit, user_id=user_id)
+    complaints = complaints_for_listing().filter(pk__in=complaint_ids).order_by('-created_at', '-id')
+    history = ComplaintHistory.objects.filter(pk__in=history_ids).select_related('changed_by').order_by('timestamp', 'id')
+    return Response({
+        "complaints": ComplaintSerializer(complaints, many=True).data,
+        "history": ComplaintHistorySerializer(history, many=True).data,
+        "deleted": deleted,
+        "cursor": str(cursor),
+        "has_more": has_more,
+    })
+
+@require_GET
+async def complaint_events(request):
+    """
+    Server-sent events for complaint changes (needs an ASGI server). Admins
+    and agents (token or session) get every complaint, customers only their
+    own; an unauthenticated ?user_id= only ever gets that user's complaints.
+    Reconnects resume from Last-Event-ID, or ?since=<change cursor>.
+    """
+    try:
+        # A bearer token (header or ?access_token=; EventSource cannot set headers) or the session
+        user = user_from_token(request, allow_query=True) or await request.auser()
+    except InvalidToken as e:
+        return JsonResponse({'detail': str(e)}, status=401)
+    try:
+        user_id = int(request.GET['user_id']) if request.GET.get('user_id') else None
+        since = request.headers.get('Last-Event-ID') or request.GET.get('since')
+        since = parse_since(since) if since else None
+    except (InvalidSince, ValueError):
+        return JsonResponse({'detail': 'user_id and since must be integers'}, status=400)
+    if user.is_authenticated:
+        user_id, see_all = user.pk, is_support_staff(user)
+    elif user_id and await User.objects.filter(pk=user_id).aexists():
+        see_all = False
+    else:
+        return JsonResponse({'detail': 'Unknown or missing user_id.'}, status=400)
+
+    stream = event_stream(get_broker(), user_id=user_id, see_all=see_all, since=since)
+    response = StreamingHttpResponse(stream, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # nginx: do not buffer the stream
+    return response
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+@replica_reads
+def complaints_stats(request):
+    """Dashboard counts from the rollup tables: ?user_id= for one customer, ?days= (max 366)."""
+    try:
+        user_id = int(request.query_params.get('user_id') or 0)
+        days = max(1, min(int(request.query_params.get('days', 30)), 366))
+    except ValueError:
+        return Response({'detail': 'user_id and days must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(rollups.complaint_stats(user_id=user_id, days=days))
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+@replica_reads
+def complaints_search(request):
+    q = request.query_params.get('q', '').strip()
+    if not q:
+        return Response({'detail': "Query parameter 'q' is required."}, status=status.HTTP_400_BAD_REQUEST)
+    page = page_from(request.query_params)
+    page_size = page_size_from(request.query_params)
+    results, has_more = search_complaints(q, page=page, page_size=page_size)
+    return Response({"results": results, "page": page, "page_size": page_size, "has_more": has_more})
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def incidents_list(request):
+    """
+    Incidents shared by more than one complaint, newest first,
+    keyset-paginated (?cursor=, ?page_size=). Every unmatched complaint
+    opens its own cluster; ?all=1 lists those too.
+    """
+    queryset = IncidentCluster.objects.all()
+    if request.query_params.get('all') not in ('1', 'true'):
+        queryset = queryset.filter(member_count__gt=1)
+    status_filter = request.query_params.get('status')
+    if status_filter:
+        queryset = queryset.filter(status=status_filter)
+    try:
+        page, next_cursor = keyset_page(
+            queryset, cursor=request.query_params.get('cursor'), page_size=page_size_from(request.query_params)
+        )
+    except InvalidCursor as e:
+        return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({"results": IncidentClusterSerializer(page, many=True).data, "next_cursor": next_cursor})
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def suggestion_cache_stats(request):
+    return Response(suggestion_store.stats())
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def database_stats(request):
+    """Per-alias connection and query counters of this worker, pool stats and replica health."""
+    return Response(db_metrics.snapshot())
 
@@ -0,0 +1,151 @@
+"""
+Authentication cost: login throughput and per-request auth overhead.
+
+Scenarios (in-process through Django, throwaway test database):
+  auth.login          POST /api/auth/login (one password hash + token issue)
+  auth.verify_token   verify_access() alone
+  request.anonymous   GET /api/complaints/<id>/ without credentials
+  request.bearer      the same with "Authorization: Bearer <access token>"
+  request.session     the same with a session cookie (session + user row per request)
+  request.basic       the same with HTTP Basic (a password hash per request)
+
+Each request.* row also reports the queries it ran; the auth overhead of a
+scheme is its latency minus request.anonymous.
+
+Usage (from server/):
+    DB_ENGINE=sqlite python -m benchmarks.auth
+    DB_ENGINE=sqlite python -m benchmarks.auth -n 500 --logins 20 --output auth.json
+"""
+import argparse
+import base64
+import json
+import os
+from pathlib import Path
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "supportflow.settings")
+django.setup()
+
+from benchmarks.suite import time_each  # noqa: E402
+
+EMAIL, PASSWORD = "auth-bench@example.com", "auth-bench-pw"
+
+
+def bench_requests(n, user, complaint):
+    from rest_framework.test import APIClient
+
+    from api.tokens import access_token
+
+    token = access_token(user)
+    session = APIClient()
+    session.login(username=EMAIL, password=PASSWORD)
+    basic = base64.b64encode(f"{EMAIL}:{PASSWORD}".encode()).decode()
+    schemes = {
+        "anonymous": (APIClient(), {}),
+        "bearer": (APIClient(), {"HTTP_AUTHORIZATION": f"Bearer {token}"}),
+        "session": (session, {}),
+        "basic": (APIClient(), {"HTTP_AUTHORIZATION": f"Basic {basic}"}),
+    }
+    basic_enabled = "rest_framework.authentication.BasicAuthentication" in _auth_classes()
+    url = f"/api/complaints/{complaint.pk}/"
+
+    results = {}
+    for name, (client, headers) in schemes.items():
+        if name == "basic" and not basic_enabled:
+            # Not an enabled scheme; time the password check it would do per request
+            from django.contrib.auth import authenticate
+
+            def request(_):
+                authenticate(username=EMAIL, password=PASSWORD)
+                client.get(url)
+            count = max(n // 50, 5)
+        else:
+            def request(_):
+                response = client.get(url, **headers)
+                assert response.status_code == 200, response.content
+            count = n
+        queries = count_queries(request)
+        row = time_each(request, range(count))
+        row["queries_per_request"] = queries
+        results[f"request.{name}"] = row
+    return results
+
+
+def count_queries(fn):
+    # Not CaptureQueriesContext: each request resets connection.queries
+    from django.db import connection
+
+    executed = []
+
+    def counter(execute, sql, params, many, context):
+        executed.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(counter):
+        fn(None)
+    return len(executed)
+
+
+def _auth_classes():
+    from rest_framework.settings import api_settings
+
+    return [f"{cls.__module__}.{cls.__name__}" for cls in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+
+
+def run(n, logins):
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+    from rest_framework.test import APIClient
+
+    from api.models import Complaint, User
+    from api.tokens import access_token, verify_access
+
+    setup_test_environment()
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        user = User.objects.create_user(username=EMAIL, email=EMAIL, password=PASSWORD, full_name="Auth")
+        complaint = Complaint.objects.create(user=user, title="Bench", description="Auth benchmark")
+        client = APIClient()
+
+        def login(_):
+            response = client.post("/api/auth/login", {"email": EMAIL, "password": PASSWORD}, format="json")
+            assert response.status_code == 200, response.content
+
+        token = access_token(user)
+        results = {
+            "auth.login": time_each(login, range(logins)),
+            "auth.verify_token": time_each(lambda _: verify_access(token), range(n * 10)),
+        }
+        results.update(bench_requests(n, user, complaint))
+        return results
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", type=int, default=300, help="Requests per scheme.")
+    parser.add_argument("--logins", type=int, default=10, help="Logins to time (each hashes a password).")
+    parser.add_argument("--output", type=Path, help="Also write results as JSON to this file.")
+    args = parser.parse_args()
+
+    results = run(args.n, args.logins)
+    anonymous = results["request.anonymous"]["p50_ms"]
+
+    print(f"\n{'scenario':<20} {'p50 ms':>9} {'p95 ms':>9} {'ops/s':>10} {'queries':>8} {'overhead ms':>12}")
+    print("-" * 72)
+    for name, row in results.items():
+        overhead = f"{row['p50_ms'] - anonymous:>12.3f}" if name.startswith("request.") else f"{'-':>12}"
+        queries = row.get("queries_per_request", "-")
+        print(f"{name:<20} {row['p50_ms']:>9.3f} {row['p95_ms']:>9.3f} {row['throughput_per_s']:>10,.1f} "
+              f"{queries:>8} {overhead}")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
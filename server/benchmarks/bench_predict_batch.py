@@ -0,0 +1,51 @@
+"""
+Throughput benchmark for SeverityAI.predict vs SeverityAI.predict_batch.
+
+Usage (from server/):
+    python -m benchmarks.bench_predict_batch
+    python -m benchmarks.bench_predict_batch --sizes 1 100 10000 --repeat 3
+"""
+import argparse
+import itertools
+import time
+
+from api import ai_config
+from api.ai_engine import SeverityAI
+
+
+def make_texts(n):
+    samples = [text for text, _ in ai_config.TRAINING_DATA]
+    return list(itertools.islice(itertools.cycle(samples), n))
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 10_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = SeverityAI()
+
+    print(f"{'batch':>8} | {'predict() loop':>16} | {'predict_batch()':>16} | {'speedup':>7}")
+    print("-" * 58)
+    for size in args.sizes:
+        texts = make_texts(size)
+        loop_s = best_of(lambda: [engine.predict(t) for t in texts], args.repeat)
+        batch_s = best_of(lambda: engine.predict_batch(texts), args.repeat)
+        print(
+            f"{size:>8} | {size / loop_s:>12,.0f} t/s | {size / batch_s:>12,.0f} t/s | "
+            f"{loop_s / batch_s:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
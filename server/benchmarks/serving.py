@@ -0,0 +1,224 @@
+"""
+Serving-mode comparison: `manage.py runserver` (the old setup) against the
+ASGI production mode (gunicorn + uvicorn workers, or plain uvicorn).
+
+For each mode a server is started on a throwaway SQLite database with the
+chatbot pointed at a local FakeGradioServer that answers after
+--upstream-latency seconds. Clients then run two request streams at once:
+
+  slow   GET /api/complaints/<id>/suggest_resolution/ for complaints with
+         no cached suggestion (every call waits on the fake chatbot)
+  fast   GET /api/complaints/<id>/
+
+and the latency percentiles, throughput and error count of each stream
+are reported per mode. The interesting number is fast-request latency
+while slow requests are in flight.
+
+Usage (from server/):
+    python -m benchmarks.serving
+    python -m benchmarks.serving --modes runserver gunicorn --workers 4 --slow 64 --fast 16 --duration 20
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import django
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+DB_NAME = os.path.join(tempfile.gettempdir(), "supportflow-bench-serving.sqlite3")
+
+# The servers and this process share one scratch database, never the real one
+os.environ["DB_ENGINE"] = "sqlite"
+os.environ["SQLITE_NAME"] = DB_NAME
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "supportflow.settings")
+django.setup()
+
+from benchmarks.stats import summarize  # noqa: E402
+
+MODES = ("runserver", "uvicorn", "gunicorn")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def server_command(mode, port, workers):
+    if mode == "runserver":
+        return [sys.executable, "manage.py", "runserver", f"127.0.0.1:{port}", "--noreload"]
+    if mode == "uvicorn":
+        return [sys.executable, "-m", "uvicorn", "supportflow.asgi:application",
+                "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers), "--no-access-log"]
+    return [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "--bind", f"127.0.0.1:{port}",
+            "--workers", str(workers), "supportflow.asgi:application"]
+
+
+def available(mode):
+    module = {"runserver": "django", "uvicorn": "uvicorn", "gunicorn": "gunicorn"}[mode]
+    if mode == "gunicorn" and shutil.which("gunicorn") is None:
+        return False
+    try:
+        __import__(module)
+    except ImportError:
+        return False
+    return True
+
+
+def prepare_database(complaints):
+    from django.core.management import call_command
+
+    from api.models import Complaint, User
+
+    call_command("migrate", verbosity=0)
+    user, _ = User.objects.get_or_create(
+        email="serving@example.com", defaults={"username": "serving@example.com", "full_name": "Serving"}
+    )
+    existing = Complaint.objects.filter(user=user).count()
+    for n in range(existing, complaints):
+        Complaint.objects.create(user=user, title=f"Bench {n}", description=f"Benchmark complaint number {n}")
+    return list(Complaint.objects.filter(user=user).order_by("id").values_list("id", flat=True)[:complaints])
+
+
+def reset_suggestions():
+    """Every mode starts with a cold cache, so slow requests really reach the chatbot."""
+    from api.models import IncidentCluster, SuggestionCache, SuggestionJob
+
+    SuggestionCache.objects.all().delete()
+    SuggestionJob.objects.all().delete()
+    IncidentCluster.objects.update(suggestion=None)
+
+
+async def wait_until_up(url, timeout=60):
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(timeout=2) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(f"{url}/api/complaints/?page_size=1")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not come up within {timeout}s")
+
+
+async def drive(url, ids, args):
+    import httpx
+
+    results = {"slow": [], "fast": []}
+    errors = {"slow": 0, "fast": 0}
+    uncached = iter(ids)  # each slow request gets a complaint nobody asked about yet
+    deadline = time.monotonic() + args.duration
+    limits = httpx.Limits(max_connections=args.slow + args.fast + 10)
+
+    async with httpx.AsyncClient(base_url=url, timeout=args.upstream_latency * 10 + 30, limits=limits) as client:
+
+        async def worker(kind, paths):
+            for path in paths:
+                if time.monotonic() >= deadline:
+                    return
+                t0 = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    ok = response.status_code == 200
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    results[kind].append(time.perf_counter() - t0)
+                else:
+                    errors[kind] += 1
+
+        slow_paths = (f"/api/complaints/{pk}/suggest_resolution/" for pk in uncached)
+        fast_paths = (f"/api/complaints/{pk}/" for pk in itertools.cycle(ids))
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(worker("slow", slow_paths) for _ in range(args.slow)),
+            *(worker("fast", fast_paths) for _ in range(args.fast)),
+        )
+        elapsed = time.perf_counter() - start
+
+    return {
+        kind: dict(summarize(latencies, elapsed=elapsed), errors=errors[kind])
+        for kind, latencies in results.items()
+    }
+
+
+def run_mode(mode, ids, fake_url, args):
+    port = free_port()
+    env = dict(
+        os.environ,
+        CHATBOT_URL=fake_url,
+        # Upstream concurrency is not what is being measured
+        CHATBOT_MAX_CONCURRENCY=str(args.slow * 2),
+        CHATBOT_TIMEOUT=str(args.upstream_latency * 10 + 10),
+        AI_WARMUP="0",
+        PYTHONUNBUFFERED="1",
+    )
+    reset_suggestions()
+    server = subprocess.Popen(
+        server_command(mode, port, args.workers), cwd=SERVER_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        asyncio.run(wait_until_up(url))
+        return asyncio.run(drive(url, ids, args))
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--workers", type=int, default=2, help="Worker processes for uvicorn/gunicorn.")
+    parser.add_argument("--slow", type=int, default=32, help="Concurrent clients requesting uncached suggestions.")
+    parser.add_argument("--fast", type=int, default=8, help="Concurrent clients requesting complaint details.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load per mode.")
+    parser.add_argument("--upstream-latency", type=float, default=1.0, help="Fake chatbot response time (s).")
+    parser.add_argument("--output", type=Path, help="Also write results as JSON to this file.")
+    args = parser.parse_args()
+
+    from api.fake_gradio import FakeGradioServer
+
+    # Enough uncached complaints that slow requests never hit the cache
+    needed = int(args.slow * (args.duration / max(args.upstream_latency, 0.01) + 2))
+    ids = prepare_database(needed)
+
+    results = {}
+    with FakeGradioServer(latency=args.upstream_latency) as fake:
+        for mode in args.modes:
+            if not available(mode):
+                print(f"⏭️  {mode}: not installed, skipped")
+                continue
+            print(f"▶ {mode} ({args.slow} slow + {args.fast} fast clients, {args.duration:.0f}s)...", flush=True)
+            results[mode] = run_mode(mode, ids, fake.url, args)
+
+    print(f"\n{'mode':<11} {'stream':<6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>9} {'errors':>7}")
+    print("-" * 66)
+    for mode, streams in results.items():
+        for kind, row in streams.items():
+            cells = [row.get(k) for k in ("p50_ms", "p95_ms", "p99_ms")]
+            cells = [f"{c:>9.1f}" if c is not None else f"{'-':>9}" for c in cells]
+            print(f"{mode:<11} {kind:<6} {' '.join(cells)} {row['throughput_per_s']:>9.1f} {row['errors']:>7}")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
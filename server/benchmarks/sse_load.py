@@ -0,0 +1,271 @@
+"""
+Load test for the complaint event stream (GET /api/complaints/events/).
+
+Opens N concurrent SSE subscribers against one ASGI worker, commits a
+stream of complaints and measures how long each event takes to reach every
+subscriber that should see it (admins: all, customers: their own), plus the
+memory each idle subscriber costs. Runs each --subscribers level in turn,
+so the point where delivery latency degrades shows how many subscribers a
+worker can hold.
+
+By default the ASGI application is driven in-process against a throwaway
+test database (no server needed). With --url the subscribers connect over
+HTTP to a running server instead (e.g. uvicorn supportflow.asgi:application)
+and events are produced through its POST /api/complaints/.
+
+Usage (from server/):
+    DB_ENGINE=sqlite python -m benchmarks.sse_load --subscribers 100 1000 5000
+    python -m benchmarks.sse_load --url http://127.0.0.1:8000 --subscribers 500
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+import tracemalloc
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "supportflow.settings")
+django.setup()
+
+from benchmarks.stats import summarize  # noqa: E402
+
+EVENTS_PATH = "/api/complaints/events/"
+
+
+class Receiver:
+    """Records when each complaint's "created" event reached one subscriber."""
+
+    def __init__(self):
+        self.buffer = ""
+        self.connected = asyncio.Event()
+        self.arrivals = []
+
+    def feed(self, text):
+        now = time.perf_counter()
+        self.buffer += text
+        while "\n\n" in self.buffer:
+            block, self.buffer = self.buffer.split("\n\n", 1)
+            self.connected.set()
+            fields = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line)
+            if fields.get("event") == "created":
+                # Matched against send times afterwards: an event can arrive
+                # before the producer has recorded its complaint id
+                self.arrivals.append((json.loads(fields["data"])["complaint_id"], now))
+
+
+# ==========================================
+# In-process: raw ASGI calls, no sockets
+# ==========================================
+
+async def asgi_subscriber(application, user_id, receiver, disconnect):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": EVENTS_PATH, "raw_path": EVENTS_PATH.encode(),
+        "query_string": f"user_id={user_id}".encode(), "root_path": "",
+        "headers": [(b"host", b"testserver")], "client": ("127.0.0.1", 0), "server": ("testserver", 80),
+    }
+    sent_request = False
+
+    async def receive():
+        nonlocal sent_request
+        if not sent_request:
+            sent_request = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            receiver.feed(message.get("body", b"").decode())
+
+    await application(scope, receive, send)
+
+
+async def run_in_process(level, args, users, admins):
+    from asgiref.sync import sync_to_async
+
+    from api.events import get_broker
+    from api.models import Complaint
+    from supportflow.asgi import application
+
+    sent_at = {}
+    disconnect = asyncio.Event()
+    receivers = []
+    tasks = []
+
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    for n in range(level):
+        user = admins[n % len(admins)] if n < level * args.admin_share else users[n % len(users)]
+        receiver = Receiver()
+        receivers.append((user, receiver))
+        tasks.append(asyncio.ensure_future(asgi_subscriber(application, user.pk, receiver, disconnect)))
+    await asyncio.wait_for(asyncio.gather(*(r.connected.wait() for _, r in receivers)), 120)
+    # The first bytes go out before the stream subscribes; wait for the broker to have them all
+    broker = get_broker()
+    while len(broker.subscribers) < level:
+        await asyncio.sleep(0.05)
+    connect_s = time.perf_counter() - start
+    per_subscriber = (tracemalloc.get_traced_memory()[0] - base) / level
+    tracemalloc.stop()
+
+    create = sync_to_async(lambda owner: Complaint.objects.create(user=owner, title="load", description="load test"))
+    rng = random.Random(7)
+    for _ in range(args.events):
+        owner = rng.choice(users)
+        t0 = time.perf_counter()
+        complaint = await create(owner)
+        sent_at[complaint.pk] = (t0, owner.pk)
+        await asyncio.sleep(1 / args.rate)
+    await asyncio.sleep(args.settle)
+
+    disconnect.set()
+    await asyncio.wait(tasks, timeout=30)
+    return receivers, sent_at, connect_s, per_subscriber
+
+
+# ==========================================
+# Over HTTP against a running ASGI server
+# ==========================================
+
+async def run_over_http(level, args, users, admins):
+    import httpx
+
+    sent_at = {}
+    receivers = []
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(base_url=args.url, timeout=None, limits=limits) as client:
+
+        async def subscribe(user_id, receiver):
+            async with client.stream("GET", EVENTS_PATH, params={"user_id": user_id}) as response:
+                async for text in response.aiter_text():
+                    receiver.feed(text)
+
+        start = time.perf_counter()
+        tasks = []
+        for n in range(level):
+            user = admins[n % len(admins)] if n < level * args.admin_share else users[n % len(users)]
+            receiver = Receiver()
+            receivers.append((user, receiver))
+            tasks.append(asyncio.ensure_future(subscribe(user["id"], receiver)))
+        await asyncio.wait_for(asyncio.gather(*(r.connected.wait() for _, r in receivers)), 120)
+        connect_s = time.perf_counter() - start
+        await asyncio.sleep(0.5)
+
+        rng = random.Random(7)
+        for _ in range(args.events):
+            owner = rng.choice(users)
+            t0 = time.perf_counter()
+            response = await client.post("/api/complaints/", json={
+                "title": "load", "description": "load test", "user_id": owner["id"],
+            })
+            sent_at[response.json()["id"]] = (t0, owner["id"])
+            await asyncio.sleep(1 / args.rate)
+        await asyncio.sleep(args.settle)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return receivers, sent_at, connect_s, None
+
+
+def report(level, receivers, sent_at, connect_s, per_subscriber, admin_ids):
+    owners = [owner for _, owner in sent_at.values()]
+    expected = sum(
+        len(owners) if user_id in admin_ids else owners.count(user_id) for user_id, _ in receivers
+    )
+    latencies = [
+        now - sent_at[complaint_id][0]
+        for _, receiver in receivers
+        for complaint_id, now in receiver.arrivals
+        if complaint_id in sent_at
+    ]
+    result = {
+        "subscribers": level,
+        "connect_s": round(connect_s, 3),
+        "events_sent": len(sent_at),
+        "deliveries_expected": expected,
+        "deliveries_received": len(latencies),
+        "delivery": summarize(latencies),
+    }
+    if per_subscriber is not None:
+        result["memory_per_subscriber_kb"] = round(per_subscriber / 1024, 1)
+    return result
+
+
+def create_users(count):
+    from api.models import User
+
+    admins = [User.objects.create_user(
+        username="sse-admin@example.com", email="sse-admin@example.com", password="x", full_name="Admin", role="admin",
+    )]
+    customers = [
+        User.objects.create_user(username=f"sse{n}@example.com", email=f"sse{n}@example.com", password="x", full_name=f"C{n}")
+        for n in range(count)
+    ]
+    return customers, admins
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subscribers", type=int, nargs="+", default=[100, 1000], help="Subscriber counts to test.")
+    parser.add_argument("--customers", type=int, default=50, help="Distinct customer accounts.")
+    parser.add_argument("--admin-share", type=float, default=0.1, help="Fraction of subscribers that are admins.")
+    parser.add_argument("--events", type=int, default=50, help="Complaints created per level.")
+    parser.add_argument("--rate", type=float, default=20.0, help="Complaints created per second.")
+    parser.add_argument("--settle", type=float, default=2.0, help="Seconds to wait for deliveries after the last write.")
+    parser.add_argument("--url", help="Run against a live ASGI server instead of in-process.")
+    parser.add_argument("--output", help="Write results as JSON to this file.")
+    args = parser.parse_args()
+
+    results = []
+    if args.url:
+        import httpx
+
+        # Accounts must exist on the target server
+        users = []
+        for n in range(args.customers + 1):
+            role = "admin" if n == 0 else "customer"
+            payload = {"full_name": f"SSE {n}", "email": f"sse-load-{n}@example.com", "password": "load-test-pw", "role": role}
+            httpx.post(f"{args.url}/api/auth/register", json=payload)
+            login = httpx.post(f"{args.url}/api/auth/login", json={"email": payload["email"], "password": payload["password"]})
+            users.append(login.json())
+        admins, customers = users[:1], users[1:]
+        for level in args.subscribers:
+            receivers, sent_at, connect_s, memory = asyncio.run(run_over_http(level, args, customers, admins))
+            ids = [(user["id"], receiver) for user, receiver in receivers]
+            results.append(report(level, ids, sent_at, connect_s, memory, {a["id"] for a in admins}))
+            print(json.dumps(results[-1]))
+    else:
+        from django.db import connection
+        from django.test.utils import setup_test_environment, teardown_test_environment
+
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        if connection.vendor == "sqlite":
+            # The in-memory test database is locked across the ORM's worker threads
+            connection.settings_dict["TEST"]["NAME"] = "sse_load.sqlite3"
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            customers, admins = create_users(args.customers)
+            for level in args.subscribers:
+                receivers, sent_at, connect_s, memory = asyncio.run(
+                    run_in_process(level, args, customers, admins)
+                )
+                ids = [(user.pk, receiver) for user, receiver in receivers]
+                results.append(report(level, ids, sent_at, connect_s, memory, {a.pk for a in admins}))
+                print(json.dumps(results[-1]))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
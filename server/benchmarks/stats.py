@@ -0,0 +1,25 @@
+import math
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(pct / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[rank]
+
+
+def summarize(latencies, elapsed=None):
+    """Latency percentiles (ms) and throughput (ops/s) for a list of per-op latencies in seconds."""
+    values = sorted(latencies)
+    elapsed = elapsed if elapsed is not None else sum(values)
+    to_ms = lambda v: round(v * 1000, 3) if v is not None else None
+    return {
+        "count": len(values),
+        "mean_ms": to_ms(sum(values) / len(values)) if values else None,
+        "p50_ms": to_ms(percentile(values, 50)),
+        "p90_ms": to_ms(percentile(values, 90)),
+        "p95_ms": to_ms(percentile(values, 95)),
+        "p99_ms": to_ms(percentile(values, 99)),
+        "max_ms": to_ms(values[-1]) if values else None,
+        "throughput_per_s": round(len(values) / elapsed, 2) if elapsed else None,
+    }
@@ -0,0 +1,213 @@
+"""
+Benchmark suite for the severity classification hot path.
+
+Scenarios:
+  keyword.*      KeywordSeverityModel.predict (Aho-Corasick scan)
+  classifier.*   SeverityAI.predict per text, and predict_batch throughput
+  api.create     full POST /api/complaints/ through Django against a
+                 throwaway test database (whatever DATABASES points at)
+
+Each scenario reports latency percentiles and throughput. Results are
+compared with benchmarks/baselines.json; a p50/p95 regression beyond
+--threshold (or a throughput drop of the same size) fails the run. A saved
+baseline records the environment it was measured in; timings are only
+comparable on similar hardware, so save it on the machine that runs the
+comparison (e.g. the CI runner) and commit it from there. With --ci (or CI set in the environment) a missing baseline,
+or a scenario absent from it, fails the run instead of passing silently.
+
+Usage (from server/):
+    DB_ENGINE=sqlite python -m benchmarks.suite
+    DB_ENGINE=sqlite python -m benchmarks.suite --save-baseline
+    DB_ENGINE=sqlite python -m benchmarks.suite --ci
+    python -m benchmarks.suite --only classifier keyword --threshold 0.3
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from pathlib import Path
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "supportflow.settings")
+django.setup()
+
+from benchmarks.stats import summarize  # noqa: E402
+from benchmarks.synthetic import ComplaintGenerator  # noqa: E402
+
+BASELINE_FILE = Path(__file__).resolve().parent / "baselines.json"
+
+# Text shapes exercised by the classifier scenarios
+SHAPES = {
+    "short": dict(min_words=5, max_words=15, vocab_size=500, keyword_density=0.05),
+    "long": dict(min_words=150, max_words=300, vocab_size=5000, keyword_density=0.02),
+    "keyword_dense": dict(min_words=20, max_words=60, vocab_size=500, keyword_density=0.4),
+}
+
+
+def time_each(fn, items):
+    latencies = []
+    start = time.perf_counter()
+    for item in items:
+        t0 = time.perf_counter()
+        fn(item)
+        latencies.append(time.perf_counter() - t0)
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def bench_keyword(n):
+    from api.ai_engine import KeywordSeverityModel
+
+    model = KeywordSeverityModel()
+    results = {}
+    for shape, params in SHAPES.items():
+        texts = ComplaintGenerator(seed=1, **params).descriptions(n)
+        results[f"keyword.{shape}"] = time_each(model.predict, texts)
+    return results
+
+
+def bench_classifier(n):
+    from api.ai_engine import get_severity_ai
+
+    engine = get_severity_ai()
+    results = {}
+    for shape, params in SHAPES.items():
+        texts = ComplaintGenerator(seed=2, **params).descriptions(n)
+        engine.predict(texts[0])  # warm-up
+        results[f"classifier.{shape}"] = time_each(engine.predict, texts)
+
+    texts = ComplaintGenerator(seed=3, **SHAPES["short"]).descriptions(max(n, 1000))
+    start = time.perf_counter()
+    engine.predict_batch(texts)
+    elapsed = time.perf_counter() - start
+    results["classifier.batch"] = {"count": len(texts), "throughput_per_s": round(len(texts) / elapsed, 2)}
+    return results
+
+
+def bench_api_create(n):
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+    from rest_framework.test import APIClient
+
+    from api.models import User
+
+    setup_test_environment()
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        user = User.objects.create_user(
+            username="bench@example.com", email="bench@example.com", password="x", full_name="Bench"
+        )
+        client = APIClient()
+        payloads = [dict(c, user_id=user.id) for c in ComplaintGenerator(seed=4, **SHAPES["short"]).complaints(n)]
+        client.post("/api/complaints/", payloads[0], format="json")  # warm-up (loads model)
+
+        def create(payload):
+            response = client.post("/api/complaints/", payload, format="json")
+            assert response.status_code == 201, response.content
+
+        return {"api.create": time_each(create, payloads)}
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+SCENARIOS = {
+    "keyword": bench_keyword,
+    "classifier": bench_classifier,
+    "api": bench_api_create,
+}
+
+
+def environment():
+    from django.db import connection
+
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "cpus": os.cpu_count(),
+        "database": connection.vendor,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Returns a list of human-readable regressions."""
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for metric in ("p50_ms", "p95_ms"):
+            if base.get(metric) and current.get(metric) and current[metric] > base[metric] * (1 + threshold):
+                regressions.append(f"{name} {metric}: {base[metric]} -> {current[metric]}")
+        if base.get("throughput_per_s") and current.get("throughput_per_s"):
+            if current["throughput_per_s"] < base["throughput_per_s"] * (1 - threshold):
+                regressions.append(
+                    f"{name} throughput_per_s: {base['throughput_per_s']} -> {current['throughput_per_s']}"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", choices=sorted(SCENARIOS), help="Run only these scenario groups.")
+    parser.add_argument("-n", type=int, default=500, help="Operations per scenario (api uses n/5).")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed regression ratio (0.25 = 25%%).")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="Write these results as the new baseline.")
+    parser.add_argument("--output", type=Path, help="Also write results as JSON to this file.")
+    parser.add_argument(
+        "--ci", action="store_true", default=bool(os.getenv("CI")),
+        help="Fail when the baseline, or a scenario in it, is missing (default when CI is set).",
+    )
+    args = parser.parse_args()
+
+    results = {}
+    for group in args.only or SCENARIOS:
+        n = max(args.n // 5, 20) if group == "api" else args.n
+        print(f"▶ {group} ({n} ops)...", flush=True)
+        results.update(SCENARIOS[group](n))
+
+    print(f"\n{'scenario':<26} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'ops/s':>12}")
+    print("-" * 69)
+    for name, row in results.items():
+        cells = [row.get(k) for k in ("p50_ms", "p95_ms", "p99_ms")]
+        cells = [f"{c:>9.3f}" if c is not None else f"{'-':>9}" for c in cells]
+        print(f"{name:<26} {' '.join(cells)} {row['throughput_per_s']:>12,.1f}")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+
+    if args.save_baseline:
+        baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        baseline.update(results, _environment=environment())
+        args.baseline.write_text(json.dumps(baseline, indent=2) + "\n")
+        print(f"\nBaseline saved to {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to create one.")
+        if args.ci:
+            sys.exit(1)
+        return
+
+    baseline = json.loads(args.baseline.read_text())
+    print(f"\nBaseline environment: {baseline.get('_environment', 'unknown')}; this run: {environment()}")
+    missing = [name for name in results if name not in baseline]
+    if missing and args.ci:
+        print(f"\n❌ No baseline for: {', '.join(missing)}")
+        sys.exit(1)
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n❌ Regressions beyond {args.threshold:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"\n✅ No regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Synthetic complaint generator for benchmarks and load tests.
+
+Text length, vocabulary size and severity-keyword density are tunable so the
+classifier and keyword matcher can be exercised at realistic and extreme
+shapes. Output is deterministic for a given seed.
+"""
+import random
+
+from api import ai_config
+
+FILLER_WORDS = (
+    "account app page button screen order invoice report dashboard settings profile "
+    "email notification payment subscription plan team project file upload download "
+    "search filter export import widget mobile browser desktop update release customer "
+    "support ticket request response time today yesterday morning again still always "
+    "when after before during because please help thanks need want tried using"
+).split()
+
+CATEGORIES = ["General", "Billing", "Technical", "Account", "Feature Request"]
+
+
+class ComplaintGenerator:
+    def __init__(self, seed=0, min_words=8, max_words=40, vocab_size=2000, keyword_density=0.05):
+        self.rng = random.Random(seed)
+        self.min_words = min_words
+        self.max_words = max_words
+        self.keyword_density = keyword_density
+        self.keywords = [k for words in ai_config.SEVERITY_KEYWORDS.values() for k in words]
+        self.samples = [text for text, _ in ai_config.TRAINING_DATA]
+        # Real-looking filler plus pseudo-words to reach the requested vocabulary size
+        self.vocabulary = FILLER_WORDS + [f"term{i}" for i in range(max(vocab_size - len(FILLER_WORDS), 0))]
+
+    def description(self):
+        rng = self.rng
+        words = rng.choice(self.samples).rstrip("?!.").split()
+        target = rng.randint(self.min_words, self.max_words)
+        while len(words) < target:
+            if rng.random() < self.keyword_density:
+                words.extend(rng.choice(self.keywords).split())
+            else:
+                words.append(rng.choice(self.vocabulary))
+        return " ".join(words[:max(target, 1)])
+
+    def complaint(self):
+        description = self.description()
+        return {
+            "title": " ".join(description.split()[:6]).capitalize(),
+            "category": self.rng.choice(CATEGORIES),
+            "description": description,
+        }
+
+    def descriptions(self, n):
+        return [self.description() for _ in range(n)]
+
+    def complaints(self, n):
+        return [self.complaint() for _ in range(n)]
@@ -0,0 +1,42 @@
+"""
+Production server: gunicorn managing uvicorn (ASGI) worker processes.
+
+    gunicorn -c gunicorn.conf.py supportflow.asgi:application
+
+Each worker runs its own event loop, so async views (suggestions, complaint
+create, the event stream) wait on I/O without holding a thread. Sync views,
+and sync_to_async(thread_sensitive=True) calls such as the complaint
+listing, run on a thread of their own per request: Django's ASGI handler
+gives every request its own ThreadSensitiveContext, so they are not
+serialized onto one shared thread (AsyncViewTests checks this). They do
+share the worker's GIL, so CPU-bound work (classification, serialization)
+scales with processes, not threads; and each concurrent sync request holds
+a database connection, so DB_POOL_MAX_SIZE x WEB_CONCURRENCY must stay under
+the server's max_connections. Tuned through environment variables:
+
+    WEB_CONCURRENCY      worker processes (default: CPU count; CPU-bound work needs processes)
+    PORT / BIND          listen address (default 0.0.0.0:8000)
+    GUNICORN_TIMEOUT     seconds before a stuck worker is restarted
+    GUNICORN_MAX_REQUESTS  recycle workers after this many requests (0 = never)
+"""
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", f"0.0.0.0:{os.getenv('PORT', '8000')}")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn_worker.UvicornWorker"
+
+# Async workers heartbeat from the event loop, so long SSE streams and slow
+# chatbot calls do not trip this; only a blocked loop does
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = max_requests // 10
+
+# Not preloaded: the chatbot client starts its own event loop thread, which
+# would not survive the fork into workers
+preload_app = False
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 from pathlib import Path
+import copy
 import os
 from dotenv import load_dotenv
 
@@ -56,6 +57,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "api.db_router.primary_pinning_middleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -94,6 +96,64 @@ DATABASES = {
     }
 }
 
+# Connection reuse. With psycopg 3 installed each process keeps a pool per
+# alias that checks connections before handing them out; under ASGI, where a
+# request's thread is not reused, this is the only way connections get reused.
+# Without it (psycopg2, or DB_POOL=0) connections persist per thread for
+# DB_CONN_MAX_AGE seconds and are health-checked before reuse.
+try:
+    from psycopg_pool import ConnectionPool
+except ImportError:
+    ConnectionPool = None
+
+if ConnectionPool is not None and os.getenv("DB_POOL", "1") == "1":
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+            "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),  # seconds to wait for a free connection
+            "check": ConnectionPool.check_connection,
+        }
+    }
+else:
+    DATABASES["default"]["CONN_MAX_AGE"] = int(os.getenv("DB_CONN_MAX_AGE", "60"))
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+
+# Read replicas, aliases replica1..N (see api/db_router.py):
+# DB_REPLICA_HOSTS=host[:port],... with the primary's name and credentials.
+_replica_hosts = [h.strip() for h in os.getenv("DB_REPLICA_HOSTS", "").split(",") if h.strip()]
+for _n, _host in enumerate(_replica_hosts, start=1):
+    _host, _, _port = _host.partition(":")
+    DATABASES[f"replica{_n}"] = dict(
+        copy.deepcopy(DATABASES["default"]),
+        HOST=_host,
+        PORT=_port or DATABASES["default"]["PORT"],
+        TEST={"MIRROR": "default"},
+    )
+
+# Local development / test runs without PostgreSQL: DB_ENGINE=sqlite
+if os.getenv("DB_ENGINE") == "sqlite":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": BASE_DIR / os.getenv("SQLITE_NAME", "db.sqlite3"),
+            # Take the write lock at BEGIN: concurrent read-then-write transactions
+            # (ASGI/threaded servers) otherwise fail with "database is locked"
+            "OPTIONS": {"transaction_mode": "IMMEDIATE", "timeout": 20},
+        }
+    }
+    # SQLITE_REPLICAS=file,...: read-only copies to exercise the replica router
+    for _n, _name in enumerate(filter(None, os.getenv("SQLITE_REPLICAS", "").split(",")), start=1):
+        DATABASES[f"replica{_n}"] = {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": BASE_DIR / _name.strip(),
+            "OPTIONS": {"timeout": 20},
+            "TEST": {"MIRROR": "default"},
+        }
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias.startswith("replica")]
+DATABASE_ROUTERS = ["api.db_router.ReplicaRouter"]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -142,3 +202,63 @@ AUTH_USER_MODEL = "api.User"
 # CORS Configuration
 CORS_ALLOW_ALL_ORIGINS = True  # For development simplicity
 CORS_ALLOW_CREDENTIALS = True
+
+# AI stack warm-up (see ApiConfig.ready). The classifier and chatbot are
+# created lazily on first use unless this is enabled.
+AI_WARMUP = os.getenv("AI_WARMUP", "0") == "1"
+AI_WARMUP_CHATBOT = os.getenv("AI_WARMUP_CHATBOT", "1") == "1"
+
+# Resolution suggestion cache (see api/suggestion_cache.py)
+# Tier 1: per-process LRU with TTL. Tier 2: SuggestionCache table.
+SUGGESTION_CACHE_SIZE = int(os.getenv("SUGGESTION_CACHE_SIZE", "1024"))
+SUGGESTION_CACHE_TTL = int(os.getenv("SUGGESTION_CACHE_TTL", "900"))  # seconds
+
+# AI chatbot (Gradio Space) client - see api/chatbot_client.py
+CHATBOT_URL = os.getenv("CHATBOT_URL", "https://devi1675-customer-support-ai.hf.space")
+CHATBOT_API_NAME = os.getenv("CHATBOT_API_NAME", "/chat")
+CHATBOT_API_PREFIX = os.getenv("CHATBOT_API_PREFIX", "/gradio_api")
+CHATBOT_TIMEOUT = float(os.getenv("CHATBOT_TIMEOUT", "30"))  # per-call deadline, seconds
+CHATBOT_MAX_CONCURRENCY = int(os.getenv("CHATBOT_MAX_CONCURRENCY", "8"))
+CHATBOT_BREAKER_THRESHOLD = int(os.getenv("CHATBOT_BREAKER_THRESHOLD", "5"))
+CHATBOT_BREAKER_RESET = float(os.getenv("CHATBOT_BREAKER_RESET", "30"))  # seconds
+
+# Suggestion precompute queue (see api/tasks.py, manage.py suggestion_worker)
+SUGGESTION_JOB_MAX_ATTEMPTS = int(os.getenv("SUGGESTION_JOB_MAX_ATTEMPTS", "5"))
+SUGGESTION_JOB_VISIBILITY_TIMEOUT = int(os.getenv("SUGGESTION_JOB_VISIBILITY_TIMEOUT", "120"))  # seconds
+SUGGESTION_JOB_BACKOFF_BASE = float(os.getenv("SUGGESTION_JOB_BACKOFF_BASE", "5"))  # seconds, doubled per attempt
+SUGGESTION_JOB_BACKOFF_MAX = float(os.getenv("SUGGESTION_JOB_BACKOFF_MAX", "600"))
+
+# Incident clustering of near-duplicate complaints (see api/incidents.py)
+INCIDENT_WINDOW_HOURS = float(os.getenv("INCIDENT_WINDOW_HOURS", "6"))  # clusters idle longer than this are closed
+INCIDENT_SIMILARITY = float(os.getenv("INCIDENT_SIMILARITY", "0.5"))  # min estimated Jaccard similarity
+INCIDENT_REFRESH_SECONDS = float(os.getenv("INCIDENT_REFRESH_SECONDS", "5"))
+
+# Complaint listing (keyset pagination, see api/pagination.py)
+COMPLAINTS_PAGE_SIZE = int(os.getenv("COMPLAINTS_PAGE_SIZE", "50"))
+COMPLAINTS_MAX_PAGE_SIZE = int(os.getenv("COMPLAINTS_MAX_PAGE_SIZE", "200"))
+
+# Full-text complaint search (see api/search.py)
+COMPLAINTS_SEARCH_MAX_PAGE = int(os.getenv("COMPLAINTS_SEARCH_MAX_PAGE", "50"))  # bounds OFFSET depth
+
+# Real-time complaint events over SSE (see api/events.py; needs an ASGI server)
+EVENTS_POLL_INTERVAL = float(os.getenv("EVENTS_POLL_INTERVAL", "1"))  # seconds between change log polls
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "1000"))  # per subscriber, then it is disconnected
+EVENTS_HEARTBEAT = float(os.getenv("EVENTS_HEARTBEAT", "15"))  # seconds
+EVENTS_RETRY_MS = int(os.getenv("EVENTS_RETRY_MS", "3000"))  # client reconnect delay
+
+# Stateless signed tokens (see api/tokens.py, api/authentication.py)
+AUTH_ACCESS_TOKEN_TTL = int(os.getenv("AUTH_ACCESS_TOKEN_TTL", "900"))  # seconds
+AUTH_REFRESH_TOKEN_TTL = int(os.getenv("AUTH_REFRESH_TOKEN_TTL", str(14 * 24 * 3600)))  # seconds
+
+REST_FRAMEWORK = {
+    # Bearer tokens are verified without a database read; sessions still work for the admin site
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "api.authentication.BearerTokenAuthentication",
+        "rest_framework.authentication.SessionAuthentication",
+    ],
+}
+
+# Read replica routing (see api/db_router.py)
+DATABASE_REPLICA_PIN_SECONDS = int(os.getenv("DATABASE_REPLICA_PIN_SECONDS", "5"))  # primary-only reads after a write
+DATABASE_REPLICA_CHECK_INTERVAL = float(os.getenv("DATABASE_REPLICA_CHECK_INTERVAL", "5"))  # seconds between health checks
+DATABASE_REPLICA_MAX_LAG = float(os.getenv("DATABASE_REPLICA_MAX_LAG", "10"))  # seconds behind before a replica is skipped